@@ -6,6 +6,11 @@ from sqlalchemy import pool
 from sqlalchemy.ext.asyncio import async_engine_from_config
 from src.core.config import settings
 from src.models.category import Category  # noqa: F401
+from src.models.category_summary import CategorySummary  # noqa: F401
+from src.models.category_summary_delta import CategorySummaryDelta  # noqa: F401
+from src.models.change_log import ChangeLog  # noqa: F401
+from src.models.idempotency_key import IdempotencyKey  # noqa: F401
+from src.models.import_job import ImportJob  # noqa: F401
 from src.models.product import Product  # noqa: F401
 from src.models.user import User  # noqa: F401
 from src.repository.database import Base
@@ -0,0 +1,116 @@
+"""Login throughput benchmark for bcrypt verification.
+
+Runs a burst of concurrent password verifications, the expensive part of
+POST /user/login, while a heartbeat task measures how late the event loop
+wakes it up. With the synchronous verify_password every other request on
+the loop stalls behind bcrypt; with password_service the heartbeat stays
+close to its target interval.
+
+Run from the project root:
+    python -m benchmarks.bench_login --logins 64
+"""
+
+import argparse
+import asyncio
+import json
+from statistics import quantiles
+from time import perf_counter
+
+from src.repository.database import hash_password, verify_password
+from src.services.password_service import password_service
+
+HEARTBEAT_INTERVAL = 0.005
+PASSWORD = "BenchPass123!"
+
+
+async def heartbeat(lags: list[float], stop: asyncio.Event) -> None:
+    """Record how late each scheduled wake-up happens.
+
+    Args:
+        lags: List the measured lag in milliseconds is appended to.
+        stop: Event that ends the heartbeat.
+    """
+    while not stop.is_set():
+        expected = perf_counter() + HEARTBEAT_INTERVAL
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+        lags.append(max(0.0, perf_counter() - expected) * 1000)
+
+
+async def sync_login(hashed: str) -> bool:
+    """Verify a password inline, as authenticate_user used to.
+
+    Args:
+        hashed: Stored bcrypt hash.
+
+    Returns:
+        bool: verification result
+    """
+    return verify_password(plain_password=PASSWORD, hashed_password=hashed)
+
+
+async def async_login(hashed: str) -> bool:
+    """Verify a password through the bounded bcrypt executor.
+
+    Args:
+        hashed: Stored bcrypt hash.
+
+    Returns:
+        bool: verification result
+    """
+    return await password_service.verify(
+        plain_password=PASSWORD, hashed_password=hashed
+    )
+
+
+async def run_scenario(login, logins: int, hashed: str) -> dict[str, float]:
+    """Run a burst of concurrent logins next to the heartbeat.
+
+    Args:
+        login: Coroutine function performing one verification.
+        logins: Number of concurrent logins.
+        hashed: Stored bcrypt hash.
+
+    Returns:
+        dict: throughput and heartbeat lag percentiles
+    """
+    lags: list[float] = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags=lags, stop=stop))
+    await asyncio.sleep(HEARTBEAT_INTERVAL * 2)
+
+    start = perf_counter()
+    await asyncio.gather(*(login(hashed) for _ in range(logins)))
+    elapsed = perf_counter() - start
+
+    stop.set()
+    await beat
+    cuts = (
+        quantiles(lags, n=100, method="inclusive") if len(lags) > 1 else [0.0] * 99
+    )
+    return {
+        "logins_per_second": round(logins / elapsed, 1),
+        "heartbeat_samples": len(lags),
+        "heartbeat_lag_p50_ms": round(cuts[49], 2),
+        "heartbeat_lag_p99_ms": round(cuts[98], 2),
+        "heartbeat_lag_max_ms": round(max(lags, default=0.0), 2),
+    }
+
+
+async def main(logins: int) -> None:
+    hashed = hash_password(PASSWORD)
+    results = {
+        "logins": logins,
+        "sync_verify": await run_scenario(sync_login, logins=logins, hashed=hashed),
+        "password_service": await run_scenario(
+            async_login, logins=logins, hashed=hashed
+        ),
+    }
+    password_service.shutdown()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(logins=args.logins))
@@ -0,0 +1,104 @@
+"""Benchmark for serializing a large product list response.
+
+Compares the previous path, where FastAPI ran jsonable_encoder over raw ORM
+instances and rendered with the stdlib encoder, against typed ProductRead
+payloads serialized by pydantic and rendered by FastJSONResponse.
+
+Run from the project root:
+    python -m benchmarks.bench_serialization --products 10000
+"""
+
+import argparse
+import json
+from timeit import timeit
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.core.responses import FastJSONResponse, orjson
+from src.models.category import Category
+from src.models.product import Product
+from src.repository.database import Base
+from src.schema.product import WrapperProductResponse, product_read_list
+
+
+def load_products(count: int) -> list[Product]:
+    """Load persistent Product instances from an in-memory SQLite database.
+
+    Args:
+        count: Number of products to create.
+
+    Returns:
+        list[Product]: ORM instances as a query would return them
+    """
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=engine)
+    session = Session(bind=engine)
+    session.add(Category(id=1, name="bench"))
+    session.add_all(
+        Product(
+            id=i, name=f"product {i}", quantity=i % 50 + 1, price=9.99, category_id=1
+        )
+        for i in range(1, count + 1)
+    )
+    session.commit()
+    return list(session.scalars(select(Product)))
+
+
+def encode_orm(products: list[Product]) -> bytes:
+    """Previous path: jsonable_encoder over ORM objects, stdlib render.
+
+    Args:
+        products: ORM instances.
+
+    Returns:
+        bytes: response body
+    """
+    payload = {"status": "success", "message": {"products": products}}
+    return JSONResponse(content=jsonable_encoder(payload)).body
+
+
+def encode_typed(products: list[Product]) -> bytes:
+    """New path: typed payload, pydantic serialization, FastJSONResponse.
+
+    Args:
+        products: ORM instances.
+
+    Returns:
+        bytes: response body
+    """
+    payload = {
+        "status": "success",
+        "message": {
+            "products": product_read_list.validate_python(
+                products, from_attributes=True
+            )
+        },
+    }
+    content = WrapperProductResponse.model_validate(payload).model_dump(mode="json")
+    return FastJSONResponse(content=content).body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    products = load_products(count=args.products)
+    orm_ms = timeit(lambda: encode_orm(products), number=args.number) / args.number
+    typed_ms = timeit(lambda: encode_typed(products), number=args.number) / args.number
+    results = {
+        "products": args.products,
+        "orjson": orjson is not None,
+        "orm_jsonable_encoder_ms": round(orm_ms * 1000, 2),
+        "typed_models_ms": round(typed_ms * 1000, 2),
+        "speedup": round(orm_ms / typed_ms, 1),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,530 @@
+"""HTTP load harness for the inventory API.
+
+Boots the app in process behind httpx's ASGI transport, against a fresh
+aiosqlite file or the Postgres database from settings, seeds it from a
+synthetic inventory CSV and drives read-heavy, write-heavy or mixed traffic
+with a fixed number of concurrent clients. Requests carry admin JWTs minted
+with create_access_token, and the app runs with ENVIRONMENT=production so
+every request pays for token verification like it would in production.
+
+Prints throughput and p50/p95/p99 latency per route as JSON. Save a run
+with --output and pass it as --baseline to a later run to get the change.
+
+Run from the project root:
+    LOG_LEVEL=WARNING python -m benchmarks.load_harness --products 5000
+    python -m benchmarks.load_harness --database postgres --scenario mixed
+    python -m benchmarks.load_harness --base-url http://localhost:5003
+
+Postgres mode seeds with seed_db_bulk, so the database must be empty.
+--base-url targets an already running, already seeded server instead.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import tempfile
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import count
+from pathlib import Path
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Optional
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from src.api.main import app
+from src.core.config import settings
+from src.core.jwt import create_access_token
+from src.core.log import setup_logging, shutdown_logging
+from src.core.work_queue import work_queue
+from src.models.category import Category
+from src.models.product import Product
+from src.repository.database import Base, get_db, get_read_db
+from src.repository.seeding import (
+    PRODUCT_COLUMNS,
+    chunked,
+    iter_product_records,
+    read_category_names,
+    seed_db_bulk,
+)
+
+PRODUCT_TYPES = ("regular", "food", "electronic")
+SEARCH_TERMS = ("product", "widget", "gadget", "prod", "wdget")
+
+# a request: (method, path, query params, json body)
+RequestSpec = tuple[str, str, Optional[dict], Optional[dict]]
+
+
+@dataclass
+class Operation:
+    """One kind of request in a scenario.
+
+    Attributes:
+        route: Label results are grouped by, eg: "GET /products".
+        weight: Relative frequency within the scenario.
+        build: Returns the next request to send.
+    """
+
+    route: str
+    weight: int
+    build: Callable[[], RequestSpec]
+
+
+def write_synthetic_csv(path: Path, products: int, seed: int) -> None:
+    """Write an inventory CSV in the format seed_db_bulk reads.
+
+    Args:
+        path: Destination file.
+        products: Number of product rows.
+        seed: Random seed, so runs are repeatable.
+    """
+    rng = random.Random(seed)
+    nouns = ("widget", "gadget", "product", "gizmo", "device")
+    with open(path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(
+            [
+                "product_id",
+                "product_name",
+                "quantity",
+                "price",
+                "type",
+                "days_to_expire",
+                "is_vegetarian",
+                "warranty_period_in_years",
+            ]
+        )
+        for i in range(1, products + 1):
+            product_type = PRODUCT_TYPES[i % len(PRODUCT_TYPES)]
+            writer.writerow(
+                [
+                    f"P{i}",
+                    f"{rng.choice(nouns)} {i}",
+                    rng.randint(1, 500),
+                    f"{rng.uniform(1, 1000):.2f}",
+                    product_type,
+                    "30" if product_type == "food" else "",
+                    "Yes" if product_type == "food" else "",
+                    "2" if product_type == "electronic" else "",
+                ]
+            )
+
+
+async def seed_sqlite(session_factory: async_sessionmaker, csv_filepath: Path) -> int:
+    """Seed the sqlite database with the same validation as seed_db_bulk.
+
+    Args:
+        session_factory: Session factory bound to the sqlite engine.
+        csv_filepath: Synthetic inventory CSV.
+
+    Returns:
+        int: number of seeded products
+    """
+    category_names = read_category_names(csv_filepath=str(csv_filepath))
+    category_ids = {name: i for i, name in enumerate(category_names, start=1)}
+    seeded = 0
+    async with session_factory() as db:
+        await db.execute(
+            insert(Category),
+            [{"id": i, "name": name} for name, i in category_ids.items()],
+        )
+        records = iter_product_records(
+            csv_filepath=str(csv_filepath), category_ids=category_ids
+        )
+        for chunk in chunked(records=records, size=settings.SEED_CHUNK_SIZE):
+            await db.execute(
+                insert(Product.__table__),
+                [dict(zip(PRODUCT_COLUMNS, record)) for record in chunk],
+            )
+            seeded += len(chunk)
+        await db.commit()
+    return seeded
+
+
+def get_operations(products: int, categories: int) -> dict[str, Operation]:
+    """Build every request kind the scenarios mix.
+
+    Args:
+        products: Number of seeded products, ids are 1..products.
+        categories: Number of seeded categories.
+
+    Returns:
+        dict: operation name -> Operation
+    """
+    rng = random.Random(0)
+    new_ids = count(1)
+
+    def product_id() -> int:
+        return rng.randint(1, products)
+
+    return {
+        "get_product": Operation(
+            route="GET /products?product_id",
+            weight=1,
+            build=lambda: ("GET", "/products", {"product_id": product_id()}, None),
+        ),
+        "get_category_products": Operation(
+            route="GET /products?category_id",
+            weight=1,
+            build=lambda: (
+                "GET",
+                "/products",
+                {"category_id": rng.randint(1, categories)},
+                None,
+            ),
+        ),
+        "search": Operation(
+            route="GET /products/search",
+            weight=1,
+            build=lambda: (
+                "GET",
+                "/products/search",
+                {"q": rng.choice(SEARCH_TERMS), "limit": 20},
+                None,
+            ),
+        ),
+        "category_summary": Operation(
+            route="GET /category/summary",
+            weight=1,
+            build=lambda: ("GET", "/category/summary", None, None),
+        ),
+        "create_product": Operation(
+            route="POST /products",
+            weight=1,
+            build=lambda: (
+                "POST",
+                "/products",
+                None,
+                {
+                    "name": f"load test product {next(new_ids)}",
+                    "quantity": rng.randint(1, 100),
+                    "price": round(rng.uniform(1, 500), 2),
+                    "category_id": rng.randint(1, categories),
+                },
+            ),
+        ),
+        "update_product": Operation(
+            route="PUT /product",
+            weight=1,
+            build=lambda: (
+                "PUT",
+                "/product",
+                {"product_id": product_id()},
+                {"quantity": rng.randint(1, 500)},
+            ),
+        ),
+    }
+
+
+# operation name -> weight, per scenario
+SCENARIOS: dict[str, dict[str, int]] = {
+    "read": {
+        "get_product": 60,
+        "get_category_products": 10,
+        "search": 20,
+        "category_summary": 5,
+        "update_product": 5,
+    },
+    "write": {
+        "get_product": 20,
+        "create_product": 30,
+        "update_product": 50,
+    },
+    "mixed": {
+        "get_product": 35,
+        "get_category_products": 5,
+        "search": 10,
+        "category_summary": 5,
+        "create_product": 15,
+        "update_product": 30,
+    },
+}
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Ascending values.
+        fraction: Percentile as a fraction, eg: 0.95.
+
+    Returns:
+        float: the percentile, 0.0 for an empty list
+    """
+    if not sorted_values:
+        return 0.0
+    rank = round(fraction * len(sorted_values))
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank - 1))]
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict[str, Any]:
+    """Reduce latencies of one route (or a whole run) to report numbers.
+
+    Args:
+        latencies: Seconds per request.
+        errors: Responses with a 4xx/5xx status or transport errors.
+        seconds: Wall clock duration of the run.
+
+    Returns:
+        dict: requests, errors, throughput and latency percentiles in ms
+    """
+    ordered = sorted(latencies)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "throughput_rps": round(len(ordered) / seconds, 1) if seconds else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 0.99) * 1000, 2),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    operations: dict[str, Operation],
+    weights: dict[str, int],
+    concurrency: int,
+    requests: int,
+) -> dict[str, Any]:
+    """Send requests from concurrent clients until the total is reached.
+
+    Args:
+        client: HTTP client with auth headers set.
+        operations: Available operations.
+        weights: Operation name -> weight for this scenario.
+        concurrency: Number of concurrent clients.
+        requests: Total number of requests.
+
+    Returns:
+        dict: overall summary plus a summary per route
+    """
+    chosen = random.Random(1).choices(
+        [operations[name] for name in weights], list(weights.values()), k=requests
+    )
+    queue: asyncio.Queue[Operation] = asyncio.Queue()
+    for operation in chosen:
+        queue.put_nowait(operation)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+
+    async def worker() -> None:
+        while not queue.empty():
+            operation = queue.get_nowait()
+            method, path, params, body = operation.build()
+            start = perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[operation.route].append(perf_counter() - start)
+            errors[operation.route] += failed
+
+    start = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = perf_counter() - start
+
+    every_latency = [value for values in latencies.values() for value in values]
+    return {
+        "concurrency": concurrency,
+        "seconds": round(seconds, 3),
+        **summarize(every_latency, sum(errors.values()), seconds),
+        "routes": {
+            route: summarize(latencies[route], errors[route], seconds)
+            for route in sorted(latencies)
+        },
+    }
+
+
+def compare(baseline: dict[str, Any], results: dict[str, Any]) -> dict[str, Any]:
+    """Compare a run against a saved baseline run.
+
+    Args:
+        baseline: Earlier output of this harness.
+        results: Current output.
+
+    Returns:
+        dict: per scenario and route, throughput ratio and p95 change in ms
+    """
+
+    def delta(before: dict, after: dict) -> dict[str, float]:
+        before_rps = before["throughput_rps"]
+        return {
+            "throughput_ratio": (
+                round(after["throughput_rps"] / before_rps, 2) if before_rps else None
+            ),
+            "p95_change_ms": round(after["p95_ms"] - before["p95_ms"], 2),
+        }
+
+    changes = {}
+    for scenario, after in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(scenario)
+        if before is None:
+            continue
+        changes[scenario] = {
+            **delta(before, after),
+            "routes": {
+                route: delta(before["routes"][route], stats)
+                for route, stats in after["routes"].items()
+                if route in before["routes"]
+            },
+        }
+    return changes
+
+
+@asynccontextmanager
+async def boot_sqlite(workdir: Path, csv_filepath: Path) -> AsyncIterator[int]:
+    """Serve the app from a fresh aiosqlite file database.
+
+    Args:
+        workdir: Directory for the database file.
+        csv_filepath: Synthetic inventory CSV.
+
+    Yields:
+        int: number of seeded products
+    """
+    bench_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{workdir / 'load.db'}", connect_args={"timeout": 30}
+    )
+    session_factory = async_sessionmaker(
+        bind=bench_engine, class_=AsyncSession, expire_on_commit=False
+    )
+
+    async def get_bench_db() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as db:
+            yield db
+
+    async with bench_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    seeded = await seed_sqlite(
+        session_factory=session_factory, csv_filepath=csv_filepath
+    )
+    app.dependency_overrides[get_db] = get_bench_db
+    app.dependency_overrides[get_read_db] = get_bench_db
+    work_queue.start()
+    try:
+        yield seeded
+    finally:
+        await work_queue.drain(timeout=settings.WORK_QUEUE_DRAIN_TIMEOUT)
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_read_db, None)
+        await bench_engine.dispose()
+
+
+@asynccontextmanager
+async def boot_postgres(csv_filepath: Path) -> AsyncIterator[int]:
+    """Serve the app with its normal lifespan against settings.DATABASE_URL.
+
+    Args:
+        csv_filepath: Synthetic inventory CSV.
+
+    Yields:
+        int: number of seeded products
+    """
+    async with app.router.lifespan_context(app):
+        stats = await seed_db_bulk(csv_filepath=str(csv_filepath))
+        yield stats["products"]
+
+
+async def main_async(args: argparse.Namespace) -> dict[str, Any]:
+    """Boot, seed and run the requested scenarios.
+
+    Args:
+        args: Parsed command line arguments.
+
+    Returns:
+        dict: run parameters and results per scenario
+    """
+    settings.environment = "production"
+    token = create_access_token(
+        data={"sub": "load@example.com", "role": "admin"},
+        expires_delta=timedelta(hours=1),
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+    scenarios = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    results: dict[str, Any] = {
+        "database": "remote" if args.base_url else args.database,
+        "products": args.products,
+        "requests_per_scenario": args.requests,
+        "scenarios": {},
+    }
+
+    async def run_all(client: httpx.AsyncClient) -> None:
+        operations = get_operations(
+            products=args.products, categories=len(PRODUCT_TYPES)
+        )
+        for scenario in scenarios:
+            results["scenarios"][scenario] = await run_scenario(
+                client=client,
+                operations=operations,
+                weights=SCENARIOS[scenario],
+                concurrency=args.concurrency,
+                requests=args.requests,
+            )
+
+    if args.base_url:
+        async with httpx.AsyncClient(
+            base_url=args.base_url, headers=headers, timeout=60
+        ) as client:
+            await run_all(client=client)
+        return results
+
+    setup_logging()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            workdir = Path(tmp)
+            csv_filepath = workdir / "inventory.csv"
+            write_synthetic_csv(path=csv_filepath, products=args.products, seed=0)
+            if args.database == "postgres":
+                booted = boot_postgres(csv_filepath=csv_filepath)
+            else:
+                booted = boot_sqlite(workdir=workdir, csv_filepath=csv_filepath)
+            async with booted as seeded:
+                results["products"] = seeded
+                # unhandled endpoint errors count as 500s instead of aborting
+                transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+                async with httpx.AsyncClient(
+                    transport=transport,
+                    base_url="http://load-harness",
+                    headers=headers,
+                    timeout=60,
+                ) as client:
+                    await run_all(client=client)
+    finally:
+        shutdown_logging()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--database", choices=("sqlite", "postgres"), default="sqlite")
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--scenario", choices=(*SCENARIOS, "all"), default="all")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--baseline", type=Path, default=None)
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args=args))
+    if args.baseline:
+        results["change"] = compare(
+            baseline=json.loads(args.baseline.read_text()), results=results
+        )
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,8 @@
+# first, so the boot clock covers every import below
+from src.core.startup_profiler import startup_profiler  # isort: skip
+
 import uuid
+from time import perf_counter
 
 import uvicorn
 from fastapi import FastAPI, Request
@@ -6,16 +10,23 @@ from fastapi import FastAPI, Request
 from src.core.app_utility import lifespan
 from src.core.exception_handler import add_exception_handlers_to_app
 from src.core.log import correlation_id, get_logger
+from src.core.metrics import get_route_template, metrics_registry
+from src.core.responses import FastJSONResponse
+
+from .routes import category, change, internal, pricing, product, user
 
-from .routes import category, product, user
+startup_profiler.mark("imports")
 
 logger = get_logger(__name__)
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 app.include_router(product.product)
 app.include_router(user.user)
 app.include_router(category.category)
+app.include_router(pricing.pricing)
+app.include_router(change.change)
+app.include_router(internal.internal)
 
 
 @app.middleware("http")
@@ -41,7 +52,37 @@ async def logger_middleware(request: Request, call_next):
         correlation_id.reset(token)
 
 
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """Middleware recording per-route latency histograms and in-flight gauges.
+
+    Args:
+        request: Incoming HTTP request.
+        call_next: Next middleware in the chain.
+
+    Returns:
+        HTTP response, unchanged.
+    """
+    method = request.method
+    status_code = 500
+    metrics_registry.add_in_flight(method=method, delta=1)
+    start = perf_counter()
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        metrics_registry.observe_request(
+            method=method,
+            route=get_route_template(request=request),
+            status=status_code,
+            seconds=perf_counter() - start,
+        )
+        metrics_registry.add_in_flight(method=method, delta=-1)
+
+
 add_exception_handlers_to_app(app=app)
+startup_profiler.mark("app setup")
 
 
 @app.get("/")
@@ -1,29 +1,35 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.core.etag import check_not_modified
 from src.core.jwt import required_roles
 from src.core.log import get_logger
 from src.models.category import Category
 from src.repository.database import (
     add_commit_refresh_db,
-    commit_refresh_db,
     delete_commit_db,
     get_db,
+    get_read_db,
 )
 from src.schema.category import (
     CategoryCreate,
     CategoryRead,
     CategoryResponse,
     CategoryUpdate,
+    category_read_list,
 )
 from src.schema.user import UserRole
 from src.services.category_service import (
     check_existing_category_using_id,
     check_existing_category_using_name,
+    commit_category_update,
     get_category_by_id,
     get_category_by_name,
+    get_category_etag,
+    get_category_summary,
+    get_category_summary_etag,
 )
 from src.services.models import ResponseStatus
 
@@ -34,49 +40,99 @@ logger = get_logger(__name__)
 
 @category.get("/category/all", response_model=CategoryResponse)
 @required_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN)
-async def get_all_category(request: Request, db: AsyncSession = Depends(get_db)):
+async def get_all_category(
+    request: Request, response: Response, db: AsyncSession = Depends(get_read_db)
+):
     """Retrieve all categories from the database.
 
     Args:
         request: HTTP request object.
+        response: Outgoing response, carries the ETag header.
         db: Database session dependency.
 
     Returns:
-        CategoryResponse containing all categories.
+        CategoryResponse containing all categories, or 304 Not Modified
+        if If-None-Match holds the current ETag.
     """
     current_user_email = request.state.email
     logger.debug(f"Fetching all categories, requested by: {current_user_email}")
+    etag = await get_category_etag(category_id=None, db=db)
+    not_modified = check_not_modified(request=request, response=response, etag=etag)
+    if not_modified is not None:
+        return not_modified
 
     results = await db.execute(select(Category))
     all_categories = results.scalars().all()
 
     logger.info(f"Retrieved {len(all_categories)} categories")
-    categories_data = [CategoryRead.model_validate(cat) for cat in all_categories]
+    categories_data = category_read_list.validate_python(
+        all_categories, from_attributes=True
+    )
     return {
         "status": ResponseStatus.S.value,
         "message": {
             "current user's email": current_user_email,
-            "all categories": [cat.model_dump() for cat in categories_data],
+            "all categories": categories_data,
         },
     }
 
 
+@category.get("/category/summary", response_model=CategoryResponse)
+@required_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN)
+async def get_category_summary_view(
+    request: Request, response: Response, db: AsyncSession = Depends(get_read_db)
+):
+    """Retrieve product count, total quantity and stock value per category.
+
+    Args:
+        request: HTTP request object.
+        response: Outgoing response, carries the ETag header.
+        db: Database session dependency.
+
+    Returns:
+        CategoryResponse containing one summary per category, or 304 Not
+        Modified if If-None-Match holds the current ETag.
+    """
+    logger.debug(f"Category summary requested by: {request.state.email}")
+    etag = await get_category_summary_etag(db=db)
+    not_modified = check_not_modified(request=request, response=response, etag=etag)
+    if not_modified is not None:
+        return not_modified
+
+    summary = await get_category_summary(db=db)
+    logger.info(f"Retrieved summary for {len(summary)} categories")
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {"category summary": summary},
+    }
+
+
 @category.get("/category", response_model=CategoryResponse)
 @required_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN)
 async def get_specifc_category(
-    request: Request, category_id: int, db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    category_id: int,
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Retrieve a specific category by ID.
 
     Args:
         request: HTTP request object.
+        response: Outgoing response, carries the ETag header.
         category_id: ID of the category to retrieve.
         db: Database session dependency.
 
     Returns:
-        CategoryResponse containing the category or error message.
+        CategoryResponse containing the category or error message, or 304
+        Not Modified if If-None-Match holds the current ETag.
     """
     logger.debug(f"Fetching category with id: {category_id}")
+    etag = await get_category_etag(category_id=category_id, db=db)
+    if etag is not None:
+        not_modified = check_not_modified(request=request, response=response, etag=etag)
+        if not_modified is not None:
+            return not_modified
 
     stmt = select(Category).filter_by(id=category_id)
     result = await db.execute(stmt)
@@ -139,18 +195,24 @@ async def add_category(
 @required_roles(UserRole.MANAGER, UserRole.ADMIN)
 async def update_category(
     request: Request,
+    response: Response,
     category_update: CategoryUpdate,
     db: AsyncSession = Depends(get_db),
 ):
     """Update an existing category.
 
+    Send the ETag from GET /category as If-Match to make the update
+    conditional; concurrent edits are rejected either way.
+
     Args:
         request: HTTP request object.
+        response: Outgoing response, carries the new ETag header.
         category_update: Category data to update.
         db: Database session dependency.
 
     Returns:
-        CategoryResponse containing the updated category or error message.
+        CategoryResponse containing the updated category or error message,
+        or 409 with the current category if it changed since it was read.
     """
     logger.debug(f"Update category request for id: {category_update.id}")
     existing_category = await get_category_by_id(category_id=category_update.id, db=db)
@@ -180,7 +242,9 @@ async def update_category(
         }
 
     existing_category.name = category_update.name.lower()
-    await commit_refresh_db(object=existing_category, db=db)
+    response.headers["ETag"] = await commit_category_update(
+        category=existing_category, if_match=request.headers.get("if-match"), db=db
+    )
     logger.info(
         f"Category {category_update.id} updated to name: {existing_category.name}"
     )
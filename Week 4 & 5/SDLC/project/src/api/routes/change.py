@@ -0,0 +1,166 @@
+import asyncio
+import json
+from typing import AsyncGenerator, Optional
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.jwt import required_roles
+from src.core.log import get_logger
+from src.repository.database import get_read_db
+from src.schema.change import ChangeFeedResponse, ChangeRead
+from src.schema.user import UserRole
+from src.services.change_service import get_change_feed
+from src.services.change_stream_service import (
+    StreamFilter,
+    Subscriber,
+    change_stream_broker,
+)
+
+change = APIRouter()
+
+logger = get_logger(__name__)
+
+
+@change.get("/changes", response_model=ChangeFeedResponse)
+@required_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN)
+async def get_changes(
+    request: Request,
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Page through product and category changes after a cursor.
+
+    Pass "next cursor" from the previous page as since until "has more" is
+    false, then poll again later from the last cursor.
+
+    Args:
+        request: HTTP request object.
+        since: Cursor of the last transaction already applied, 0 for all.
+        limit: Maximum number of changes per page.
+        db: Database session dependency.
+
+    Returns:
+        Upserts and deletes in cursor order, with the next cursor.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Change feed request after {since} by: {current_user_email}")
+    return await get_change_feed(
+        user_email=current_user_email, since=since, limit=limit, db=db
+    )
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Render one server-sent event.
+
+    Args:
+        event: Event name.
+        data: JSON payload.
+        event_id: Cursor sent as the event id, so clients can resume.
+
+    Returns:
+        str: event block terminated by a blank line
+    """
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event}", f"data: {json.dumps(data)}"]
+    return "\n".join(lines) + "\n\n"
+
+
+def format_change(change: ChangeRead) -> str:
+    """Render a change as a server-sent event named after its operation.
+
+    Args:
+        change: Change to send.
+
+    Returns:
+        str: event block
+    """
+    return format_event(
+        event=change.operation.value,
+        data=change.model_dump(mode="json"),
+        event_id=change.cursor,
+    )
+
+
+async def stream_changes(
+    request: Request, subscriber: Subscriber, cursor: int, heartbeat: float
+) -> AsyncGenerator[str, None]:
+    """Send a subscriber's changes until the client goes away or is dropped.
+
+    Args:
+        request: HTTP request object, checked for disconnects.
+        subscriber: Buffer the broker fills.
+        cursor: Cursor the stream starts after.
+        heartbeat: Seconds of silence before a keep-alive comment.
+
+    Yields:
+        str: server-sent event blocks
+    """
+    # changes of one transaction share its cursor; applied is the last
+    # transaction whose changes were all sent
+    applied = cursor
+    try:
+        yield format_event(event="ready", data={"cursor": cursor})
+        while not await request.is_disconnected():
+            try:
+                change = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=heartbeat
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if change is None:
+                # the buffer was discarded, possibly mid-transaction: resume
+                # with GET /changes?since=<cursor>, then reconnect
+                yield format_event(event="dropped", data={"cursor": applied})
+                return
+            if change.cursor != cursor:
+                applied, cursor = cursor, change.cursor
+            yield format_change(change=change)
+    finally:
+        change_stream_broker.unsubscribe(subscriber=subscriber)
+
+
+@change.get("/changes/stream")
+@required_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN)
+async def get_change_stream(
+    request: Request,
+    category_id: Optional[int] = Query(default=None, gt=0),
+    product_ids: Optional[list[int]] = Query(default=None),
+):
+    """Stream product and category changes as server-sent events.
+
+    Replaces polling: changes committed by any worker are pushed as they
+    happen. Events carry the change log cursor as their id, shared by the
+    changes of one transaction. A client too slow to keep up gets a
+    "dropped" event with the cursor of its last complete transaction,
+    catches up through GET /changes and reconnects.
+
+    Args:
+        request: HTTP request object.
+        category_id: Only changes of this category and its products.
+        product_ids: Only changes of these products, repeat the parameter
+            for several.
+
+    Returns:
+        text/event-stream response.
+    """
+    logger.debug(f"Change stream opened by: {request.state.email}")
+    stream_filter = StreamFilter(
+        category_id=category_id, product_ids=frozenset(product_ids or ())
+    )
+    await change_stream_broker.ensure_started()
+    subscriber = change_stream_broker.subscribe(stream_filter=stream_filter)
+    return StreamingResponse(
+        stream_changes(
+            request=request,
+            subscriber=subscriber,
+            cursor=change_stream_broker.cursor,
+            heartbeat=settings.CHANGE_STREAM_HEARTBEAT,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
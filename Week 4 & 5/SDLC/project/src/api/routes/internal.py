@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from src.core.invalidation import invalidation_bus
+from src.core.jwt import required_roles
+from src.core.log import get_logger
+from src.core.metrics import metrics_registry
+from src.core.startup_profiler import startup_profiler
+from src.core.work_queue import work_queue
+from src.repository.database import engine, replica_engines
+from src.repository.pool import get_pool_status
+from src.repository.user_cache import user_cache
+from src.schema.user import UserRole
+from src.services.change_stream_service import change_stream_broker
+from src.services.models import ResponseStatus
+
+internal = APIRouter()
+
+logger = get_logger(__name__)
+
+
+@internal.get("/internal/pool")
+@required_roles(UserRole.ADMIN)
+async def get_connection_pool_status(request: Request):
+    """Report connection pool occupancy and checkout wait times.
+
+    Args:
+        request: HTTP request object.
+
+    Returns:
+        Dictionary with checked out, idle and overflow counts and wait stats,
+        for the primary and each read replica.
+    """
+    pool_status = get_pool_status(engine=engine)
+    replica_status = [get_pool_status(engine=replica) for replica in replica_engines]
+    logger.debug(f"Pool status requested by: {request.state.email}")
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {"pool": pool_status, "replica pools": replica_status},
+    }
+
+
+@internal.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Expose request, pool, queue, stream, cache and boot metrics for Prometheus.
+
+    Returns:
+        Plain text response for a Prometheus scraper.
+    """
+    pool_status = get_pool_status(engine=engine)
+    pool_gauges = {
+        f"db_pool_{key}": value
+        for key, value in pool_status.items()
+        if isinstance(value, (int, float))
+    }
+    queue_gauges = {
+        f"work_queue_{key}": value for key, value in work_queue.stats().items()
+    }
+    stream_gauges = {
+        f"change_stream_{key}": value
+        for key, value in change_stream_broker.stats().items()
+    }
+    invalidation_gauges = {
+        f"invalidation_{key}": value for key, value in invalidation_bus.stats().items()
+    }
+    user_cache_gauges = {
+        f"user_cache_{key}": value for key, value in user_cache.stats().items()
+    }
+    startup_gauges = {
+        f"startup_{name.replace(' ', '_')}_seconds": seconds
+        for name, seconds in startup_profiler.stats().items()
+    }
+    return PlainTextResponse(
+        content=metrics_registry.render(
+            extra_gauges={
+                **pool_gauges,
+                **queue_gauges,
+                **stream_gauges,
+                **invalidation_gauges,
+                **user_cache_gauges,
+                **startup_gauges,
+            }
+        ),
+        media_type="text/plain; version=0.0.4",
+    )
@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.jwt import required_roles
+from src.core.log import get_logger
+from src.repository.database import get_db, get_read_db
+from src.schema.pricing import PricingResponse, PricingRuleSet
+from src.schema.user import UserRole
+from src.services.pricing_service import apply_pricing, preview_pricing
+
+pricing = APIRouter()
+
+logger = get_logger(__name__)
+
+
+@pricing.post("/pricing/preview", response_model=PricingResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER)
+async def post_pricing_preview(
+    request: Request,
+    rule_set: PricingRuleSet,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Show the price changes a rule set would make, without writing them.
+
+    Args:
+        request: HTTP request object.
+        rule_set: Ordered pricing rules.
+        db: Database session dependency.
+
+    Returns:
+        Old and new price of every matching product.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Pricing preview requested by: {current_user_email}")
+    return await preview_pricing(
+        user_email=current_user_email, rule_set=rule_set, db=db
+    )
+
+
+@pricing.post("/pricing/apply", response_model=PricingResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER)
+async def post_pricing_apply(
+    request: Request, rule_set: PricingRuleSet, db: AsyncSession = Depends(get_db)
+):
+    """Reprice every matching product in one bulk update.
+
+    Args:
+        request: HTTP request object.
+        rule_set: Ordered pricing rules.
+        db: Database session dependency.
+
+    Returns:
+        Number of updated products.
+    """
+    current_user_email = request.state.email
+    logger.info(f"Pricing rules applied by: {current_user_email}")
+    return await apply_pricing(
+        user_email=current_user_email, rule_set=rule_set, db=db
+    )
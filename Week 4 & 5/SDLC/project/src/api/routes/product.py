@@ -1,22 +1,35 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.core.etag import check_not_modified
+from src.core.idempotency import idempotent
 from src.core.jwt import required_roles
 from src.core.log import get_logger
 from src.models.product import Product
-from src.repository.database import commit_refresh_db, get_db
-from src.schema.product import ProductCreate, ProductUpdate
+from src.repository.database import commit_refresh_db, get_db, get_read_db
+from src.schema.product import (
+    ProductCreate,
+    ProductRead,
+    ProductUpdate,
+    StockReservation,
+    WrapperProductResponse,
+)
 from src.schema.user import UserRole
 from src.services.category_service import get_category_by_id
+from src.services.import_service import get_import_status, start_import
+from src.services.low_stock_service import get_low_stock_report
 from src.services.models import ResponseStatus
 from src.services.product_service import (
+    change_stock,
     delete_product,
     get_all_products,
     get_category_specific_products,
+    get_product_search_results,
+    get_products_etag,
     get_specific_product,
     handle_missing_product,
     post_product,
@@ -29,29 +42,41 @@ product = APIRouter()
 logger = get_logger(__name__)
 
 
-@product.get("/products")
+@product.get("/products", response_model=WrapperProductResponse)
 @required_roles(UserRole.ADMIN, UserRole.MANAGER, UserRole.STAFF)
 async def get_products(
     request: Request,
+    response: Response,
     product_id: Optional[int] = None,
     category_id: Optional[int] = None,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Retrieve products based on optional filters.
 
     Args:
         request: HTTP request object.
+        response: Outgoing response, carries the ETag header.
         product_id: Optional product ID to filter by.
         category_id: Optional category ID to filter by.
         db: Database session dependency.
 
     Returns:
-        Product response based on provided filters.
+        Product response based on provided filters, or 304 Not Modified
+        if If-None-Match holds the current ETag.
     """
     current_user_email: str = request.state.email
     logger.debug(
         f"Get products request by: {current_user_email}, product_id: {product_id}, category_id: {category_id}"
     )
+    etag = await get_products_etag(
+        product_id=product_id, category_id=category_id, db=db
+    )
+    if etag is not None:
+        not_modified = check_not_modified(request=request, response=response, etag=etag)
+        if not_modified is not None:
+            logger.debug(f"Products not modified, etag: {etag}")
+            return not_modified
+
     if product_id and product_id is not None:
         check_id_type(id=product_id)
         return await get_specific_product(
@@ -67,8 +92,61 @@ async def get_products(
     return await get_all_products(user_email=current_user_email, db=db)
 
 
-@product.post("/products")
+@product.get("/products/search", response_model=WrapperProductResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER, UserRole.STAFF)
+async def search_products(
+    request: Request,
+    q: str = Query(min_length=1, max_length=100),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """Search products by name with prefix, full-text and fuzzy matching.
+
+    Args:
+        request: HTTP request object.
+        q: Search text.
+        limit: Maximum number of results.
+        offset: Number of results to skip.
+        db: Database session dependency.
+
+    Returns:
+        Ranked search results and the offset of the next page.
+    """
+    current_user_email: str = request.state.email
+    logger.debug(f"Product search request by: {current_user_email}, q: {q}")
+    return await get_product_search_results(
+        user_email=current_user_email, query=q, limit=limit, offset=offset, db=db
+    )
+
+
+@product.get("/products/low-stock", response_model=WrapperProductResponse)
+@required_roles(UserRole.STAFF, UserRole.MANAGER, UserRole.ADMIN)
+async def get_low_stock(
+    request: Request,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """List products under the low-stock threshold.
+
+    Served from the set the background job keeps, so dashboards no longer
+    fetch the whole catalog to find them.
+
+    Args:
+        request: HTTP request object.
+        db: Database session dependency.
+
+    Returns:
+        Low-stock products, the threshold, when they were checked and the
+        recent low/recovered transitions.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Low stock request by: {current_user_email}")
+    return await get_low_stock_report(user_email=current_user_email, db=db)
+
+
+@product.post("/products", response_model=WrapperProductResponse)
 @required_roles(UserRole.ADMIN, UserRole.MANAGER)
+@idempotent
 async def post_products(
     request: Request,
     product: Optional[ProductCreate] = None,
@@ -76,6 +154,9 @@ async def post_products(
 ):
     """Create a new product.
 
+    Retries sent with the same Idempotency-Key header replay the first
+    response instead of creating the product again.
+
     Args:
         request: HTTP request object.
         product: Product data to create.
@@ -90,39 +171,155 @@ async def post_products(
     return await post_product(user_email=current_user_email, product=product, db=db)
 
 
-@product.put("/product")
+@product.post("/products/import", response_model=WrapperProductResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER)
+async def import_products(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """Upload an inventory CSV and import it in the background.
+
+    The body is the raw file in the new_inventory.csv format, eg:
+    curl --data-binary @new_inventory.csv -H "Content-Type: text/csv".
+    It is streamed to disk, then validated and upserted by product id in
+    batches; poll GET /products/import/{job_id} for progress and rejected
+    rows.
+
+    Args:
+        request: HTTP request object, its body is the CSV.
+        db: Database session dependency.
+
+    Returns:
+        The queued import job.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Product import request by: {current_user_email}")
+    return await start_import(
+        user_email=current_user_email, chunks=request.stream(), db=db
+    )
+
+
+@product.get("/products/import/{job_id}", response_model=WrapperProductResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER)
+async def get_product_import(
+    request: Request,
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """Report the progress of a CSV import.
+
+    Read from the primary, a replica may not have the job yet.
+
+    Args:
+        request: HTTP request object.
+        job_id: Import job id returned by POST /products/import.
+        db: Database session dependency.
+
+    Returns:
+        Job status, row counts and the first rejected rows with the reason.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Import job {job_id} status requested by: {current_user_email}")
+    return await get_import_status(
+        job_id=job_id, user_email=current_user_email, db=db
+    )
+
+
+@product.put("/product", response_model=WrapperProductResponse)
 @required_roles(UserRole.ADMIN, UserRole.MANAGER)
 async def update_product(
     request: Request,
+    response: Response,
     product_id: int,
     product_update: ProductUpdate,
     db: Session = Depends(get_db),
 ):
     """Update product information.
 
+    Send the ETag from GET /products as If-Match to make the update
+    conditional; concurrent edits are rejected either way.
+
     Args:
         request: HTTP request object.
+        response: Outgoing response, carries the new ETag header.
         product_id: ID of the product to update.
         product_update: Product update data.
         db: Database session dependency.
 
     Returns:
-        Updated product response.
+        Updated product response, or 409 with the current product if it
+        changed since it was read.
     """
     current_user_email = request.state.email
     logger.debug(
         f"Update product request for product_id: {product_id} by: {current_user_email}"
     )
     logger.info(f"Updating product with id: {product_id}")
-    return await put_product(
+    result = await put_product(
         current_user_email=current_user_email,
         product_id=product_id,
         product_update=product_update,
         db=db,
+        if_match=request.headers.get("if-match"),
+    )
+    etag = await get_products_etag(product_id=product_id, category_id=None, db=db)
+    if etag is not None:
+        response.headers["ETag"] = etag
+    return result
+
+
+@product.post("/products/reserve", response_model=WrapperProductResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER)
+async def reserve_stock(
+    request: Request,
+    reservation: StockReservation,
+    db: AsyncSession = Depends(get_db),
+):
+    """Atomically take stock for one or more products.
+
+    Every line is decremented with a conditional UPDATE in product id order,
+    in one transaction, so racing checkouts cannot oversell or deadlock.
+
+    Args:
+        request: HTTP request object.
+        reservation: Products and quantities to reserve.
+        db: Database session dependency.
+
+    Returns:
+        Remaining quantity per product, or 409 if any line is short.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Stock reservation request by: {current_user_email}")
+    return await change_stock(
+        user_email=current_user_email, reservation=reservation, reserve=True, db=db
+    )
+
+
+@product.post("/products/release", response_model=WrapperProductResponse)
+@required_roles(UserRole.ADMIN, UserRole.MANAGER)
+async def release_stock(
+    request: Request,
+    reservation: StockReservation,
+    db: AsyncSession = Depends(get_db),
+):
+    """Put reserved stock back, eg: for a cancelled checkout.
+
+    Args:
+        request: HTTP request object.
+        reservation: Products and quantities to release.
+        db: Database session dependency.
+
+    Returns:
+        Quantity per product after the release.
+    """
+    current_user_email = request.state.email
+    logger.debug(f"Stock release request by: {current_user_email}")
+    return await change_stock(
+        user_email=current_user_email, reservation=reservation, reserve=False, db=db
     )
 
 
-@product.delete("/product")
+@product.delete("/product", response_model=WrapperProductResponse)
 @required_roles(UserRole.ADMIN)
 async def remove_product(
     request: Request,
@@ -148,7 +345,7 @@ async def remove_product(
     return await delete_product(current_user_email, product_id=product_id, db=db)
 
 
-@product.patch("/product/update_category")
+@product.patch("/product/update_category", response_model=WrapperProductResponse)
 @required_roles(UserRole.ADMIN, UserRole.MANAGER)
 async def update_product_category(
     request: Request,
@@ -201,10 +398,11 @@ async def update_product_category(
     await commit_refresh_db(object=product, db=db)
     logger.info(f"Product {product_id} category updated to {category.name}")
 
+    updated_product = ProductRead.model_validate(product)
     return {
         "status": ResponseStatus.S.value,
         "message": {
             "user email": current_user_email,
-            f"updated product to {category.name} category": product,
+            f"updated product to {category.name} category": updated_product,
         },
     }
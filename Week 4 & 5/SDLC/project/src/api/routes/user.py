@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.idempotency import idempotent
 from src.core.jwt import required_roles
 from src.core.log import get_logger
 from src.interfaces.user_service import AbstractUserService
@@ -35,15 +36,23 @@ def get_user_service(db: AsyncSession = Depends(get_db)) -> UserService:
 
 
 @user.post("/user/register", response_model=WrapperUserResponse)
+@idempotent
 async def register_user(
+    request: Request,
     create_user: UserRegister,
     user_service: AbstractUserService = Depends(get_user_service),
+    db: AsyncSession = Depends(get_db),
 ):
     """Registers a new user account in the system.
 
+    Retries sent with the same Idempotency-Key header replay the first
+    response instead of registering again.
+
     Args:
+        request: HTTP request object, read for the Idempotency-Key header.
         create_user: Data transfer object containing registration details.
         user_service: The user service business logic layer.
+        db: Database session shared with user_service, stores the key.
 
     Returns:
         A dictionary containing the success status and the registered user data.
@@ -78,26 +87,38 @@ async def login_user(
 @user.get("/user/all", response_model=WrapperUserResponse)
 @required_roles(UserRole.MANAGER, UserRole.ADMIN, UserRole.STAFF)
 async def get_all_users(
-    request: Request, user_service: AbstractUserService = Depends(get_user_service)
+    request: Request,
+    limit: int = Query(default=50, ge=1, le=200),
+    offset: int = Query(default=0, ge=0),
+    user_service: AbstractUserService = Depends(get_user_service),
 ):
-    """Retrieves a list of all users from the database.
+    """Retrieves a page of users from the database, ordered by id.
 
     Requires MANAGER, ADMIN, or STAFF roles.
 
     Args:
         request: The FastAPI request object (used to extract current user email).
+        limit: Maximum number of users to return.
+        offset: Number of users to skip.
         user_service: The user service business logic layer.
 
     Returns:
-        A dictionary containing the list of all users and the requester's email.
+        A dictionary containing the page of users, the offset of the next
+        page and the requester's email.
     """
     current_user_email = request.state.email
-    all_users = await user_service.get_users(user_email=current_user_email)
+    users, next_offset = await user_service.get_users(
+        user_email=current_user_email, limit=limit, offset=offset
+    )
 
-    logger.info(f"Retrieved {len(all_users)} users")
+    logger.info(f"Retrieved {len(users)} users")
     return {
         "status": ResponseStatus.S.value,
-        "message": {"user email": current_user_email, "users": all_users},
+        "message": {
+            "user email": current_user_email,
+            "users": users,
+            "next offset": next_offset,
+        },
     }
 
 
@@ -1,15 +1,69 @@
 from contextlib import asynccontextmanager
+from time import time
 from typing import AsyncGenerator
 
 from fastapi import FastAPI
 
 from src.core.config import settings
-from src.core.log import get_logger, log_settings, setup_logging
-from src.repository.database import Base, engine
+from src.core.invalidation import invalidation_bus
+from src.core.log import get_logger, log_settings, setup_logging, shutdown_logging
+from src.core.startup_profiler import startup_profiler
+from src.core.work_queue import work_queue
+from src.repository.database import (
+    Base,
+    async_session_local,
+    engine,
+    replica_engines,
+)
+from src.repository.category_summary import backfill_category_summary
+from src.repository.idempotency import delete_expired_idempotency_keys
+from src.repository.migrations import schema_at_head
+from src.repository.pool import log_pool_status
+from src.repository.product_import import fail_stale_import_jobs
+from src.services.category_service import category_summary_compactor
+from src.services.change_service import change_log_pruner
+from src.services.change_stream_service import change_stream_broker
+from src.services.low_stock_service import low_stock_monitor
+from src.services.password_service import password_service
 
 logger = get_logger(__name__)
 
 
+async def init_schema() -> None:
+    """Create missing tables, unless migrations already did.
+
+    In fast boot mode create_all is skipped when the database is stamped
+    with the alembic head; otherwise it runs as before, since it only
+    issues CREATE for tables that do not exist.
+    """
+    if settings.FAST_BOOT and await schema_at_head(engine=engine):
+        logger.info("✅ Schema at alembic head, create_all skipped")
+        return
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    logger.info("✅ Database initialized successfully")
+
+
+async def purge_idempotency_keys() -> None:
+    """Delete idempotency keys whose TTL passed while the app was down."""
+    async with async_session_local() as db:
+        await delete_expired_idempotency_keys(db=db)
+
+
+async def build_category_summary() -> None:
+    """Build the materialized category summary if it is still empty."""
+    async with async_session_local() as db:
+        await backfill_category_summary(db=db)
+
+
+async def fail_stale_imports() -> None:
+    """Fail import jobs left running by a worker that stopped mid-import."""
+    async with async_session_local() as db:
+        await fail_stale_import_jobs(
+            stale_before=time() - settings.IMPORT_STALE_AFTER, db=db
+        )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Manage application startup and shutdown lifecycle.
@@ -21,13 +75,48 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         None: Application runs during this period.
     """
     # Stratup:
-    setup_logging()
+    with startup_profiler.phase("logging"):
+        setup_logging()
     logger.info("🚀 Starting application...")
 
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    with startup_profiler.phase("schema"):
+        await init_schema()
 
-    logger.info("✅ Database initialized successfully")
+    # before serving: cached reads must see other workers' writes
+    with startup_profiler.phase("invalidation bus"):
+        await invalidation_bus.start(listen_engine=engine)
+
+    if settings.CATEGORY_SUMMARY_MATERIALIZED:
+        # before serving: an empty summary would report no products
+        with startup_profiler.phase("category summary"):
+            await build_category_summary()
+
+    if settings.FAST_BOOT:
+        with startup_profiler.phase("background jobs"):
+            work_queue.start()
+            # none is needed to serve the first request
+            work_queue.submit(
+                name="delete expired idempotency keys",
+                func=purge_idempotency_keys,
+            )
+            work_queue.submit(name="fail stale import jobs", func=fail_stale_imports)
+            change_stream_broker.defer_start(
+                session_factory=async_session_local, listen_engine=engine
+            )
+    else:
+        with startup_profiler.phase("idempotency cleanup"):
+            await purge_idempotency_keys()
+        with startup_profiler.phase("import cleanup"):
+            await fail_stale_imports()
+        with startup_profiler.phase("background jobs"):
+            work_queue.start()
+            await change_stream_broker.start(
+                session_factory=async_session_local, listen_engine=engine
+            )
+    low_stock_monitor.start(session_factory=async_session_local)
+    change_log_pruner.start(session_factory=async_session_local)
+    category_summary_compactor.start(session_factory=async_session_local)
+    startup_profiler.finish()
 
     # LOGGING .env vars
     logger.info(f"Executing in {settings.environment} environ")
@@ -41,3 +130,16 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown:
     logger.info("👋 Shutprintting down application...")
+    # drain before disposing the engine, queued jobs may still need the db
+    await work_queue.drain(timeout=settings.WORK_QUEUE_DRAIN_TIMEOUT)
+    await change_stream_broker.stop()
+    await low_stock_monitor.stop()
+    await change_log_pruner.stop()
+    await category_summary_compactor.stop()
+    await invalidation_bus.stop()
+    log_pool_status(engine=engine)
+    password_service.shutdown()
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
+    shutdown_logging()
@@ -44,6 +44,68 @@ class Settings(BaseSettings, metaclass=Singleton):
         """
         return f"postgresql+asyncpg://postgres:{self.postgresql_pwd}@{self.db_host}:5432/inventory_manager"
 
+    # READ REPLICAS
+    # comma separated DSNs, GET endpoints read from these round-robin
+    DB_REPLICA_URLS: str = Field(default="", validation_alias="DB_REPLICA_URLS")
+
+    @property
+    def replica_urls(self) -> list[str]:
+        """Split DB_REPLICA_URLS into a list.
+
+        Returns:
+            Replica connection strings, empty if no replica is configured.
+        """
+        return [url.strip() for url in self.DB_REPLICA_URLS.split(",") if url.strip()]
+
+    # BULK SEEDING
+    SEED_CHUNK_SIZE: int = Field(default=10000, validation_alias="SEED_CHUNK_SIZE")
+
+    # CSV IMPORT
+    IMPORT_BATCH_SIZE: int = Field(default=1000, validation_alias="IMPORT_BATCH_SIZE")
+    # rejected rows kept on the job, later ones are only counted
+    IMPORT_MAX_ERRORS: int = Field(default=100, validation_alias="IMPORT_MAX_ERRORS")
+    IMPORT_MAX_BYTES: int = Field(
+        default=100 * 1024 * 1024, validation_alias="IMPORT_MAX_BYTES"
+    )
+    # seconds without a finished batch after which a running job is failed
+    IMPORT_STALE_AFTER: int = Field(default=600, validation_alias="IMPORT_STALE_AFTER")
+
+    # CATEGORY SUMMARY
+    # an empty summary is built at startup; switching it back on after
+    # running with it off needs refresh_category_summary, the table is stale
+    CATEGORY_SUMMARY_MATERIALIZED: bool = Field(
+        default=False, validation_alias="CATEGORY_SUMMARY_MATERIALIZED"
+    )
+    # seconds between folds of appended deltas into the summary rows
+    CATEGORY_SUMMARY_COMPACT_INTERVAL: float = Field(
+        default=5.0, validation_alias="CATEGORY_SUMMARY_COMPACT_INTERVAL"
+    )
+
+    # SLOW QUERY LOG
+    # statements slower than this are logged, 0 disables the log
+    SLOW_QUERY_THRESHOLD_MS: float = Field(
+        default=500.0, ge=0, validation_alias="SLOW_QUERY_THRESHOLD_MS"
+    )
+    # parameters can hold personal data, those of user table statements are
+    # redacted even when enabled
+    SLOW_QUERY_LOG_PARAMETERS: bool = Field(
+        default=False, validation_alias="SLOW_QUERY_LOG_PARAMETERS"
+    )
+    # fraction of slow postgres SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS)
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = Field(
+        default=0.0, ge=0, le=1, validation_alias="SLOW_QUERY_EXPLAIN_SAMPLE_RATE"
+    )
+
+    # CONNECTION POOL
+    DB_POOL_SIZE: int = Field(default=5, validation_alias="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(default=10, validation_alias="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(default=30.0, validation_alias="DB_POOL_TIMEOUT")
+    DB_POOL_PRE_PING: bool = Field(default=True, validation_alias="DB_POOL_PRE_PING")
+    DB_POOL_RECYCLE: int = Field(default=1800, validation_alias="DB_POOL_RECYCLE")
+    DB_STATEMENT_CACHE_SIZE: int = Field(
+        default=100, validation_alias="DB_STATEMENT_CACHE_SIZE"
+    )
+
     # JWT
     JWT_SECRET_KEY: str = Field(
         default="test_secret_key_for_testing_only_change_in_production",
@@ -51,6 +113,78 @@ class Settings(BaseSettings, metaclass=Singleton):
     )
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    JWT_CACHE_SIZE: int = Field(default=1024, validation_alias="JWT_CACHE_SIZE")
+
+    # USER CACHE
+    USER_CACHE_SIZE: int = Field(default=1024, validation_alias="USER_CACHE_SIZE")
+    USER_CACHE_TTL: float = Field(default=60.0, validation_alias="USER_CACHE_TTL")
+
+    # BACKGROUND WORK QUEUE
+    WORK_QUEUE_SIZE: int = Field(default=1000, validation_alias="WORK_QUEUE_SIZE")
+    WORK_QUEUE_WORKERS: int = Field(default=4, validation_alias="WORK_QUEUE_WORKERS")
+    WORK_QUEUE_MAX_RETRIES: int = Field(
+        default=3, validation_alias="WORK_QUEUE_MAX_RETRIES"
+    )
+    WORK_QUEUE_RETRY_DELAY: float = Field(
+        default=0.5, validation_alias="WORK_QUEUE_RETRY_DELAY"
+    )
+    WORK_QUEUE_DRAIN_TIMEOUT: float = Field(
+        default=10.0, validation_alias="WORK_QUEUE_DRAIN_TIMEOUT"
+    )
+
+    # IDEMPOTENCY KEYS
+    IDEMPOTENCY_TTL: int = Field(default=86400, validation_alias="IDEMPOTENCY_TTL")
+    IDEMPOTENCY_CACHE_SIZE: int = Field(
+        default=1024, validation_alias="IDEMPOTENCY_CACHE_SIZE"
+    )
+    IDEMPOTENCY_WAIT_TIMEOUT: float = Field(
+        default=10.0, validation_alias="IDEMPOTENCY_WAIT_TIMEOUT"
+    )
+    IDEMPOTENCY_POLL_INTERVAL: float = Field(
+        default=0.05, validation_alias="IDEMPOTENCY_POLL_INTERVAL"
+    )
+    # seconds a request may hold a key before a retry can take it over
+    IDEMPOTENCY_LEASE: float = Field(default=60.0, validation_alias="IDEMPOTENCY_LEASE")
+
+    # CHANGE STREAM
+    CHANGE_STREAM_BUFFER_SIZE: int = Field(
+        default=100, validation_alias="CHANGE_STREAM_BUFFER_SIZE"
+    )
+    CHANGE_STREAM_POLL_INTERVAL: float = Field(
+        default=5.0, validation_alias="CHANGE_STREAM_POLL_INTERVAL"
+    )
+    CHANGE_STREAM_HEARTBEAT: float = Field(
+        default=15.0, validation_alias="CHANGE_STREAM_HEARTBEAT"
+    )
+
+    # CHANGE LOG RETENTION
+    # seconds a change stays in the feed, 0 keeps every change
+    CHANGE_LOG_RETENTION: float = Field(
+        default=7 * 86400, ge=0, validation_alias="CHANGE_LOG_RETENTION"
+    )
+    CHANGE_LOG_PRUNE_INTERVAL: float = Field(
+        default=3600.0, validation_alias="CHANGE_LOG_PRUNE_INTERVAL"
+    )
+
+    # FAST BOOT
+    # skip create_all when migrations are at head, defer non-critical init
+    FAST_BOOT: bool = Field(default=False, validation_alias="FAST_BOOT")
+
+    # LOW STOCK
+    LOW_STOCK_CHECK_INTERVAL: float = Field(
+        default=60.0, validation_alias="LOW_STOCK_CHECK_INTERVAL"
+    )
+    LOW_STOCK_HISTORY_SIZE: int = Field(
+        default=100, validation_alias="LOW_STOCK_HISTORY_SIZE"
+    )
+
+    # PASSWORD HASHING
+    PASSWORD_HASH_WORKERS: int = Field(
+        default=4, validation_alias="PASSWORD_HASH_WORKERS"
+    )
+    PASSWORD_HASH_CONCURRENCY: int = Field(
+        default=16, validation_alias="PASSWORD_HASH_CONCURRENCY"
+    )
 
     # .env settings
     model_config = SettingsConfigDict(
@@ -69,6 +203,7 @@ class Errors(str, Enum):
     WEAK_PWD_ERROR = "WEAK_PASSWORD_ERROR"
     DB_ERROR = "DATABASE_ERROR"
     AUTH_ERROR = "AUTH_ERROR"
+    CONFLICT_ERROR = "CONFLICT_ERROR"
 
 
 @dataclass
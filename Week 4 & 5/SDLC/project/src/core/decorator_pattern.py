@@ -30,6 +30,7 @@ class ConcretePrice(Price):
         Returns:
             Base price amount.
         """
+        return self.amount
 
 
 class Decorator(Price):
@@ -49,6 +50,7 @@ class Decorator(Price):
         Returns:
             Decorated price amount.
         """
+        return self._price.get_amount()
 
 
 class TaxDecorator(Decorator):
@@ -0,0 +1,79 @@
+from typing import Optional
+
+from fastapi import Request, Response
+
+# clients may cache but must revalidate with If-None-Match every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from version parts.
+
+    Args:
+        *parts: Values identifying the representation (eg: "product", 3, 7).
+
+    Returns:
+        Quoted entity tag such as "product-3-v7".
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against the current ETag.
+
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+
+    Args:
+        if_none_match: Raw header value, may list several tags or be "*".
+        etag: Current ETag of the resource.
+
+    Returns:
+        True if the client already holds the current representation.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def if_match_holds(if_match: Optional[str], etag: str) -> bool:
+    """Check an If-Match header before a write.
+
+    Uses strong comparison, as RFC 9110 requires for If-Match, so weak
+    tags never match.
+
+    Args:
+        if_match: Raw header value, may list several tags or be "*".
+        etag: Current ETag of the resource.
+
+    Returns:
+        True if there is no precondition or the client edited the current
+        representation.
+    """
+    if not if_match or if_match.strip() == "*":
+        return True
+    return etag in {tag.strip() for tag in if_match.split(",")}
+
+
+def check_not_modified(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """Answer a conditional GET before the body is built.
+
+    Sets ETag and Cache-Control on the outgoing response either way.
+
+    Args:
+        request: Incoming HTTP request.
+        response: Response FastAPI will send if the endpoint returns data.
+        etag: Current ETag of the resource.
+
+    Returns:
+        An empty 304 response if the client copy is current, otherwise None.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
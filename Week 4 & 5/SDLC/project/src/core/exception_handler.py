@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse
 from src.core.config import ErrorDetails
 from src.core.exceptions import (
     AuthenticationException,
+    ConflictException,
     DatabaseException,
     WeakPasswordException,
 )
@@ -108,6 +109,33 @@ def handle_auth_exception(
     )
 
 
+def handle_conflict_exception(
+    request: Request, exception: ConflictException
+) -> JSONResponse:
+    """Handle conflict exception.
+
+    Args:
+        request: HTTP request object.
+        exception: Conflict exception.
+
+    Returns:
+        JSON response with error details and a 409 status.
+    """
+    logger.warning(exception.message)
+    return JSONResponse(
+        status_code=exception.status_code,
+        content=get_error_response(
+            ErrorDetails(
+                message=exception.message,
+                error_code=exception.error_code,
+                status_code=exception.status_code,
+                details=exception.details,
+            )
+        ),
+        headers=exception.headers,
+    )
+
+
 def add_exception_handlers_to_app(app: FastAPI) -> None:
     """Register custom exception handlers with FastAPI app.
 
@@ -117,5 +145,6 @@ def add_exception_handlers_to_app(app: FastAPI) -> None:
     app.add_exception_handler(WeakPasswordException, handle_weak_password_error)
     app.add_exception_handler(DatabaseException, handle_database_exception)
     app.add_exception_handler(AuthenticationException, handle_auth_exception)
+    app.add_exception_handler(ConflictException, handle_conflict_exception)
 
     logger.info("Successfully Registered custom exceptions to application")
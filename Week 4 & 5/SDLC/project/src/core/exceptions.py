@@ -97,3 +97,38 @@ class AuthenticationException(BaseAppException):
             details=details,
             status_code=403,
         )
+
+
+class ConflictException(BaseAppException):
+    """Exception raised when a request conflicts with the current state.
+
+    Args:
+        message: Description of the conflict.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        field_errors: list[dict[str, str]] = None,
+        current: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """Initialize conflict exception.
+
+        Args:
+            message: Description of the conflict.
+            field_errors: List of field-specific error details.
+            current: Current representation of the resource, so the client
+                can merge and retry without another GET.
+            headers: Additional headers, eg: the current ETag.
+        """
+        details = {"field_errors": field_errors} if field_errors else {}
+        if current is not None:
+            details["current"] = current
+        super().__init__(
+            message=message,
+            error_code=Errors.CONFLICT_ERROR,
+            details=details,
+            status_code=409,
+            headers=headers,
+        )
@@ -2,3 +2,4 @@ from pathlib import Path
 
 CURRENT_DIR = Path(__file__).parent
 ENV_FILE = CURRENT_DIR / "../../.env"
+ALEMBIC_INI = CURRENT_DIR / "../../alembic.ini"
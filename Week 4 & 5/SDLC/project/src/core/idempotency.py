@@ -0,0 +1,367 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import wraps
+from time import monotonic, time
+from typing import Any, Callable, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.routing import APIRoute, serialize_response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.exceptions import ConflictException
+from src.core.log import get_logger
+from src.core.responses import FastJSONResponse
+from src.repository.idempotency import (
+    claim_idempotency_key,
+    get_idempotency_record,
+    release_idempotency_key,
+    save_idempotency_response,
+)
+
+logger = get_logger(__name__)
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAY_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    """A completed response kept for replay.
+
+    Attributes:
+        fingerprint: Fingerprint of the request that produced it.
+        status_code: HTTP status code.
+        body: Serialized JSON body.
+        expires_at: Unix timestamp after which the key can be reused.
+    """
+
+    fingerprint: str
+    status_code: int
+    body: bytes
+    expires_at: float
+
+
+class IdempotencyCache:
+    """Bounded LRU front cache of completed responses, plus in-flight keys.
+
+    The cache answers replays handled by this process without a database
+    round trip; the idempotency_key table stays the source of truth across
+    workers. In-flight keys hold an event that concurrent duplicates in the
+    same process wait on instead of polling the table.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of responses to keep.
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, StoredResponse] = OrderedDict()
+        self.in_flight: dict[str, asyncio.Event] = {}
+
+    def get(self, key: str) -> StoredResponse | None:
+        """Look up a completed response.
+
+        Args:
+            key: Scoped idempotency key.
+
+        Returns:
+            StoredResponse: cached response if present and not expired, else None
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, stored: StoredResponse) -> None:
+        """Store a completed response, evicting the least recently used entry.
+
+        Args:
+            key: Scoped idempotency key.
+            stored: Response to keep.
+        """
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = stored
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached response and in-flight marker."""
+        self._entries.clear()
+        self.in_flight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+idempotency_cache = IdempotencyCache(maxsize=settings.IDEMPOTENCY_CACHE_SIZE)
+
+
+def get_request_fingerprint(request: Request, body: bytes) -> str:
+    """Hash what makes two requests "the same request".
+
+    Args:
+        request: Incoming HTTP request.
+        body: Raw request body.
+
+    Returns:
+        str: SHA-256 hex digest of user, method, path, query and body.
+    """
+    digest = hashlib.sha256()
+    for part in (
+        getattr(request.state, "email", ""),
+        request.method,
+        request.url.path,
+        request.url.query,
+    ):
+        digest.update(str(part).encode("utf-8") + b"\0")
+    digest.update(body)
+    return digest.hexdigest()
+
+
+async def render_result(result: Any, request: Request) -> tuple[int, bytes]:
+    """Serialize an endpoint result the way it will be sent.
+
+    Goes through the route's response_model like FastAPI does, so the stored
+    body holds only the declared fields (eg: no password hash of a
+    registered user) and a replay equals the first response.
+
+    Args:
+        result: Value returned by the endpoint.
+        request: Request being served, its scope holds the matched route.
+
+    Returns:
+        tuple: (status_code, JSON body)
+    """
+    if isinstance(result, Response):
+        return result.status_code, bytes(result.body)
+    route = request.scope.get("route")
+    if not isinstance(route, APIRoute):
+        return 200, FastJSONResponse(content=jsonable_encoder(result)).body
+    content = await serialize_response(
+        field=route.response_field,
+        response_content=result,
+        include=route.response_model_include,
+        exclude=route.response_model_exclude,
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_defaults=route.response_model_exclude_defaults,
+        exclude_none=route.response_model_exclude_none,
+    )
+    return 200, FastJSONResponse(content=content).body
+
+
+def replay_response(stored: StoredResponse, fingerprint: str) -> Response:
+    """Return a stored response to a retried request.
+
+    Args:
+        stored: Completed response of the first request.
+        fingerprint: Fingerprint of the retried request.
+
+    Returns:
+        Response: Stored status and body, marked as a replay.
+
+    Raises:
+        ConflictException: If the key was used for a different request.
+    """
+    if stored.fingerprint != fingerprint:
+        raise_key_reused()
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type="application/json",
+        headers={REPLAY_HEADER: "true"},
+    )
+
+
+def raise_key_reused() -> None:
+    """Reject a key sent again with a different request.
+
+    Raises:
+        ConflictException: Always.
+    """
+    raise ConflictException(
+        message="Idempotency key was already used for a different request",
+        field_errors=[
+            {"field": IDEMPOTENCY_HEADER, "message": "Use a new key for a new request"}
+        ],
+    )
+
+
+async def load_stored_response(
+    key: str, db: AsyncSession
+) -> tuple[Optional[StoredResponse], Optional[str]]:
+    """Read a key from the front cache, then from the table.
+
+    Args:
+        key: Scoped idempotency key.
+        db: Database session.
+
+    Returns:
+        tuple: (completed response or None, fingerprint of an in-progress
+        request or None); both None if the key is unused.
+    """
+    stored = idempotency_cache.get(key)
+    if stored is not None:
+        return stored, None
+    row = await get_idempotency_record(key=key, db=db)
+    if row is None:
+        return None, None
+    if row.response_body is None:
+        return None, row.fingerprint
+    stored = StoredResponse(
+        fingerprint=row.fingerprint,
+        status_code=row.status_code,
+        body=row.response_body,
+        expires_at=row.expires_at,
+    )
+    idempotency_cache.put(key=key, stored=stored)
+    return stored, None
+
+
+async def wait_for_first(key: str, deadline: float) -> None:
+    """Wait for the request holding a key to finish.
+
+    Waits on the in-process event when the holder runs here, otherwise
+    sleeps one poll interval before the table is read again.
+
+    Args:
+        key: Scoped idempotency key.
+        deadline: monotonic() value after which waiting stops.
+
+    Raises:
+        ConflictException: If the first request is still running at deadline.
+    """
+    remaining = deadline - monotonic()
+    if remaining <= 0:
+        raise ConflictException(
+            message="A request with this idempotency key is still in progress",
+            field_errors=[
+                {"field": IDEMPOTENCY_HEADER, "message": "Retry after it completes"}
+            ],
+        )
+    event = idempotency_cache.in_flight.get(key)
+    if event is None:
+        await asyncio.sleep(min(settings.IDEMPOTENCY_POLL_INTERVAL, remaining))
+        return
+    try:
+        await asyncio.wait_for(event.wait(), timeout=remaining)
+    except asyncio.TimeoutError:
+        pass
+
+
+def idempotent(func: Callable) -> Callable:
+    """
+    Decorator making a POST endpoint safe to retry with an Idempotency-Key
+
+    The first request with a key runs the endpoint and stores its response;
+    retries with the same key and request replay that response without
+    running the endpoint, and concurrent duplicates wait for the first one.
+    A failed first attempt releases the key; one that never finishes (eg:
+    the worker crashed) loses it when its IDEMPOTENCY_LEASE ends. Keys are
+    scoped by path and user. Requests without the header are not affected.
+
+    The endpoint needs `request` and `db` parameters. Place the decorator
+    below required_roles, so the user is known when the request is
+    fingerprinted.
+
+    Args:
+        func: end point to use this decorator
+
+    Returns:
+        Callable: Returns wrapper
+    """
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        request: Optional[Request] = kwargs.get("request")
+        header = request.headers.get(IDEMPOTENCY_HEADER) if request else None
+        if not header:
+            return await func(*args, **kwargs)
+        if len(header) > MAX_KEY_LENGTH:
+            # the same 422 as any header failing request validation
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "string_too_long",
+                        "loc": ("header", IDEMPOTENCY_HEADER),
+                        "msg": f"String should have at most {MAX_KEY_LENGTH} "
+                        "characters",
+                        "input": header,
+                        "ctx": {"max_length": MAX_KEY_LENGTH},
+                    }
+                ]
+            )
+
+        db = kwargs["db"]
+        key = f"{request.url.path}:{getattr(request.state, 'email', '')}:{header}"
+        body = await request.body()
+        fingerprint = get_request_fingerprint(request=request, body=body)
+        deadline = monotonic() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+
+        while True:
+            stored, running = await load_stored_response(key=key, db=db)
+            if stored is not None:
+                logger.info(f"Replaying stored response for idempotency key {key}")
+                return replay_response(stored=stored, fingerprint=fingerprint)
+            if running is not None and running != fingerprint:
+                raise_key_reused()
+            if running is None and key not in idempotency_cache.in_flight:
+                claimed_until = time() + settings.IDEMPOTENCY_LEASE
+                if await claim_idempotency_key(
+                    key=key, fingerprint=fingerprint, expires_at=claimed_until, db=db
+                ):
+                    break
+                continue
+            await wait_for_first(key=key, deadline=deadline)
+
+        event = asyncio.Event()
+        idempotency_cache.in_flight[key] = event
+        try:
+            result = await func(*args, **kwargs)
+            status_code, response_body = await render_result(
+                result=result, request=request
+            )
+            expires_at = time() + settings.IDEMPOTENCY_TTL
+            await save_idempotency_response(
+                key=key,
+                status_code=status_code,
+                response_body=response_body,
+                claimed_until=claimed_until,
+                expires_at=expires_at,
+                db=db,
+            )
+            idempotency_cache.put(
+                key=key,
+                stored=StoredResponse(
+                    fingerprint=fingerprint,
+                    status_code=status_code,
+                    body=response_body,
+                    expires_at=expires_at,
+                ),
+            )
+            return result
+        except BaseException:
+            await db.rollback()
+            await release_idempotency_key(
+                key=key, db=db, claimed_until=claimed_until
+            )
+            raise
+        finally:
+            del idempotency_cache.in_flight[key]
+            event.set()
+
+    return wrapper
@@ -0,0 +1,242 @@
+import asyncio
+import json
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+# postgres channel carrying invalidation messages between workers
+CHANNEL = "cache_invalidation"
+
+# NOTIFY payloads must stay under 8000 bytes, larger scopes are sent whole
+MAX_PAYLOAD = 7900
+
+# called with a key of the scope, or None when the whole scope is stale
+InvalidationHandler = Callable[[Optional[Hashable]], None]
+
+
+def encode_invalidations(
+    invalidations: dict[str, Optional[Iterable[Hashable]]],
+) -> str:
+    """Build the compact NOTIFY payload for a transaction's invalidations.
+
+    Scopes are replaced by null, meaning every key, largest first until the
+    payload fits in a notification.
+
+    Args:
+        invalidations: Stale keys per scope, None for every key.
+
+    Returns:
+        str: JSON object, eg: {"product":[1,2],"user":null}
+    """
+    message: dict[str, Optional[list]] = {
+        scope: None if keys is None else sorted(keys, key=str)
+        for scope, keys in invalidations.items()
+    }
+    payload = json.dumps(message, separators=(",", ":"))
+    while len(payload.encode("utf-8")) > MAX_PAYLOAD:
+        largest = max(
+            (scope for scope, keys in message.items() if keys is not None),
+            key=lambda scope: len(message[scope]),
+        )
+        message[largest] = None
+        payload = json.dumps(message, separators=(",", ":"))
+    return payload
+
+
+class InvalidationBus:
+    """Applies cache invalidations published by any worker to this one.
+
+    Local caches register a handler per scope (a table, eg: product). Writes
+    queue stale keys on their session; when the transaction commits they
+    are applied here at once and NOTIFYed on postgres, which delivers them
+    only after the commit, so every worker LISTENing drops the same keys.
+    A worker also receives its own messages; handlers are idempotent, so
+    applying one twice is harmless.
+
+    Notifications sent while the LISTEN connection is down are lost, so
+    losing it clears every registered cache before reconnecting.
+
+    Attributes:
+        handlers: Registered handlers per scope.
+        applied: Number of messages applied.
+    """
+
+    def __init__(self, reconnect_delay: float = 1.0) -> None:
+        """Initialize a bus with no handlers and no connection.
+
+        Args:
+            reconnect_delay: Seconds between LISTEN reconnection attempts.
+        """
+        self.reconnect_delay = reconnect_delay
+        self.handlers: dict[str, list[InvalidationHandler]] = {}
+        self.applied = 0
+        self._listen_engine: Optional[AsyncEngine] = None
+        self._listen_connection: Optional[AsyncConnection] = None
+        self._driver_connection: Any = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+
+    @property
+    def listening(self) -> bool:
+        """Whether messages from other workers are being received."""
+        return self._listen_connection is not None
+
+    def register(self, scope: str, handler: InvalidationHandler) -> None:
+        """Subscribe a local cache to a scope.
+
+        Args:
+            scope: Scope name, eg: product.
+            handler: Drops one key, or the whole cache when given None.
+        """
+        self.handlers.setdefault(scope, []).append(handler)
+
+    def apply(self, invalidations: dict[str, Optional[Iterable[Hashable]]]) -> None:
+        """Run the handlers of every stale key.
+
+        Args:
+            invalidations: Stale keys per scope, None for every key.
+        """
+        for scope, keys in invalidations.items():
+            for handler in self.handlers.get(scope, ()):
+                try:
+                    if keys is None:
+                        handler(None)
+                    else:
+                        for key in keys:
+                            handler(key)
+                except Exception as e:
+                    logger.error(f"Invalidating {scope} cache failed: {e}")
+        self.applied += 1
+
+    def apply_all(self) -> None:
+        """Clear every registered cache."""
+        self.apply(invalidations={scope: None for scope in self.handlers})
+
+    def receive(self, *args: Any) -> None:
+        """Apply a NOTIFY payload, the asyncpg listener callback.
+
+        Args:
+            *args: connection, pid, channel, payload from asyncpg.
+        """
+        payload = args[-1]
+        try:
+            invalidations = json.loads(payload)
+        except ValueError:
+            logger.error(f"Malformed invalidation message: {payload[:100]}")
+            self.apply_all()
+            return
+        self.apply(invalidations=invalidations)
+
+    async def start(self, listen_engine: Optional[AsyncEngine]) -> None:
+        """LISTEN for other workers' invalidations.
+
+        If the first attempt fails, it is retried in the background like a
+        lost connection. Other dialects have no LISTEN, so the bus then only
+        applies this process' commits.
+
+        Args:
+            listen_engine: Postgres engine, None for a single process where
+                commits are applied locally only.
+        """
+        if listen_engine is not None and listen_engine.dialect.name != "postgresql":
+            logger.info(
+                f"Invalidation bus not listening on {listen_engine.dialect.name}"
+            )
+            listen_engine = None
+        self._listen_engine = listen_engine
+        if not await self._listen():
+            self._schedule_reconnect()
+
+    async def stop(self) -> None:
+        """Stop listening and release the connection."""
+        self._listen_engine = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        await self._unlisten()
+
+    async def _listen(self) -> bool:
+        """Open the LISTEN connection, if an engine was given.
+
+        Returns:
+            bool: True if listening
+        """
+        if self._listen_engine is None:
+            return False
+        try:
+            connection = await self._listen_engine.connect()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            driver_connection.add_termination_listener(self._on_listen_lost)
+            await driver_connection.add_listener(CHANNEL, self.receive)
+        except Exception as e:
+            logger.error(f"Invalidation LISTEN failed: {e}")
+            return False
+        self._listen_connection = connection
+        self._driver_connection = driver_connection
+        logger.info(f"Invalidation bus listening on {CHANNEL}")
+        return True
+
+    def _on_listen_lost(self, *args: Any) -> None:
+        """Clear every cache and reconnect in the background.
+
+        Args:
+            *args: Ignored, asyncpg passes the connection.
+        """
+        if self._listen_engine is None:
+            return
+        logger.warning("Invalidation LISTEN connection lost, clearing caches")
+        self._listen_connection = None
+        self._driver_connection = None
+        self.apply_all()
+        self._schedule_reconnect()
+
+    def _schedule_reconnect(self) -> None:
+        """Start retrying LISTEN in the background, unless already retrying."""
+        if self._listen_engine is None:
+            return
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(
+                self._reconnect(), name="invalidation-reconnect"
+            )
+
+    async def _reconnect(self) -> None:
+        """Retry LISTEN until it succeeds or the bus stops."""
+        while self._listen_engine is not None:
+            await asyncio.sleep(self.reconnect_delay)
+            if await self._listen():
+                # anything published while reconnecting was missed
+                self.apply_all()
+                return
+
+    async def _unlisten(self) -> None:
+        """Return the listening connection to the pool, without the listener."""
+        if self._listen_connection is None:
+            return
+        connection, self._listen_connection = self._listen_connection, None
+        driver_connection, self._driver_connection = self._driver_connection, None
+        try:
+            driver_connection.remove_termination_listener(self._on_listen_lost)
+            await driver_connection.remove_listener(CHANNEL, self.receive)
+            await connection.close()
+        except Exception as e:
+            logger.warning(f"Closing invalidation connection failed: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Return bus counters.
+
+        Returns:
+            dict: registered handlers, applied messages and listening flag
+        """
+        return {
+            "handlers": sum(len(handlers) for handlers in self.handlers.values()),
+            "applied": self.applied,
+            "listening": int(self.listening),
+        }
+
+
+invalidation_bus = InvalidationBus()
@@ -1,5 +1,8 @@
+import hashlib
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
+from time import time
 from typing import Callable, Optional
 
 from fastapi import Request
@@ -7,6 +10,7 @@ from jose import JWTError, jwt
 
 from src.core.config import settings
 from src.core.exceptions import AuthenticationException
+from src.core.invalidation import invalidation_bus
 from src.core.log import get_logger
 from src.schema.token import TokenData
 from src.schema.user import UserRole
@@ -14,6 +18,100 @@ from src.schema.user import UserRole
 logger = get_logger(__name__)
 
 
+class VerifiedTokenCache:
+    """Bounded LRU cache of already verified JWTs.
+
+    Entries are keyed by the SHA-256 digest of the raw token, so the token
+    itself is never kept in memory, and are dropped once the token's exp
+    claim has passed.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of tokens to keep.
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[bytes, tuple[TokenData, float]] = OrderedDict()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """Return the cache key for a token.
+
+        Args:
+            token: Raw JWT string.
+
+        Returns:
+            bytes: SHA-256 digest of the token.
+        """
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> TokenData | None:
+        """Look up a verified token.
+
+        Args:
+            token: Raw JWT string.
+
+        Returns:
+            TokenData: cached claims if present and not expired, else None
+        """
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        token_data, expires_at = entry
+        if expires_at <= time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return token_data
+
+    def put(self, token: str, token_data: TokenData, expires_at: float) -> None:
+        """Store a verified token, evicting the least recently used entry.
+
+        Args:
+            token: Raw JWT string.
+            token_data: Claims extracted from the token.
+            expires_at: Unix timestamp of the token's exp claim.
+        """
+        if self.maxsize <= 0:
+            return
+        key = self._digest(token)
+        self._entries[key] = (token_data, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove every cached token."""
+        self._entries.clear()
+
+    def discard_email(self, email: Optional[str]) -> None:
+        """Remove the tokens of a user that was written, on any worker.
+
+        Args:
+            email: User's email, None to remove every token.
+        """
+        if email is None:
+            self.clear()
+            return
+        stale = [
+            key
+            for key, (token_data, _) in self._entries.items()
+            if token_data.email == email
+        ]
+        for key in stale:
+            del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+verified_token_cache = VerifiedTokenCache(maxsize=settings.JWT_CACHE_SIZE)
+invalidation_bus.register(scope="user", handler=verified_token_cache.discard_email)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a JWT token with user data
@@ -50,7 +148,8 @@ def get_expiration_time(expires_delta: timedelta | None) -> datetime:
 
 def decode_access_token(token: str) -> TokenData:
     """
-    Decodes incoming jwt token
+    Decodes incoming jwt token, tokens verified earlier are served
+    from verified_token_cache until they expire
 
     Args:
         token: JWT token
@@ -61,6 +160,10 @@ def decode_access_token(token: str) -> TokenData:
     Raises:
         HTTPException: if invalid/expired token
     """
+    cached_token_data = verified_token_cache.get(token=token)
+    if cached_token_data is not None:
+        return cached_token_data
+
     auth_error_message: str = "Could not validate credentials"
     try:
         payload: dict = jwt.decode(
@@ -85,7 +188,13 @@ def decode_access_token(token: str) -> TokenData:
                 ],
             )
 
-        return TokenData(email=email, role=role)
+        token_data = TokenData(email=email, role=role)
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            verified_token_cache.put(
+                token=token, token_data=token_data, expires_at=float(expires_at)
+            )
+        return token_data
 
     except JWTError:
         raise AuthenticationException(
@@ -101,6 +210,7 @@ def required_roles(*allowed_roles):
     Args:
         *allowed_roles: list of UserRole enum
     """
+    allowed_role_values = frozenset(UserRole.get_values(roles=allowed_roles))
 
     def decorator(func: Callable) -> Callable:
         """
@@ -135,7 +245,7 @@ def required_roles(*allowed_roles):
                 handle_missing_email_in_request(user_email=user_email)
 
                 # Check if user role is authorized
-                if user_role not in UserRole.get_values(roles=allowed_roles):
+                if user_role not in allowed_role_values:
                     raise AuthenticationException(
                         message=f"Unauthorized to perform action, you are a {user_role}",
                         field_errors=[
@@ -1,5 +1,10 @@
+import random
+import sys
+import threading
 from contextvars import ContextVar
 from enum import Enum
+from queue import Empty, Full, Queue
+from typing import Any, Callable, Optional, TextIO
 
 import structlog
 from pydantic import Field
@@ -19,11 +24,74 @@ class LogLevel(str, Enum):
     CRITICAL = "CRITICAL"
 
 
+class LogFormat(str, Enum):
+    """Enumeration for log output formats."""
+
+    CONSOLE = "console"
+    JSON = "json"
+
+
 class LogSettings(BaseSettings, metaclass=Singleton):
     """Configuration settings for logging."""
 
     # LOGGING
     LOG_LEVEL: LogLevel = Field(default=LogLevel.INFO, validation_alias="LOG_LEVEL")
+    environment: str = Field(default="test", validation_alias="ENVIRONMENT")
+
+    # None means derive from the environment (json + queue in production)
+    LOG_FORMAT: Optional[LogFormat] = Field(default=None, validation_alias="LOG_FORMAT")
+    LOG_QUEUE_WRITER: Optional[bool] = Field(
+        default=None, validation_alias="LOG_QUEUE_WRITER"
+    )
+    LOG_QUEUE_SIZE: int = Field(default=10000, validation_alias="LOG_QUEUE_SIZE")
+
+    # fraction of events kept per level, warnings and above are never sampled
+    LOG_SAMPLE_DEBUG: float = Field(
+        default=1.0, ge=0, le=1, validation_alias="LOG_SAMPLE_DEBUG"
+    )
+    LOG_SAMPLE_INFO: float = Field(
+        default=1.0, ge=0, le=1, validation_alias="LOG_SAMPLE_INFO"
+    )
+
+    @property
+    def is_production(self) -> bool:
+        """Check if running in production.
+
+        Returns:
+            True for the production environment, False otherwise.
+        """
+        return self.environment.lower() in {"production", "prod"}
+
+    @property
+    def is_development(self) -> bool:
+        """Check if running on a developer machine.
+
+        Returns:
+            True for the development environment, False otherwise.
+        """
+        return self.environment.lower() in {"development", "dev", "local"}
+
+    @property
+    def log_format(self) -> LogFormat:
+        """Resolve the output format.
+
+        Returns:
+            LOG_FORMAT if set, otherwise JSON in production and CONSOLE elsewhere.
+        """
+        if self.LOG_FORMAT is not None:
+            return self.LOG_FORMAT
+        return LogFormat.JSON if self.is_production else LogFormat.CONSOLE
+
+    @property
+    def use_queue_writer(self) -> bool:
+        """Resolve whether log lines are written from a background thread.
+
+        Returns:
+            LOG_QUEUE_WRITER if set, otherwise True only in production.
+        """
+        if self.LOG_QUEUE_WRITER is not None:
+            return self.LOG_QUEUE_WRITER
+        return self.is_production
 
     # .env settings
     model_config = SettingsConfigDict(
@@ -54,39 +122,200 @@ def add_context_processor(_, __, event_dict):
     return event_dict
 
 
+def make_sampling_processor(rates: dict[str, float]) -> Callable:
+    """Build a processor that keeps only a fraction of events per level.
+
+    Args:
+        rates: Mapping of method name (eg: "debug", "info") to the fraction
+            of events to keep. Levels missing from the mapping are kept.
+
+    Returns:
+        structlog processor that raises DropEvent for sampled out events.
+    """
+
+    def sample_processor(_, method_name, event_dict):
+        rate = rates.get(method_name, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            raise structlog.DropEvent
+        return event_dict
+
+    return sample_processor
+
+
+class QueueLogWriter:
+    """Writes rendered log lines to a stream from a background thread.
+
+    The request path only does a non-blocking put onto a bounded queue.
+    When the queue is full the line is dropped and counted instead of
+    making the caller wait on I/O.
+
+    Attributes:
+        dropped: Number of lines dropped because the queue was full.
+    """
+
+    _STOP = object()
+
+    def __init__(self, maxsize: int, stream: Optional[TextIO] = None) -> None:
+        """Initialize the writer and start its thread.
+
+        Args:
+            maxsize: Maximum number of pending lines.
+            stream: Stream to write to, defaults to stdout.
+        """
+        self._queue: Queue = Queue(maxsize=maxsize)
+        self._stream = stream or sys.stdout
+        self.dropped = 0
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, line: str) -> None:
+        """Enqueue a rendered line without blocking.
+
+        Args:
+            line: Rendered log line.
+        """
+        try:
+            self._queue.put_nowait(line)
+        except Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        """Drain the queue in batches until stopped."""
+        while True:
+            line = self._queue.get()
+            batch = []
+            while line is not self._STOP:
+                batch.append(line)
+                if len(batch) >= 512:
+                    break
+                try:
+                    line = self._queue.get_nowait()
+                except Empty:
+                    break
+            if batch:
+                self._stream.write("\n".join(batch) + "\n")
+                self._stream.flush()
+            if line is self._STOP:
+                return
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flush pending lines and stop the thread.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain.
+        """
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except Full:
+            pass
+        self._thread.join(timeout=timeout)
+
+
+_queue_writer: Optional[QueueLogWriter] = None
+
+
+class QueueLogger:
+    """structlog logger that hands rendered lines to the running writer.
+
+    structlog caches loggers on first use, so the writer is looked up on
+    every call: a logger created before shutdown_logging keeps working
+    with the writer of the next setup_logging. Without a running writer
+    lines go straight to stdout.
+    """
+
+    def msg(self, message: str) -> None:
+        """Send a rendered line to the current writer.
+
+        Args:
+            message: Rendered log line.
+        """
+        writer = _queue_writer
+        if writer is None:
+            print(message, file=sys.stdout, flush=True)
+        else:
+            writer.write(message)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory producing QueueLogger instances."""
+
+    def __call__(self, *args: Any) -> QueueLogger:
+        return QueueLogger()
+
+
 def setup_logging():
-    """Configure and initialize structured logging."""
+    """Configure and initialize structured logging.
+
+    Development keeps the coloured console renderer with callsite details.
+    Production renders JSON, skips the stack inspection needed for callsite
+    parameters and writes through a background queue so logging never
+    blocks a request on stdout.
+    """
+    global _queue_writer
     log_level = log_settings.LOG_LEVEL
 
     # Displayed in log console
     processors = [
+        make_sampling_processor(
+            rates={
+                "debug": log_settings.LOG_SAMPLE_DEBUG,
+                "info": log_settings.LOG_SAMPLE_INFO,
+            }
+        ),
         structlog.contextvars.merge_contextvars,
         add_context_processor,
         structlog.processors.add_log_level,
-        structlog.processors.CallsiteParameterAdder(
-            {
-                structlog.processors.CallsiteParameter.LINENO,
-                structlog.processors.CallsiteParameter.PATHNAME,
-            }
-        ),
+    ]
+    if log_settings.is_development:
+        processors.append(
+            structlog.processors.CallsiteParameterAdder(
+                {
+                    structlog.processors.CallsiteParameter.LINENO,
+                    structlog.processors.CallsiteParameter.PATHNAME,
+                }
+            )
+        )
+    processors += [
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
-        structlog.dev.set_exc_info,
     ]
 
-    # TO LOG AS JSON
-    # processors.append(structlog.processors.JSONRenderer())
-    # TO LOG IN CONSOLE
-    processors.append(structlog.dev.ConsoleRenderer())
+    if log_settings.log_format == LogFormat.JSON:
+        processors += [
+            structlog.processors.dict_tracebacks,
+            structlog.processors.JSONRenderer(),
+        ]
+    else:
+        processors += [structlog.dev.set_exc_info, structlog.dev.ConsoleRenderer()]
+
+    if log_settings.use_queue_writer:
+        if _queue_writer is None:
+            _queue_writer = QueueLogWriter(maxsize=log_settings.LOG_QUEUE_SIZE)
+        logger_factory = QueueLoggerFactory()
+    else:
+        logger_factory = structlog.WriteLoggerFactory()
 
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level),
-        logger_factory=structlog.WriteLoggerFactory(),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
 
 
+def shutdown_logging():
+    """Flush and stop the background log writer if one is running."""
+    global _queue_writer
+    if _queue_writer is not None:
+        _queue_writer.stop()
+        _queue_writer = None
+
+
 def get_logger(name: str):
     """Get a structured logger instance.
 
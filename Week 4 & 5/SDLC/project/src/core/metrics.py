@@ -0,0 +1,219 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Iterable, Optional
+
+from starlette.requests import Request
+
+# Upper bounds in seconds, tuned for an API whose target p99 is well under 1s
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """Cumulative bucket histogram in the Prometheus style.
+
+    Attributes:
+        buckets: Sorted upper bounds of the buckets.
+        counts: Observation count per bucket (non-cumulative).
+        total: Sum of all observed values.
+        count: Number of observations.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            buckets: Upper bounds of the buckets.
+        """
+        self.buckets: tuple[float, ...] = tuple(sorted(buckets))
+        # one extra slot for observations above the last bound (+Inf)
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation.
+
+        Args:
+            value: Observed value in seconds.
+        """
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def cumulative_counts(self) -> list[tuple[str, int]]:
+        """Return (le, cumulative count) pairs including +Inf.
+
+        Returns:
+            List of bucket label and cumulative count tuples.
+        """
+        result = []
+        running = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            running += bucket_count
+            result.append((format_bound(bound), running))
+        result.append(("+Inf", self.count))
+        return result
+
+
+def format_bound(bound: float) -> str:
+    """Format a bucket bound the way Prometheus clients do.
+
+    Args:
+        bound: Bucket upper bound.
+
+    Returns:
+        String representation of the bound.
+    """
+    return repr(float(bound))
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    """Render a label set for the Prometheus text format.
+
+    Args:
+        labels: Label names and values.
+
+    Returns:
+        Label string such as {method="GET",route="/products"}.
+    """
+    escaped = (
+        f'{key}="{escape_label_value(str(value))}"' for key, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines in a label value.
+
+    Args:
+        value: Raw label value.
+
+    Returns:
+        Escaped label value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """In-process store for request latency histograms and in-flight gauges."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        """Initialize an empty registry.
+
+        Args:
+            buckets: Latency histogram bucket bounds in seconds.
+        """
+        self._buckets = tuple(buckets)
+        self._lock = Lock()
+        self._latency: dict[tuple[str, str, str], Histogram] = {}
+        self._in_flight: dict[str, int] = {}
+
+    def observe_request(
+        self, method: str, route: str, status: int, seconds: float
+    ) -> None:
+        """Record the latency of a finished request.
+
+        Args:
+            method: HTTP method.
+            route: Route template (eg: /products), not the raw path.
+            status: Response status code.
+            seconds: Request duration.
+        """
+        key = (method, route, str(status))
+        with self._lock:
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = Histogram(buckets=self._buckets)
+            histogram.observe(seconds)
+
+    def add_in_flight(self, method: str, delta: int) -> None:
+        """Adjust the in-flight gauge for a method.
+
+        The route is only known once the router has dispatched the request,
+        so in-flight requests are counted per method.
+
+        Args:
+            method: HTTP method.
+            delta: +1 when a request starts, -1 when it finishes.
+        """
+        with self._lock:
+            self._in_flight[method] = self._in_flight.get(method, 0) + delta
+
+    def reset(self) -> None:
+        """Drop every recorded series."""
+        with self._lock:
+            self._latency.clear()
+            self._in_flight.clear()
+
+    def render(self, extra_gauges: Optional[dict[str, float]] = None) -> str:
+        """Render all series in the Prometheus text exposition format.
+
+        Args:
+            extra_gauges: Additional unlabelled gauges (eg: pool counters).
+
+        Returns:
+            Metrics text ending with a newline.
+        """
+        name = "http_request_duration_seconds"
+        lines = [
+            f"# HELP {name} HTTP request latency by route.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            latency = sorted(self._latency.items())
+            in_flight = sorted(self._in_flight.items())
+            for (method, route, status), histogram in latency:
+                labels = {"method": method, "route": route, "status": status}
+                for le, cumulative in histogram.cumulative_counts():
+                    bucket_labels = format_labels({**labels, "le": le})
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                label_str = format_labels(labels)
+                lines.append(f"{name}_sum{label_str} {histogram.total}")
+                lines.append(f"{name}_count{label_str} {histogram.count}")
+
+        lines += [
+            "# HELP http_requests_in_flight HTTP requests currently being served.",
+            "# TYPE http_requests_in_flight gauge",
+        ]
+        for method, value in in_flight:
+            labels = format_labels({"method": method})
+            lines.append(f"http_requests_in_flight{labels} {value}")
+
+        for gauge_name, value in (extra_gauges or {}).items():
+            lines += [f"# TYPE {gauge_name} gauge", f"{gauge_name} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
+
+
+def get_route_template(request: Request) -> str:
+    """Read the route template the router matched for a request.
+
+    The router stores the matched route in the scope while dispatching, so
+    this is read after call_next instead of matching every route again.
+    Raw paths are never used as labels so that ids in URLs cannot blow up
+    the number of series.
+
+    Args:
+        request: HTTP request, already dispatched.
+
+    Returns:
+        Route path template, or "unmatched" if no route matched.
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
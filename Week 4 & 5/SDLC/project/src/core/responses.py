@@ -0,0 +1,29 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson, falling back to the stdlib encoder.
+
+    Routes with a response_model hand this class plain JSON-compatible data
+    that pydantic has already serialized, so only the final encode differs.
+    """
+
+    def render(self, content: Any) -> bytes:
+        """Encode content to UTF-8 JSON bytes.
+
+        Args:
+            content: JSON-compatible Python data.
+
+        Returns:
+            Encoded response body.
+        """
+        if orjson is None:
+            return super().render(content)
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
@@ -1,7 +1,11 @@
+import logging
 from typing import Any
 
 from pydantic._internal._model_construction import ModelMetaclass
 
+# stdlib logger: src.core.log builds its own settings with this metaclass
+logger = logging.getLogger(__name__)
+
 
 class Singleton(ModelMetaclass):
     """Metaclass that ensures only one instance of each class exists.
@@ -23,7 +27,7 @@ class Singleton(ModelMetaclass):
             The singleton instance of the class.
         """
         if cls not in cls._instances:
-            print(f"creating instance of {cls.__name__}")
+            logger.debug(f"creating instance of {cls.__name__}")
             instance = cls.__new__(cls, *args, **kwargs)
             instance.__init__(*args, **kwargs)
             cls._instances[cls] = instance
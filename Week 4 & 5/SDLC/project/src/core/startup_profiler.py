@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, Optional
+
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class StartupProfiler:
+    """Wall-clock time of each boot phase, from import to ready.
+
+    The clock starts when this module is imported, so src.api.main imports
+    it first and marks the end of its imports. Lifespan steps are timed with
+    phase(). finish() logs one line with every phase, and the timings are
+    exported on /metrics so slow rollouts can be traced to a phase; run
+    python -X importtime -m src.api.main to split the import phase further.
+
+    Attributes:
+        phases: Seconds spent per phase, in the order they ran.
+        total: Seconds from import to finish(), None while booting.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler and start the clock."""
+        self.phases: dict[str, float] = {}
+        self.total: Optional[float] = None
+        self._started = perf_counter()
+        self._last_mark = self._started
+
+    def mark(self, name: str) -> None:
+        """Record the time since the previous mark as a phase.
+
+        Args:
+            name: Phase name, eg: imports.
+        """
+        now = perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._last_mark
+        self._last_mark = now
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a phase.
+
+        Args:
+            name: Phase name, eg: schema.
+
+        Yields:
+            None: The block runs during this period.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            now = perf_counter()
+            self.phases[name] = self.phases.get(name, 0.0) + now - start
+            self._last_mark = now
+
+    def finish(self) -> None:
+        """Stop the clock and log the profile."""
+        self.total = perf_counter() - self._started
+        logger.info(
+            "Startup profile",
+            total_seconds=round(self.total, 3),
+            **{name: round(seconds, 3) for name, seconds in self.phases.items()},
+        )
+
+    def stats(self) -> dict[str, float]:
+        """Return the phase timings.
+
+        Returns:
+            dict: seconds per phase, plus total once the boot finished
+        """
+        stats = dict(self.phases)
+        if self.total is not None:
+            stats["total"] = self.total
+        return stats
+
+
+startup_profiler = StartupProfiler()
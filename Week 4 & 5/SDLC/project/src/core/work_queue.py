@@ -0,0 +1,184 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+
+from src.core.config import settings
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+JobFunc = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    """A unit of post-write work.
+
+    Attributes:
+        name: Job name used in logs and stats.
+        func: Coroutine function to run.
+        kwargs: Keyword arguments for func.
+    """
+
+    name: str
+    func: JobFunc
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+
+class WorkQueue:
+    """In-process asyncio worker pool for side effects of write endpoints.
+
+    Endpoints commit their primary row, submit follow-up jobs (audit records,
+    cache invalidation, stock checks) and return; workers run the jobs in the
+    background. The queue is bounded so a burst of writes cannot grow memory
+    without limit: when it is full, submit refuses the job instead of blocking
+    the request. Failed jobs are retried with exponential backoff.
+
+    Jobs run after the request session is closed, so they must open their own
+    database session if they need one.
+
+    Attributes:
+        maxsize: Maximum number of queued jobs.
+        workers: Number of worker tasks.
+        max_retries: Retries after the first failed attempt.
+        retry_delay: Backoff before the first retry in seconds, doubled after
+            every further failure.
+    """
+
+    def __init__(
+        self, maxsize: int, workers: int, max_retries: int, retry_delay: float
+    ) -> None:
+        """Initialize a stopped queue, workers are created by start.
+
+        Args:
+            maxsize: Maximum number of queued jobs.
+            workers: Number of worker tasks.
+            max_retries: Retries after the first failed attempt.
+            retry_delay: Backoff before the first retry in seconds.
+        """
+        self.maxsize = maxsize
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._queue: Optional[asyncio.Queue[Job]] = None
+        self._tasks: list[asyncio.Task] = []
+        self._accepting = False
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.rejected = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether workers are running and new jobs are accepted."""
+        return self._accepting
+
+    def start(self) -> None:
+        """Create the queue and worker tasks on the running event loop."""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"work-queue-{index}")
+            for index in range(self.workers)
+        ]
+        self._accepting = True
+        logger.info(f"Work queue started with {self.workers} workers")
+
+    def submit(self, name: str, func: JobFunc, **kwargs: Any) -> bool:
+        """Queue a job without blocking the caller.
+
+        Args:
+            name: Job name used in logs and stats.
+            func: Coroutine function to run.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            bool: True if queued, False if the queue is stopped or full.
+        """
+        if not self._accepting:
+            logger.warning(f"Work queue not running, dropped job {name}")
+            self.rejected += 1
+            return False
+        try:
+            self._queue.put_nowait(Job(name=name, func=func, kwargs=kwargs))
+        except asyncio.QueueFull:
+            logger.error(f"Work queue full ({self.maxsize}), dropped job {name}")
+            self.rejected += 1
+            return False
+        return True
+
+    async def _run_job(self, job: Job) -> None:
+        """Run one job, retrying with exponential backoff.
+
+        Args:
+            job: Job to run.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                await job.func(**job.kwargs)
+                self.processed += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    logger.error(
+                        f"Job {job.name} failed after {attempt + 1} attempts: {e}"
+                    )
+                    return
+                self.retried += 1
+                delay = self.retry_delay * 2**attempt
+                logger.warning(f"Job {job.name} failed ({e}), retrying in {delay}s")
+                await asyncio.sleep(delay)
+
+    async def _worker(self) -> None:
+        """Take jobs off the queue until cancelled."""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run_job(job=job)
+            finally:
+                self._queue.task_done()
+
+    async def drain(self, timeout: float) -> None:
+        """Stop accepting jobs, wait for queued ones, then stop the workers.
+
+        Args:
+            timeout: Maximum seconds to wait for queued jobs to finish.
+        """
+        if not self._tasks:
+            return
+        self._accepting = False
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+            logger.info("Work queue drained")
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Work queue drain timed out, {self._queue.qsize()} jobs abandoned"
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict[str, int]:
+        """Return queue depth and job counters.
+
+        Returns:
+            dict: pending, processed, failed, retried and rejected counts
+        """
+        return {
+            "pending": self._queue.qsize() if self._queue else 0,
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "rejected": self.rejected,
+        }
+
+
+work_queue = WorkQueue(
+    maxsize=settings.WORK_QUEUE_SIZE,
+    workers=settings.WORK_QUEUE_WORKERS,
+    max_retries=settings.WORK_QUEUE_MAX_RETRIES,
+    retry_delay=settings.WORK_QUEUE_RETRY_DELAY,
+)
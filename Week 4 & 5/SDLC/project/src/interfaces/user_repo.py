@@ -16,3 +16,7 @@ class AbstractUserRepository(ABC):
     @abstractmethod
     def fetch_all_users(self) -> list:
         pass
+
+    @abstractmethod
+    def fetch_users_page(self, limit: int, offset: int) -> list:
+        pass
@@ -1,5 +1,24 @@
 from .category import Category
+from .category_summary import CategorySummary
+from .category_summary_delta import CategorySummaryDelta
+from .change_log import ChangeLog
+from .idempotency_key import IdempotencyKey
+from .import_job import ImportJob
 from .product import Product
 from .user import User
 
-__all__ = ["User", "Product", "Category"]
+# Session event listeners keeping the change log, cache invalidations and the
+# category summary in step with ORM writes; registered here so every process
+# that loads a model has them, whichever repository module it imports first
+from src.repository import category_summary, change_log, invalidation  # noqa: F401
+
+__all__ = [
+    "User",
+    "Product",
+    "Category",
+    "CategorySummary",
+    "CategorySummaryDelta",
+    "ChangeLog",
+    "IdempotencyKey",
+    "ImportJob",
+]
@@ -9,7 +9,13 @@ class Category(Base):
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(25), unique=True)
+    # bumped by SQLAlchemy on every UPDATE, used for ETags
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
 
+    # the database deletes products through ON DELETE CASCADE; without
+    # passive_deletes the ORM would try to set their category_id to NULL
     products: Mapped[list["Product"]] = relationship(  # noqa: F821
-        "Product", back_populates="category"
+        "Product", back_populates="category", passive_deletes=True
     )
+
+    __mapper_args__ = {"version_id_col": version}
@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.repository.database import Base
+
+
+class CategorySummary(Base):
+    __tablename__ = "category_summary"
+
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("product_category.id", ondelete="CASCADE"), primary_key=True
+    )
+    product_count: Mapped[int] = mapped_column(nullable=False, server_default="0")
+    total_quantity: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    stock_value: Mapped[float] = mapped_column(nullable=False, server_default="0")
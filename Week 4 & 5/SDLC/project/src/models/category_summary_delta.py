@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.repository.database import Base
+
+
+class CategorySummaryDelta(Base):
+    __tablename__ = "category_summary_delta"
+
+    # sqlite only autoincrements INTEGER primary keys
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    # not unique: writers append, the compactor folds rows into the summary
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("product_category.id", ondelete="CASCADE"), index=True
+    )
+    product_count: Mapped[int] = mapped_column(nullable=False)
+    total_quantity: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    stock_value: Mapped[float] = mapped_column(nullable=False)
@@ -0,0 +1,32 @@
+from sqlalchemy import BigInteger, Float, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.repository.database import Base
+
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+
+    # sqlite only autoincrements INTEGER primary keys
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    # id of the writing transaction, the feed cursor
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    table_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    row_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    # "upsert" or "delete"
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    # unix timestamp
+    changed_at: Mapped[float] = mapped_column(Float, nullable=False)
+
+    __table_args__ = (
+        # feed pages, in cursor order
+        Index("ix_change_log_txid", "txid", "id"),
+        # newest transaction per table, for ETags and retention
+        Index("ix_change_log_table_txid", "table_name", "txid"),
+        # retention scans
+        Index("ix_change_log_changed_at", "changed_at"),
+    )
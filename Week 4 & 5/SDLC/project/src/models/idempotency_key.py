@@ -0,0 +1,19 @@
+from typing import Optional
+
+from sqlalchemy import Float, Integer, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.repository.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_key"
+
+    # "<path>:<user email>:<Idempotency-Key header>"
+    key: Mapped[str] = mapped_column(String(512), primary_key=True)
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    # both NULL while the first request is still running
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response_body: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True)
+    # unix timestamp, the end of the claim's lease until a response is stored
+    expires_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
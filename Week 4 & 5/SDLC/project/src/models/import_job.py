@@ -0,0 +1,25 @@
+from typing import Optional
+
+from sqlalchemy import JSON, Float, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.repository.database import Base
+
+
+class ImportJob(Base):
+    __tablename__ = "import_job"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    # "pending", "running", "succeeded" or "failed"
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    user_email: Mapped[str] = mapped_column(String(255), nullable=False)
+    rows_read: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_imported: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rows_failed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # first IMPORT_MAX_ERRORS rejected rows: {"row", "product_id", "message"}
+    errors: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    # why the whole job failed, eg: a missing column
+    message: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # unix timestamps
+    created_at: Mapped[float] = mapped_column(Float, nullable=False)
+    updated_at: Mapped[float] = mapped_column(Float, nullable=False)
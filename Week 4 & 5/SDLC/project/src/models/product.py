@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, String
+from sqlalchemy import DDL, ForeignKey, Index, String, event, func, literal_column
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.repository.database import Base
@@ -11,14 +11,87 @@ class Product(Base):
         primary_key=True, unique=True, index=True, autoincrement=True
     )
     name: Mapped[str] = mapped_column(String(100), nullable=False)
-    quantity: Mapped[int] = mapped_column(nullable=False)
-    price: Mapped[float] = mapped_column(nullable=False)
+    # active_history keeps the old value for category summary deltas
+    quantity: Mapped[int] = mapped_column(nullable=False, active_history=True)
+    price: Mapped[float] = mapped_column(nullable=False, active_history=True)
     price_type: Mapped[str] = mapped_column(
         String(50), nullable=False, server_default="regular"
     )
 
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("product_category.id", ondelete="CASCADE"), nullable=False
+        ForeignKey("product_category.id", ondelete="CASCADE"),
+        nullable=False,
+        active_history=True,
     )
 
+    # bumped by SQLAlchemy on every UPDATE, used for ETags
+    version: Mapped[int] = mapped_column(nullable=False, server_default="1")
+
     category: Mapped["Category"] = relationship("Category", back_populates="products")  # noqa: F821
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+# quantity under which a product is low on stock. Migration 5b8c0d4e7f21
+# repeats it in the ix_product_low_stock predicate, so it is not a setting:
+# changing it needs a migration recreating the index
+LOW_STOCK_THRESHOLD = 10
+
+# partial index holding only low-stock rows, so the low-stock job reads a
+# few index entries instead of scanning the catalog. The threshold is a
+# literal: the planner only uses the index when the query repeats it
+LOW_STOCK_PREDICATE = Product.quantity < literal_column(str(LOW_STOCK_THRESHOLD))
+Index(
+    "ix_product_low_stock",
+    Product.quantity,
+    postgresql_where=LOW_STOCK_PREDICATE,
+    sqlite_where=LOW_STOCK_PREDICATE,
+)
+
+# text search config as a literal, so queries match the index expression
+SEARCH_CONFIG = literal_column("'simple'")
+
+# /products/search indexes on postgres: full-text and pg_trgm. The literal
+# config hides the table from Index, so the first one is attached explicitly
+Product.__table__.append_constraint(
+    Index(
+        "ix_product_name_tsv",
+        func.to_tsvector(SEARCH_CONFIG, Product.name),
+        postgresql_using="gin",
+    ).ddl_if(dialect="postgresql")
+)
+Index(
+    "ix_product_name_trgm",
+    Product.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# sqlite (tests, local runs): FTS5 index kept in sync by triggers
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS product_fts USING fts5("
+    "name, content='product', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS product_fts_ai AFTER INSERT ON product BEGIN "
+    "INSERT INTO product_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS product_fts_ad AFTER DELETE ON product BEGIN "
+    "INSERT INTO product_fts(product_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER IF NOT EXISTS product_fts_au AFTER UPDATE OF name ON product "
+    "BEGIN INSERT INTO product_fts(product_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); "
+    "INSERT INTO product_fts(rowid, name) VALUES (new.id, new.name); END",
+)
+for statement in SQLITE_FTS_DDL:
+    event.listen(
+        Product.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS product_fts").execute_if(dialect="sqlite"),
+)
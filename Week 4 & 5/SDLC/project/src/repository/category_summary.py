@@ -0,0 +1,362 @@
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import (
+    Delete,
+    Insert,
+    Select,
+    Update,
+    delete,
+    event,
+    exists,
+    func,
+    insert,
+    inspect,
+    select,
+    union_all,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.models.category import Category
+from src.models.category_summary import CategorySummary
+from src.models.category_summary_delta import CategorySummaryDelta
+from src.models.product import Product
+
+logger = get_logger(__name__)
+
+SUMMARY_FIELDS = ("category_id", "quantity", "price")
+
+
+def get_summary_values(product: Product, committed: bool) -> tuple:
+    """
+    reads the summary relevant fields of a product from attribute history
+
+    Args:
+        product: product in the flush
+        committed: True for the values in the db before this flush,
+                   False for the values being written
+
+    Returns:
+        tuple: (category_id, quantity, price)
+    """
+    state = inspect(product)
+    values = []
+    for field in SUMMARY_FIELDS:
+        history = state.attrs[field].history
+        changed = history.deleted if committed else history.added
+        values.append((changed or history.unchanged or [None])[0])
+    return tuple(values)
+
+
+def collect_summary_deltas(session: Session) -> dict[int, list]:
+    """
+    computes per category deltas for the products written by a flush
+
+    Args:
+        session: session being flushed (history is still pre-flush)
+
+    Returns:
+        dict[int, list]: category_id -> [product_count, total_quantity, stock_value]
+    """
+    deltas: dict[int, list] = defaultdict(lambda: [0, 0, 0.0])
+
+    def apply(values: tuple, sign: int) -> None:
+        category_id, quantity, price = values
+        if category_id is None:
+            return
+        delta = deltas[category_id]
+        delta[0] += sign
+        delta[1] += sign * (quantity or 0)
+        delta[2] += sign * (quantity or 0) * (price or 0)
+
+    for instance in session.new:
+        if isinstance(instance, Product):
+            apply(get_summary_values(product=instance, committed=False), sign=1)
+    for instance in session.deleted:
+        if isinstance(instance, Product):
+            apply(get_summary_values(product=instance, committed=True), sign=-1)
+    for instance in session.dirty:
+        if not isinstance(instance, Product):
+            continue
+        state = inspect(instance)
+        if any(state.attrs[field].history.has_changes() for field in SUMMARY_FIELDS):
+            apply(get_summary_values(product=instance, committed=True), sign=-1)
+            apply(get_summary_values(product=instance, committed=False), sign=1)
+    return {
+        category_id: delta
+        for category_id, delta in deltas.items()
+        if any(delta)
+    }
+
+
+def get_delta_rows(deltas: dict[int, list]) -> list[dict]:
+    """
+    builds the delta rows a write appends, one per touched category
+
+    Args:
+        deltas: category_id -> [product_count, total_quantity, stock_value]
+
+    Returns:
+        list[dict]: insert parameters, categories without a change skipped
+    """
+    return [
+        {
+            "category_id": category_id,
+            "product_count": product_count,
+            "total_quantity": total_quantity,
+            "stock_value": stock_value,
+        }
+        for category_id, (product_count, total_quantity, stock_value) in sorted(
+            deltas.items()
+        )
+        if product_count or total_quantity or stock_value
+    ]
+
+
+@event.listens_for(Session, "after_flush")
+def update_category_summary(session: Session, flush_context) -> None:
+    """
+    appends product write deltas for the materialized category summary in
+    the same transaction, so each write costs O(touched categories) and
+    concurrent writers never update the same summary row
+
+    Args:
+        session: flushed session
+        flush_context: unused, required by the event signature
+    """
+    if not settings.CATEGORY_SUMMARY_MATERIALIZED:
+        return
+
+    rows = get_delta_rows(deltas=collect_summary_deltas(session=session))
+    if not rows:
+        return
+    session.connection().execute(insert(CategorySummaryDelta), rows)
+    logger.debug(f"Appended category summary deltas for {len(rows)} categories")
+
+
+async def apply_summary_deltas(deltas: dict[int, list], db: AsyncSession) -> None:
+    """
+    appends deltas of writes that bypass the ORM flush (bulk UPDATE
+    statements) for the materialized summary, in the caller's transaction
+
+    Args:
+        deltas: category_id -> [product_count, total_quantity, stock_value]
+        db: sqlalchemy db object
+    """
+    if not settings.CATEGORY_SUMMARY_MATERIALIZED:
+        return
+    rows = get_delta_rows(deltas=deltas)
+    if rows:
+        await db.execute(insert(CategorySummaryDelta), rows)
+
+
+def get_summary_increment(category_id: int, delta: list) -> Update:
+    """
+    builds the statement adding a delta to one category's summary row
+
+    Args:
+        category_id: category to update
+        delta: [product_count, total_quantity, stock_value]
+
+    Returns:
+        Update: summary increment
+    """
+    product_count, total_quantity, stock_value = delta
+    return (
+        update(CategorySummary)
+        .where(CategorySummary.category_id == category_id)
+        .values(
+            product_count=CategorySummary.product_count + product_count,
+            total_quantity=CategorySummary.total_quantity + total_quantity,
+            stock_value=CategorySummary.stock_value + stock_value,
+        )
+    )
+
+
+def get_summary_insert(category_id: int, delta: list) -> Insert:
+    """
+    builds the statement creating a category's first summary row
+
+    Args:
+        category_id: category to insert
+        delta: [product_count, total_quantity, stock_value]
+
+    Returns:
+        Insert: summary row insert
+    """
+    product_count, total_quantity, stock_value = delta
+    return insert(CategorySummary).values(
+        category_id=category_id,
+        product_count=product_count,
+        total_quantity=total_quantity,
+        stock_value=stock_value,
+    )
+
+
+def get_delta_claim_stmt() -> Delete:
+    """
+    builds the statement taking every committed delta; DELETE ... RETURNING
+    claims them atomically, so concurrent compactions fold disjoint rows
+
+    Returns:
+        Delete: delta delete returning the deleted values
+    """
+    return delete(CategorySummaryDelta).returning(
+        CategorySummaryDelta.category_id,
+        CategorySummaryDelta.product_count,
+        CategorySummaryDelta.total_quantity,
+        CategorySummaryDelta.stock_value,
+    )
+
+
+async def compact_summary_deltas(db: AsyncSession) -> int:
+    """
+    folds the appended deltas into the summary rows, so reads sum few rows;
+    only compactions update summary rows, writers never wait on them
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        int: number of folded deltas
+    """
+    claimed = (await db.execute(get_delta_claim_stmt())).all()
+    totals: dict[int, list] = defaultdict(lambda: [0, 0, 0.0])
+    for category_id, product_count, total_quantity, stock_value in claimed:
+        total = totals[category_id]
+        total[0] += product_count
+        total[1] += total_quantity
+        total[2] += stock_value
+    # sorted so concurrent compactions lock summary rows in the same order
+    for category_id, delta in sorted(totals.items()):
+        increment = get_summary_increment(category_id=category_id, delta=delta)
+        if (await db.execute(increment)).rowcount == 0:
+            await db.execute(get_summary_insert(category_id=category_id, delta=delta))
+    await db.commit()
+    if claimed:
+        logger.debug(f"Folded {len(claimed)} category summary deltas")
+    return len(claimed)
+
+
+def get_aggregate_stmt() -> Select:
+    """
+    builds the GROUP BY category_id aggregate over the product table
+
+    Returns:
+        Select: columns category_id, product_count, total_quantity, stock_value
+    """
+    return select(
+        Product.category_id,
+        func.count(Product.id).label("product_count"),
+        func.coalesce(func.sum(Product.quantity), 0).label("total_quantity"),
+        func.coalesce(func.sum(Product.quantity * Product.price), 0.0).label(
+            "stock_value"
+        ),
+    ).group_by(Product.category_id)
+
+
+def get_materialized_stmt() -> Select:
+    """
+    builds the sum of the summary rows and the deltas not yet folded in
+
+    Returns:
+        Select: columns category_id, product_count, total_quantity, stock_value
+    """
+    columns = ("category_id", "product_count", "total_quantity", "stock_value")
+    rows = union_all(
+        select(*(getattr(CategorySummary, column) for column in columns)),
+        select(*(getattr(CategorySummaryDelta, column) for column in columns)),
+    ).subquery()
+    return select(
+        rows.c.category_id,
+        func.sum(rows.c.product_count).label("product_count"),
+        func.sum(rows.c.total_quantity).label("total_quantity"),
+        func.sum(rows.c.stock_value).label("stock_value"),
+    ).group_by(rows.c.category_id)
+
+
+async def refresh_category_summary(db: AsyncSession | AsyncConnection) -> None:
+    """
+    rebuilds the materialized summary from the product table, needed after
+    writes that bypass the ORM (bulk seeding, raw UPDATE statements)
+
+    Args:
+        db: sqlalchemy session or connection, committed by the caller
+    """
+    aggregate = get_aggregate_stmt().subquery()
+    await db.execute(delete(CategorySummaryDelta))
+    await db.execute(delete(CategorySummary))
+    await db.execute(
+        insert(CategorySummary).from_select(
+            ["category_id", "product_count", "total_quantity", "stock_value"],
+            select(aggregate),
+        )
+    )
+    logger.info("Rebuilt category summary")
+
+
+async def backfill_category_summary(db: AsyncSession) -> bool:
+    """
+    builds the materialized summary if it holds nothing yet, eg: the first
+    start with CATEGORY_SUMMARY_MATERIALIZED on an existing database, whose
+    writes appended no deltas while the flag was off
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        bool: True if the summary was built here
+    """
+    stmt = select(
+        exists(select(CategorySummary.category_id)),
+        exists(select(CategorySummaryDelta.id)),
+    )
+    if any((await db.execute(stmt)).one()):
+        return False
+    try:
+        await refresh_category_summary(db=db)
+        await db.commit()
+    except IntegrityError:
+        # another worker starting at the same time built it first
+        await db.rollback()
+        return False
+    return True
+
+
+async def get_category_summary_rows(db: AsyncSession) -> list[dict[str, Any]]:
+    """
+    reads one summary row per category, categories without products included
+
+    Reads the materialized table and its pending deltas when
+    CATEGORY_SUMMARY_MATERIALIZED is set (O(categories)), otherwise
+    aggregates the product table with GROUP BY.
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        list[dict]: category_id, name, product_count, total_quantity, stock_value
+    """
+    if settings.CATEGORY_SUMMARY_MATERIALIZED:
+        summary = get_materialized_stmt().subquery("summary")
+    else:
+        summary = get_aggregate_stmt().subquery("summary")
+
+    stmt = (
+        select(
+            Category.id.label("category_id"),
+            Category.name,
+            func.coalesce(summary.c.product_count, 0).label("product_count"),
+            func.coalesce(summary.c.total_quantity, 0).label("total_quantity"),
+            func.coalesce(summary.c.stock_value, 0.0).label("stock_value"),
+        )
+        .outerjoin(summary, summary.c.category_id == Category.id)
+        .order_by(Category.id)
+    )
+    result = await db.execute(stmt)
+    return [dict(row) for row in result.mappings()]
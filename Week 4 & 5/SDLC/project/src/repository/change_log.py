@@ -0,0 +1,378 @@
+from itertools import chain
+from time import time
+from typing import Callable, Iterable
+
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Delete,
+    Select,
+    Text,
+    cast,
+    delete,
+    event,
+    func,
+    insert,
+    select,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from src.core.log import get_logger
+from src.models.category import Category
+from src.models.change_log import ChangeLog
+from src.models.product import Product
+
+logger = get_logger(__name__)
+
+# tables whose writes are published on the /changes feed
+FEED_TABLES = frozenset({Product.__tablename__, Category.__tablename__})
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# session.info key caching the transaction id, see get_transaction_id_stmt
+TRANSACTION_ID = "change_log_txid"
+
+# session.info key for product deletes cascaded by a category delete
+CASCADED_DELETES = "change_log_cascaded_deletes"
+
+# session.info flag set once the transaction appended to the change log
+CHANGES_WRITTEN = "change_log_written"
+
+# postgres channel notified when a transaction with changes commits
+CHANNEL = "catalog_changes"
+
+# called after a commit that appended changes, eg: to wake the stream broker
+commit_hooks: list[Callable[[], None]] = []
+
+
+def get_pending_changes(session: Session) -> list[tuple[str, int, str]]:
+    """
+    collects feed rows written by the pending flush
+
+    Args:
+        session: session being flushed (state is still pre-flush, new rows
+            already have their ids)
+
+    Returns:
+        list[tuple[str, int, str]]: sorted (table_name, row_id, operation)
+    """
+    written = chain(
+        session.new,
+        (
+            instance
+            for instance in session.dirty
+            if session.is_modified(instance, include_collections=False)
+        ),
+    )
+    changes = {
+        (instance.__tablename__, instance.id): UPSERT
+        for instance in written
+        if getattr(instance, "__tablename__", None) in FEED_TABLES
+    }
+    changes.update(
+        {
+            (instance.__tablename__, instance.id): DELETE
+            for instance in session.deleted
+            if getattr(instance, "__tablename__", None) in FEED_TABLES
+        }
+    )
+    for product_id in session.info.pop(CASCADED_DELETES, ()):
+        changes[(Product.__tablename__, product_id)] = DELETE
+    return sorted((table, row_id, op) for (table, row_id), op in changes.items())
+
+
+def get_change_rows(changes: Iterable[tuple[str, int, str]], txid: int) -> list[dict]:
+    """
+    builds change log rows, all stamped with the same time
+
+    Args:
+        changes: (table_name, row_id, operation) triples
+        txid: id of the writing transaction
+
+    Returns:
+        list[dict]: insert parameters
+    """
+    changed_at = time()
+    return [
+        {
+            "txid": txid,
+            "table_name": table_name,
+            "row_id": row_id,
+            "operation": operation,
+            "changed_at": changed_at,
+        }
+        for table_name, row_id, operation in changes
+    ]
+
+
+def get_transaction_id_stmt(dialect_name: str) -> Select:
+    """
+    builds the query numbering the writing transaction, the feed cursor
+
+    Writers take no lock: on postgres the cursor is the transaction id, and
+    readers only return transactions older than every running one, see
+    get_finished_filter. sqlite runs one writer at a time, so the next
+    number after the highest logged one is this transaction's.
+
+    Args:
+        dialect_name: name of the session's dialect
+
+    Returns:
+        Select: scalar transaction id
+    """
+    if dialect_name == "postgresql":
+        # xid8 only casts to bigint through text
+        return select(cast(cast(func.pg_current_xact_id(), Text), BigInteger))
+    return select(func.coalesce(func.max(ChangeLog.txid), 0) + 1)
+
+
+def get_finished_filter(dialect_name: str) -> list[ColumnElement[bool]]:
+    """
+    builds the condition keeping only transactions that can no longer commit
+
+    A postgres transaction id is taken at its first write but the transaction
+    commits later, so a reader that returned txid 11 could later see txid 10
+    commit. Every transaction older than the snapshot's xmin has finished,
+    and any that commits from now on has a txid of at least xmin, so a
+    cursor below xmin never skips a change. sqlite needs no condition: the
+    one running writer is numbered after every visible transaction.
+
+    Args:
+        dialect_name: name of the session's dialect
+
+    Returns:
+        list: conditions for the change log WHERE clause
+    """
+    if dialect_name != "postgresql":
+        return []
+    xmin = cast(
+        cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger
+    )
+    return [ChangeLog.txid < xmin]
+
+
+@event.listens_for(Session, "before_flush")
+def collect_cascaded_deletes(session: Session, flush_context, instances) -> None:
+    """
+    remembers the products a category delete will remove through ON DELETE
+    CASCADE, which the ORM never sees
+
+    Args:
+        session: session about to flush
+        flush_context: unused, required by the event signature
+        instances: unused, required by the event signature
+    """
+    category_ids = [
+        instance.id for instance in session.deleted if isinstance(instance, Category)
+    ]
+    if not category_ids:
+        return
+    stmt = select(Product.id).where(Product.category_id.in_(category_ids))
+    product_ids = session.connection().execute(stmt).scalars().all()
+    session.info.setdefault(CASCADED_DELETES, []).extend(product_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def record_flushed_changes(session: Session, flush_context) -> None:
+    """
+    appends the rows written by a flush to the change log, in the same
+    transaction so the log commits or rolls back with them
+
+    Args:
+        session: flushed session
+        flush_context: unused, required by the event signature
+    """
+    changes = get_pending_changes(session=session)
+    if not changes:
+        return
+    connection = session.connection()
+    if TRANSACTION_ID not in session.info:
+        stmt = get_transaction_id_stmt(dialect_name=connection.dialect.name)
+        session.info[TRANSACTION_ID] = connection.execute(stmt).scalar_one()
+    rows = get_change_rows(changes=changes, txid=session.info[TRANSACTION_ID])
+    connection.execute(insert(ChangeLog), rows)
+    session.info[CHANGES_WRITTEN] = True
+    logger.debug(f"Recorded {len(changes)} changes")
+
+
+async def record_changes(
+    table_name: str, row_ids: Iterable[int], operation: str, db: AsyncSession
+) -> None:
+    """
+    appends changes made by statements that bypass the ORM flush (bulk
+    UPDATE statements), in the caller's transaction
+
+    Args:
+        table_name: feed table name
+        row_ids: ids of the written rows
+        operation: UPSERT or DELETE
+        db: sqlalchemy db object
+    """
+    changes = [(table_name, row_id, operation) for row_id in sorted(row_ids)]
+    if not changes:
+        return
+    if TRANSACTION_ID not in db.info:
+        stmt = get_transaction_id_stmt(dialect_name=db.bind.dialect.name)
+        db.info[TRANSACTION_ID] = await db.scalar(stmt)
+    rows = get_change_rows(changes=changes, txid=db.info[TRANSACTION_ID])
+    await db.execute(insert(ChangeLog), rows)
+    db.info[CHANGES_WRITTEN] = True
+
+
+@event.listens_for(Session, "before_commit")
+def notify_listeners(session: Session) -> None:
+    """
+    queues a NOTIFY on postgres, which delivers it only if the transaction
+    commits, so every worker's stream broker reads the new changes
+
+    Args:
+        session: committing session
+    """
+    if not session.info.get(CHANGES_WRITTEN):
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_notify(CHANNEL, "")))
+
+
+@event.listens_for(Session, "after_commit")
+def run_commit_hooks(session: Session) -> None:
+    """
+    tells in-process listeners that changes committed, without waiting for
+    the postgres notification
+
+    Args:
+        session: committed session
+    """
+    session.info.pop(TRANSACTION_ID, None)
+    if session.info.pop(CHANGES_WRITTEN, False):
+        for hook in commit_hooks:
+            hook()
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_changes(session: Session) -> None:
+    """
+    clears the written flag and transaction id of a rolled back transaction
+
+    Args:
+        session: rolled back session
+    """
+    session.info.pop(TRANSACTION_ID, None)
+    session.info.pop(CHANGES_WRITTEN, None)
+
+
+def get_changes_stmt(since: int, limit: int, dialect_name: str) -> Select:
+    """
+    builds the page query of the change feed
+
+    Args:
+        since: cursor of the last transaction the reader has seen
+        limit: maximum number of changes
+        dialect_name: name of the session's dialect
+
+    Returns:
+        Select: finished changes after the cursor, in cursor order
+    """
+    return (
+        select(ChangeLog)
+        .where(ChangeLog.txid > since, *get_finished_filter(dialect_name))
+        .order_by(ChangeLog.txid, ChangeLog.id)
+        .limit(limit)
+    )
+
+
+async def get_change_page(
+    since: int, limit: int, db: AsyncSession
+) -> tuple[list[ChangeLog], bool]:
+    """
+    reads the changes after a cursor, ending on a whole transaction, since
+    the cursor is a transaction id; a transaction larger than a page is
+    returned whole
+
+    Args:
+        since: cursor of the last transaction the reader has seen
+        limit: maximum number of changes
+        db: sqlalchemy db object
+
+    Returns:
+        tuple: (changes in cursor order, whether more may follow)
+    """
+    dialect_name = db.bind.dialect.name
+    stmt = get_changes_stmt(since=since, limit=limit + 1, dialect_name=dialect_name)
+    rows = (await db.execute(stmt)).scalars().all()
+    if len(rows) <= limit:
+        return rows, False
+    split_txid = rows[limit].txid
+    page = [row for row in rows[:limit] if row.txid != split_txid]
+    if not page:
+        stmt = (
+            select(ChangeLog)
+            .where(ChangeLog.txid == split_txid)
+            .order_by(ChangeLog.id)
+        )
+        page = (await db.execute(stmt)).scalars().all()
+    return page, True
+
+
+async def get_latest_cursor(db: AsyncSession) -> int:
+    """
+    reads the newest cursor, where a reader that just took a full snapshot
+    starts following the feed
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        int: id of the newest finished transaction, 0 if the log is empty
+    """
+    latest = await db.scalar(
+        select(func.max(ChangeLog.txid)).where(
+            *get_finished_filter(db.bind.dialect.name)
+        )
+    )
+    return latest or 0
+
+
+def get_retention_stmt(before: float) -> Delete:
+    """
+    builds the statement dropping changes older than the retention period;
+    the newest transaction of each table is kept, so table versions never
+    go back (see get_table_version) and sqlite never numbers a transaction
+    below a cursor already handed out
+
+    Args:
+        before: unix time, older changes are dropped
+
+    Returns:
+        Delete: retention delete
+    """
+    latest = aliased(ChangeLog)
+    newest_txid = (
+        select(func.max(latest.txid))
+        .where(latest.table_name == ChangeLog.table_name)
+        .scalar_subquery()
+    )
+    return delete(ChangeLog).where(
+        ChangeLog.changed_at < before, ChangeLog.txid < newest_txid
+    )
+
+
+async def delete_expired_changes(retention: float, db: AsyncSession) -> int:
+    """
+    removes changes older than the retention period; a consumer further
+    behind than that has to resync from a snapshot
+
+    Args:
+        retention: seconds a change is kept
+        db: sqlalchemy db object
+
+    Returns:
+        int: number of deleted changes
+    """
+    result = await db.execute(get_retention_stmt(before=time() - retention))
+    await db.commit()
+    logger.info(f"Deleted {result.rowcount} expired changes")
+    return result.rowcount
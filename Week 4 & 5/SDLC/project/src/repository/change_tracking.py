@@ -0,0 +1,66 @@
+import hashlib
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.change_log import ChangeLog
+from src.repository.change_log import get_finished_filter
+
+# tables whose collection responses carry an ETag, every write to them is
+# appended to the change log
+TRACKED_TABLES = frozenset({"product", "product_category"})
+
+
+def get_table_version_stmt(table_name: str, dialect_name: str) -> Select:
+    """
+    builds the query of a table's version from the change log
+
+    The version is the newest finished transaction that wrote the table,
+    plus, on postgres, the committed ones still above the snapshot's xmin
+    (see get_finished_filter). A commit either becomes the newest finished
+    transaction or joins that set, so every commit changes the version,
+    and one statement reads both from the same snapshot. Writers only
+    append to the log, no row is shared between them.
+
+    Args:
+        table_name: tracked table name
+        dialect_name: name of the session's dialect
+
+    Returns:
+        Select: distinct transaction ids, ascending
+    """
+    newest_finished = (
+        select(func.coalesce(func.max(ChangeLog.txid), 0))
+        .where(ChangeLog.table_name == table_name, *get_finished_filter(dialect_name))
+        .scalar_subquery()
+    )
+    return (
+        select(ChangeLog.txid)
+        .distinct()
+        .where(ChangeLog.table_name == table_name, ChangeLog.txid >= newest_finished)
+        .order_by(ChangeLog.txid)
+    )
+
+
+async def get_table_version(table_name: str, db: AsyncSession) -> str:
+    """
+    reads the version of a table, which changes with every committed write
+
+    The transaction ids are hashed, so the version keeps a fixed length
+    however many commits are still in flight.
+
+    Args:
+        table_name: tracked table name
+        db: sqlalchemy db object
+
+    Returns:
+        str: sha1 hex digest of the transaction ids, "0" if the table was
+        never written
+    """
+    stmt = get_table_version_stmt(
+        table_name=table_name, dialect_name=db.bind.dialect.name
+    )
+    txids = (await db.execute(stmt)).scalars().all()
+    if not txids:
+        return "0"
+    return hashlib.sha1(".".join(str(txid) for txid in txids).encode()).hexdigest()
@@ -1,19 +1,128 @@
+from contextvars import ContextVar
+from itertools import cycle
 from typing import Any, AsyncGenerator
 
 from passlib.context import CryptContext
 from pydantic import BaseModel
-from sqlalchemy import insert, text
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session, declarative_base
 
 from src.core.config import settings
 from src.core.exceptions import DatabaseException
 from src.core.log import get_logger
+from src.repository.pool import InstrumentedQueuePool
+from src.repository.slow_query import install_slow_query_log
 from src.repository.utility import get_initial_data_from_csv
 
-engine = create_async_engine(url=settings.DATABASE_URL)
+
+def create_pooled_engine(url: str) -> AsyncEngine:
+    """Create an async engine with the instrumented, configured pool.
+
+    Every statement it runs is timed for the slow-query log.
+
+    Args:
+        url: Database connection string.
+
+    Returns:
+        AsyncEngine: engine for url
+    """
+    pooled_engine = create_async_engine(
+        url=url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        connect_args={"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+    install_slow_query_log(engine=pooled_engine)
+    return pooled_engine
+
+
+engine = create_pooled_engine(url=settings.DATABASE_URL)
+replica_engines = [create_pooled_engine(url=url) for url in settings.replica_urls]
+_replica_cycle = cycle(replica_engines)
+
+# session.info flag set by get_read_db
+READ_ONLY = "read_only"
+
+# set once the current request has written, later reads go to the primary
+primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+class RoutingSession(Session):
+    """Session that sends read-only sessions to a replica.
+
+    Sessions opened by get_read_db read from one replica, picked round-robin
+    when the session first needs a connection and kept for the rest of the
+    session so all its reads see the same snapshot. Everything else, any
+    flush, and every read after the request wrote through any session goes
+    to the primary, so a request always reads its own writes despite
+    replica lag.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """Pick the engine for the next statement.
+
+        Args:
+            mapper: Mapper the statement targets, unused.
+            clause: Statement being executed, unused.
+            **kwargs: Other routing hints, unused.
+
+        Returns:
+            Engine: sync engine of a replica or of the primary
+        """
+        if (
+            replica_engines
+            and self.info.get(READ_ONLY)
+            and not self._flushing
+            and not primary_pinned.get()
+        ):
+            replica = self.info.get("replica")
+            if replica is None:
+                replica = self.info["replica"] = next(_replica_cycle)
+            return replica.sync_engine
+        return engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def pin_after_flush(session: Session, flush_context) -> None:
+    """
+    pins the rest of the request to the primary after an ORM write
+
+    Args:
+        session: flushed session
+        flush_context: unused, required by the event signature
+    """
+    primary_pinned.set(True)
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def pin_after_dml(orm_execute_state: ORMExecuteState) -> None:
+    """
+    pins the rest of the request to the primary after a bulk
+    INSERT/UPDATE/DELETE statement
+
+    Args:
+        orm_execute_state: statement being executed
+    """
+    if not orm_execute_state.is_select:
+        primary_pinned.set(True)
+
+
 async_session_local = async_sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False, autoflush=False
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    autoflush=False,
 )
 
 Base = declarative_base()
@@ -48,6 +157,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, Any]:
             await db.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, Any]:
+    """Get a read-only database session dependency for FastAPI.
+
+    Same as get_db, but the session reads from a replica when
+    DB_REPLICA_URLS is set, until the request writes anything.
+
+    Yields:
+        Session: SQLAlchemy database session instance.
+
+    Raises:
+        DatabaseException: If database connection fails.
+    """
+    async with async_session_local(info={READ_ONLY: True}) as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(str(e))
+            raise DatabaseException(
+                message="Database connection failed",
+                field_errors=[
+                    {"field": "database", "message": f"Database error: {str(e)}"}
+                ],
+            )
+        finally:
+            await db.close()
+
+
 async def seed_db():
     """Seed database with initial data from CSV file.
 
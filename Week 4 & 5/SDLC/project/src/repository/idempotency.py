@@ -0,0 +1,142 @@
+from time import time
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.log import get_logger
+from src.models.idempotency_key import IdempotencyKey
+
+logger = get_logger(__name__)
+
+
+async def get_idempotency_record(key: str, db: AsyncSession) -> Optional[tuple]:
+    """
+    reads a stored key, deleting it if its TTL has passed
+
+    Columns are selected instead of the entity so repeated polls always see
+    the latest committed row rather than the identity map copy.
+
+    Args:
+        key: scoped idempotency key
+        db: sqlalchemy db object
+
+    Returns:
+        tuple: (fingerprint, status_code, response_body, expires_at), or None
+    """
+    result = await db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response_body,
+            IdempotencyKey.expires_at,
+        ).where(IdempotencyKey.key == key)
+    )
+    row = result.first()
+    if row is not None and row.expires_at <= time():
+        await release_idempotency_key(key=key, db=db)
+        return None
+    return row
+
+
+async def claim_idempotency_key(
+    key: str, fingerprint: str, expires_at: float, db: AsyncSession
+) -> bool:
+    """
+    inserts an in-progress row for a key, the primary key makes sure only
+    one request (across all workers) gets to run the endpoint
+
+    The row expires at the end of a short lease rather than the TTL, so a
+    key whose holder crashed before saving a response is deleted by the next
+    get_idempotency_record and can be claimed again.
+
+    Args:
+        key: scoped idempotency key
+        fingerprint: request fingerprint
+        expires_at: unix timestamp at which the claim's lease ends
+        db: sqlalchemy db object
+
+    Returns:
+        bool: True if claimed, False if another request holds the key
+    """
+    try:
+        await db.execute(
+            insert(IdempotencyKey).values(
+                key=key, fingerprint=fingerprint, expires_at=expires_at
+            )
+        )
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        logger.debug(f"Idempotency key {key} already claimed")
+        return False
+    return True
+
+
+async def save_idempotency_response(
+    key: str,
+    status_code: int,
+    response_body: bytes,
+    claimed_until: float,
+    expires_at: float,
+    db: AsyncSession,
+) -> None:
+    """
+    stores the response of a completed request for replay, if the request
+    still holds the claim (its lease was not taken over by a retry)
+
+    Args:
+        key: scoped idempotency key
+        status_code: HTTP status of the response
+        response_body: serialized response body
+        claimed_until: lease end the key was claimed with
+        expires_at: unix timestamp after which the key can be reused
+        db: sqlalchemy db object
+    """
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key, IdempotencyKey.expires_at == claimed_until)
+        .values(
+            status_code=status_code,
+            response_body=response_body,
+            expires_at=expires_at,
+        )
+    )
+    await db.commit()
+
+
+async def release_idempotency_key(
+    key: str, db: AsyncSession, claimed_until: Optional[float] = None
+) -> None:
+    """
+    deletes a key, so a failed first attempt can be retried with it
+
+    Args:
+        key: scoped idempotency key
+        db: sqlalchemy db object
+        claimed_until: if given, only delete the claim made with this lease end
+    """
+    stmt = delete(IdempotencyKey).where(IdempotencyKey.key == key)
+    if claimed_until is not None:
+        stmt = stmt.where(IdempotencyKey.expires_at == claimed_until)
+    await db.execute(stmt)
+    await db.commit()
+
+
+async def delete_expired_idempotency_keys(db: AsyncSession) -> int:
+    """
+    removes every key whose TTL has passed
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        int: number of deleted keys
+    """
+    result = await db.execute(
+        delete(IdempotencyKey).where(IdempotencyKey.expires_at <= time())
+    )
+    await db.commit()
+    logger.info(f"Deleted {result.rowcount} expired idempotency keys")
+    return result.rowcount
@@ -0,0 +1,134 @@
+from itertools import chain
+from typing import Hashable, Iterable, Optional
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.core.invalidation import CHANNEL, encode_invalidations, invalidation_bus
+from src.core.log import get_logger
+from src.models.category import Category
+from src.models.product import Product
+from src.models.user import User
+
+logger = get_logger(__name__)
+
+# invalidation scopes, caches register under these names
+PRODUCT_SCOPE = Product.__tablename__
+CATEGORY_SCOPE = Category.__tablename__
+USER_SCOPE = User.__tablename__
+
+# session.info key for stale keys waiting for the commit
+PENDING_INVALIDATIONS = "pending_invalidations"
+
+
+def get_cache_key(instance: object) -> tuple[str, Hashable] | None:
+    """
+    maps a written row to the cache entry it makes stale; users are cached
+    by email, the column every auth lookup uses
+
+    Args:
+        instance: flushed ORM instance
+
+    Returns:
+        tuple[str, Hashable] | None: (scope, key), None if nothing caches it
+    """
+    if isinstance(instance, User):
+        return USER_SCOPE, instance.email
+    if isinstance(instance, (Product, Category)):
+        return instance.__tablename__, instance.id
+    return None
+
+
+def queue_invalidations(
+    session: Session | AsyncSession,
+    scope: str,
+    keys: Optional[Iterable[Hashable]],
+) -> None:
+    """
+    marks keys stale once the session's transaction commits; bulk UPDATE
+    statements bypass the flush and call this for the rows they returned
+
+    Args:
+        session: session the write was made in
+        scope: invalidation scope
+        keys: stale keys, None when every key of the scope is stale
+    """
+    pending = session.info.setdefault(PENDING_INVALIDATIONS, {})
+    if keys is None or (scope in pending and pending[scope] is None):
+        pending[scope] = None
+    else:
+        pending.setdefault(scope, set()).update(keys)
+
+
+@event.listens_for(Session, "after_flush")
+def collect_invalidations(session: Session, flush_context) -> None:
+    """
+    queues the cache keys of every row the flush wrote or deleted; a
+    category delete removes its products through ON DELETE CASCADE, which
+    the ORM never sees, so it makes the whole product scope stale
+
+    Args:
+        session: flushed session
+        flush_context: unused, required by the event signature
+    """
+    written = chain(
+        session.new,
+        (
+            instance
+            for instance in session.dirty
+            if session.is_modified(instance, include_collections=False)
+        ),
+        session.deleted,
+    )
+    for instance in written:
+        cache_key = get_cache_key(instance=instance)
+        if cache_key is not None:
+            scope, key = cache_key
+            queue_invalidations(session=session, scope=scope, keys=(key,))
+    if any(isinstance(instance, Category) for instance in session.deleted):
+        queue_invalidations(session=session, scope=PRODUCT_SCOPE, keys=None)
+
+
+@event.listens_for(Session, "before_commit")
+def publish_invalidations(session: Session) -> None:
+    """
+    queues a NOTIFY on postgres, delivered to every worker only if the
+    transaction commits
+
+    Args:
+        session: committing session
+    """
+    pending = session.info.get(PENDING_INVALIDATIONS)
+    if not pending:
+        return
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        payload = encode_invalidations(invalidations=pending)
+        connection.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(Session, "after_commit")
+def apply_invalidations(session: Session) -> None:
+    """
+    drops the committed keys from this worker's caches right away, without
+    waiting for the notification
+
+    Args:
+        session: committed session
+    """
+    pending = session.info.pop(PENDING_INVALIDATIONS, None)
+    if pending:
+        invalidation_bus.apply(invalidations=pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def forget_invalidations(session: Session) -> None:
+    """
+    discards the keys of a rolled back transaction, the cached rows are
+    still current
+
+    Args:
+        session: rolled back session
+    """
+    session.info.pop(PENDING_INVALIDATIONS, None)
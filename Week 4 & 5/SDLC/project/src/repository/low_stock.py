@@ -0,0 +1,53 @@
+from typing import Iterable
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.log import get_logger
+from src.models.product import LOW_STOCK_PREDICATE, Product
+
+logger = get_logger(__name__)
+
+
+def get_low_stock_stmt() -> Select:
+    """
+    builds the low-stock query; it repeats the partial index predicate so
+    postgres answers it from ix_product_low_stock
+
+    Returns:
+        Select: id, name, quantity and category of every low-stock product
+    """
+    return (
+        select(Product.id, Product.name, Product.quantity, Product.category_id)
+        .where(LOW_STOCK_PREDICATE)
+        .order_by(Product.id)
+    )
+
+
+async def get_low_stock_rows(db: AsyncSession) -> list:
+    """
+    reads every product under the low-stock threshold
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        list: row mappings ordered by product id
+    """
+    result = await db.execute(get_low_stock_stmt())
+    return result.mappings().all()
+
+
+async def get_quantities(product_ids: Iterable[int], db: AsyncSession) -> dict:
+    """
+    reads the quantity of a few products by primary key
+
+    Args:
+        product_ids: product ids
+        db: sqlalchemy db object
+
+    Returns:
+        dict: product_id -> quantity, missing for deleted products
+    """
+    stmt = select(Product.id, Product.quantity).where(Product.id.in_(product_ids))
+    return {row.id: row.quantity for row in await db.execute(stmt)}
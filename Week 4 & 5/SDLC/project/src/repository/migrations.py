@@ -0,0 +1,68 @@
+from pathlib import Path
+
+from sqlalchemy import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.filepath import ALEMBIC_INI
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def get_script_heads(ini_path: Path = ALEMBIC_INI) -> set[str]:
+    """
+    reads the head revisions of the migration scripts, without running
+    env.py; alembic is imported here so a normal boot never loads it
+
+    Args:
+        ini_path: alembic.ini, its script_location holds the versions
+
+    Returns:
+        set[str]: head revision ids, empty if the scripts are not shipped
+    """
+    if not ini_path.exists():
+        return set()
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(Config(str(ini_path))).get_heads())
+
+
+def get_database_heads(connection: Connection) -> set[str]:
+    """
+    reads the revisions stamped in the alembic_version table
+
+    Args:
+        connection: sync connection, eg: from AsyncConnection.run_sync
+
+    Returns:
+        set[str]: stamped revision ids, empty if alembic never ran
+    """
+    from alembic.runtime.migration import MigrationContext
+
+    return set(MigrationContext.configure(connection).get_current_heads())
+
+
+async def schema_at_head(engine: AsyncEngine, ini_path: Path = ALEMBIC_INI) -> bool:
+    """
+    checks whether migrations already brought the database up to date, in
+    which case create_all has nothing to do
+
+    Args:
+        engine: database engine
+        ini_path: alembic.ini of the deployed migrations
+
+    Returns:
+        bool: True if the database is stamped with every script head
+    """
+    try:
+        script_heads = get_script_heads(ini_path=ini_path)
+        if not script_heads:
+            logger.warning(f"No migration scripts at {ini_path}")
+            return False
+        async with engine.connect() as conn:
+            database_heads = await conn.run_sync(get_database_heads)
+    except Exception as e:
+        logger.warning(f"Could not compare schema with alembic head: {e}")
+        return False
+    return database_heads == script_heads
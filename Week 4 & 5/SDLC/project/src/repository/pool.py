@@ -0,0 +1,127 @@
+from threading import Lock
+from time import perf_counter
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class PoolMetrics:
+    """Running counters for connection pool checkouts.
+
+    Attributes:
+        checkouts: Number of successful connection checkouts.
+        timeouts: Number of checkouts that gave up after pool_timeout.
+        total_wait: Accumulated seconds spent waiting for a connection.
+        max_wait: Longest single wait in seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize all counters to zero."""
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Reset all counters to zero."""
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.total_wait: float = 0.0
+        self.max_wait: float = 0.0
+
+    def record_checkout(self, wait: float, timed_out: bool = False) -> None:
+        """Record a single checkout attempt.
+
+        Args:
+            wait: Seconds spent waiting on the pool.
+            timed_out: True if the checkout raised a pool timeout.
+        """
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return wait statistics in milliseconds.
+
+        Returns:
+            Dictionary with checkout count, timeouts, and avg/max wait.
+        """
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3)
+                if attempts
+                else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that times how long each checkout waits."""
+
+    def _do_get(self):
+        """Check out a connection and record the time spent waiting for it.
+
+        Returns:
+            Pool entry for the checked out connection.
+
+        Raises:
+            sqlalchemy.exc.TimeoutError: If no connection frees up within
+                pool_timeout.
+        """
+        start = perf_counter()
+        try:
+            entry = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.record_checkout(wait=perf_counter() - start, timed_out=True)
+            logger.warning(f"Pool checkout timed out: {self.status()}")
+            raise
+        pool_metrics.record_checkout(wait=perf_counter() - start)
+        return entry
+
+
+def get_pool_status(engine: AsyncEngine) -> dict[str, Any]:
+    """Collect current pool occupancy and checkout wait statistics.
+
+    Args:
+        engine: Async engine whose pool should be inspected.
+
+    Returns:
+        Dictionary with pool size, checked out, idle and overflow counts
+        merged with the wait statistics from pool_metrics.
+    """
+    pool = engine.sync_engine.pool
+    status: dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            }
+        )
+    status.update(pool_metrics.snapshot())
+    return status
+
+
+def log_pool_status(engine: AsyncEngine) -> None:
+    """Log a single structured line with the current pool status.
+
+    Args:
+        engine: Async engine whose pool should be logged.
+    """
+    logger.info("Connection pool status", **get_pool_status(engine=engine))
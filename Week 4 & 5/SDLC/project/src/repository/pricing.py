@@ -0,0 +1,107 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+
+from sqlalchemy import ColumnElement, Float, Numeric, and_, case, cast, func, or_, true
+
+from src.core.log import get_logger
+from src.models.product import Product
+
+logger = get_logger(__name__)
+
+# price_type written for each rule kind, same values as apply_discount_or_tax
+PRICE_TYPES = {"tax": "taxed", "discount": "discounted"}
+
+# compiled rule sets kept in memory, repeated previews/applies skip compiling
+RULE_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class PricingRule:
+    """
+    one declarative price adjustment, hashable so rule sets can be cached
+
+    Attributes:
+        kind: tax or discount
+        rate: fraction added (tax) or removed (discount), eg: 0.2
+        category_id: only products of this category, None for all
+        min_price: only products priced at or above this, None for no bound
+        max_price: only products priced below this, None for no bound
+    """
+
+    kind: str
+    rate: float
+    category_id: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+
+    @property
+    def factor(self) -> float:
+        """multiplier applied to the price when the rule matches"""
+        return 1 + self.rate if self.kind == "tax" else 1 - self.rate
+
+
+@dataclass(frozen=True)
+class CompiledRules:
+    """
+    SQL expressions for a rule set, usable in both SELECT and UPDATE
+
+    Attributes:
+        price: new price, rounded to cents
+        price_type: kind of the last matching rule, unchanged if none match
+        matches: true for products at least one rule applies to
+    """
+
+    price: ColumnElement
+    price_type: ColumnElement
+    matches: ColumnElement
+
+
+def get_rule_condition(rule: PricingRule) -> ColumnElement:
+    """
+    builds the WHERE condition of a rule; ranges compare the price before
+    any rule is applied, so rule order does not change which rules match
+
+    Args:
+        rule: pricing rule
+
+    Returns:
+        ColumnElement: boolean expression over product columns
+    """
+    conditions = []
+    if rule.category_id is not None:
+        conditions.append(Product.category_id == rule.category_id)
+    if rule.min_price is not None:
+        conditions.append(Product.price >= rule.min_price)
+    if rule.max_price is not None:
+        conditions.append(Product.price < rule.max_price)
+    return and_(true(), *conditions)
+
+
+@lru_cache(maxsize=RULE_CACHE_SIZE)
+def compile_rules(rules: tuple[PricingRule, ...]) -> CompiledRules:
+    """
+    compiles a rule set into CASE expressions, so every matching product is
+    repriced by one statement instead of one decorator chain per object
+
+    Args:
+        rules: rules applied in order, factors of matching rules multiply
+
+    Returns:
+        CompiledRules: price, price_type and match expressions
+    """
+    conditions = [get_rule_condition(rule=rule) for rule in rules]
+    price = Product.price
+    for rule, condition in zip(rules, conditions):
+        price = price * case((condition, rule.factor), else_=1.0)
+    # numeric round is portable, postgres has no round(double precision, int)
+    rounded = func.round(cast(price, Numeric), 2, type_=Float)
+    price_type = case(
+        *[
+            (condition, PRICE_TYPES[rule.kind])
+            for rule, condition in reversed(list(zip(rules, conditions)))
+        ],
+        else_=Product.price_type,
+    )
+    logger.debug(f"Compiled pricing rule set of {len(rules)} rules")
+    return CompiledRules(price=rounded, price_type=price_type, matches=or_(*conditions))
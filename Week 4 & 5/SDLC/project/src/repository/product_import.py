@@ -0,0 +1,168 @@
+from time import time
+from typing import Iterable, Optional
+
+from sqlalchemy import Insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.log import get_logger
+from src.models.category import Category
+from src.models.import_job import ImportJob
+from src.models.product import Product
+from src.repository.change_log import UPSERT, record_changes
+from src.repository.invalidation import PRODUCT_SCOPE, queue_invalidations
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# insert constructs supporting ON CONFLICT, by dialect name
+UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def get_upsert_stmt(records: list[dict], dialect_name: str) -> Insert:
+    """
+    builds one INSERT ... ON CONFLICT (id) DO UPDATE for a batch; updated
+    rows get a new version, like any other write
+
+    Args:
+        records: product values by column, one per distinct id
+        dialect_name: name of the session's dialect
+
+    Returns:
+        Insert: upsert returning the written ids
+    """
+    stmt = UPSERT_INSERTS[dialect_name](Product).values(records)
+    return stmt.on_conflict_do_update(
+        index_elements=[Product.id],
+        set_={
+            "name": stmt.excluded.name,
+            "quantity": stmt.excluded.quantity,
+            "price": stmt.excluded.price,
+            "category_id": stmt.excluded.category_id,
+            "version": Product.version + 1,
+        },
+    ).returning(Product.id)
+
+
+async def upsert_products(records: list[dict], db: AsyncSession) -> list[int]:
+    """
+    writes a batch of products in one statement, in the caller's transaction,
+    with the change log and cache invalidation the ORM hooks would maintain
+
+    Args:
+        records: product values by column, one per distinct id
+        db: sqlalchemy db object
+
+    Returns:
+        list[int]: ids of the inserted or updated products
+    """
+    stmt = get_upsert_stmt(records=records, dialect_name=db.bind.dialect.name)
+    product_ids = (await db.execute(stmt)).scalars().all()
+    await record_changes(
+        table_name=Product.__tablename__,
+        row_ids=product_ids,
+        operation=UPSERT,
+        db=db,
+    )
+    queue_invalidations(session=db, scope=PRODUCT_SCOPE, keys=product_ids)
+    return product_ids
+
+
+async def get_category_ids(names: Iterable[str], db: AsyncSession) -> dict[str, int]:
+    """
+    resolves category names to ids, creating the missing categories
+
+    Args:
+        names: category names used by the batch
+        db: sqlalchemy db object
+
+    Returns:
+        dict: category name -> id
+    """
+    names = set(names)
+    stmt = select(Category.name, Category.id).where(Category.name.in_(names))
+    category_ids = {row.name: row.id for row in await db.execute(stmt)}
+    missing = sorted(names - category_ids.keys())
+    if missing:
+        categories = [Category(name=name) for name in missing]
+        for category in categories:
+            db.add(category)
+        await db.flush()
+        category_ids.update({category.name: category.id for category in categories})
+        logger.info(f"Created categories {missing}")
+    return category_ids
+
+
+async def create_import_job(user_email: str, db: AsyncSession) -> ImportJob:
+    """
+    adds a pending import job and commits it, so its status can be read
+    before the import starts
+
+    Args:
+        user_email: user who uploaded the file
+        db: sqlalchemy db object
+
+    Returns:
+        ImportJob: the new job
+    """
+    now = time()
+    job = ImportJob(
+        status=PENDING,
+        user_email=user_email,
+        rows_read=0,
+        rows_imported=0,
+        rows_failed=0,
+        errors=[],
+        created_at=now,
+        updated_at=now,
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_import_job(job_id: int, db: AsyncSession) -> Optional[ImportJob]:
+    """
+    reads an import job
+
+    Args:
+        job_id: import job id
+        db: sqlalchemy db object
+
+    Returns:
+        ImportJob | None: the job, None if it does not exist
+    """
+    return await db.get(ImportJob, job_id)
+
+
+async def fail_stale_import_jobs(stale_before: float, db: AsyncSession) -> int:
+    """
+    marks running jobs whose worker stopped as failed; a running import
+    bumps updated_at with every batch, so one that has not for a while is
+    no longer being imported
+
+    Args:
+        stale_before: unix timestamp, jobs last updated before it are stale
+        db: sqlalchemy db object
+
+    Returns:
+        int: number of failed jobs
+    """
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.status == RUNNING, ImportJob.updated_at < stale_before)
+        .values(
+            status=FAILED,
+            message="import stopped before it finished, upload the file again",
+            updated_at=time(),
+        )
+    )
+    await db.commit()
+    if result.rowcount:
+        logger.warning(f"Failed {result.rowcount} stale import jobs")
+    return result.rowcount
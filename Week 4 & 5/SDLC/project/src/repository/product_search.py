@@ -0,0 +1,187 @@
+import re
+from difflib import SequenceMatcher
+
+from sqlalchemy import case, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.log import get_logger
+from src.models.product import SEARCH_CONFIG, Product
+
+logger = get_logger(__name__)
+
+# minimum SequenceMatcher ratio for the sqlite typo fallback
+FUZZY_CUTOFF = 0.6
+
+SQLITE_FTS_SEARCH = text(
+    "SELECT product.id AS id, "
+    "(product.name LIKE :prefix ESCAPE '\\') - bm25(product_fts) AS score "
+    "FROM product_fts JOIN product ON product.id = product_fts.rowid "
+    "WHERE product_fts MATCH :match "
+    "ORDER BY score DESC, product.id LIMIT :limit OFFSET :offset"
+)
+SQLITE_FTS_ANY = text(
+    "SELECT 1 FROM product_fts WHERE product_fts MATCH :match LIMIT 1"
+)
+
+
+def get_search_tokens(query: str) -> list[str]:
+    """
+    splits a search query into lowercase word tokens, dropping any
+    characters that carry meaning in tsquery or FTS5 syntax
+
+    Args:
+        query: raw search text
+
+    Returns:
+        list[str]: tokens
+    """
+    return re.findall(r"\w+", query.lower())
+
+
+def escape_like(value: str) -> str:
+    """
+    escapes LIKE wildcards so user input only matches literally
+
+    Args:
+        value: raw text
+
+    Returns:
+        str: text safe to use in a LIKE pattern with ESCAPE '\\'
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_products_postgres(
+    query: str, tokens: list[str], limit: int, offset: int, db: AsyncSession
+) -> list[tuple[Product, float]]:
+    """
+    ranks products by name prefix, full-text prefix match and trigram
+    similarity in one query served by the GIN indexes
+
+    Args:
+        query: raw search text
+        tokens: query tokens
+        limit: page size
+        offset: rows to skip
+        db: sqlalchemy db object
+
+    Returns:
+        list[tuple[Product, float]]: products with their score, best first
+    """
+    document = func.to_tsvector(SEARCH_CONFIG, Product.name)
+    ts_query = func.to_tsquery(
+        SEARCH_CONFIG, " & ".join(f"{token}:*" for token in tokens)
+    )
+    prefix = Product.name.ilike(f"{escape_like(query)}%", escape="\\")
+    score = (
+        case((prefix, 1.0), else_=0.0)
+        + func.ts_rank(document, ts_query)
+        + func.similarity(Product.name, query)
+    ).label("score")
+    stmt = (
+        select(Product, score)
+        .where(or_(document.op("@@")(ts_query), Product.name.op("%")(query), prefix))
+        .order_by(score.desc(), Product.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    result = await db.execute(stmt)
+    return [(product, float(score)) for product, score in result.all()]
+
+
+async def search_products_sqlite(
+    query: str, tokens: list[str], limit: int, offset: int, db: AsyncSession
+) -> list[tuple[Product, float]]:
+    """
+    ranks products with the FTS5 index (bm25 plus a name prefix boost); if
+    nothing matches at all, falls back to fuzzy matching over product names
+
+    The fallback scans every name, which is fine for the sqlite test and
+    local setup; postgres uses pg_trgm instead.
+
+    Args:
+        query: raw search text
+        tokens: query tokens
+        limit: page size
+        offset: rows to skip
+        db: sqlalchemy db object
+
+    Returns:
+        list[tuple[Product, float]]: products with their score, best first
+    """
+    match = " ".join(f'"{token}"*' for token in tokens)
+    result = await db.execute(
+        SQLITE_FTS_SEARCH.bindparams(
+            prefix=f"{escape_like(query)}%", match=match, limit=limit, offset=offset
+        )
+    )
+    scores = {row.id: row.score for row in result}
+
+    if not scores:
+        any_match = await db.execute(SQLITE_FTS_ANY.bindparams(match=match))
+        if any_match.first() is None:
+            scores = await fuzzy_search_sqlite(
+                query=query, limit=limit, offset=offset, db=db
+            )
+
+    if not scores:
+        return []
+    products = await db.execute(select(Product).where(Product.id.in_(scores)))
+    by_id = {product.id: product for product in products.scalars()}
+    return [(by_id[product_id], float(score)) for product_id, score in scores.items()]
+
+
+async def fuzzy_search_sqlite(
+    query: str, limit: int, offset: int, db: AsyncSession
+) -> dict[int, float]:
+    """
+    typo tolerant fallback: ranks every product name by SequenceMatcher ratio
+
+    Args:
+        query: raw search text
+        limit: page size
+        offset: rows to skip
+        db: sqlalchemy db object
+
+    Returns:
+        dict[int, float]: product id -> ratio for the requested page, best first
+    """
+    logger.debug(f"No full-text match for '{query}', using fuzzy fallback")
+    names = await db.execute(select(Product.id, Product.name))
+    ratios = [
+        (SequenceMatcher(None, query.lower(), name.lower()).ratio(), product_id)
+        for product_id, name in names
+    ]
+    ranked = sorted(
+        (pair for pair in ratios if pair[0] >= FUZZY_CUTOFF),
+        key=lambda pair: (-pair[0], pair[1]),
+    )
+    return {product_id: ratio for ratio, product_id in ranked[offset : offset + limit]}
+
+
+async def search_products(
+    query: str, limit: int, offset: int, db: AsyncSession
+) -> list[tuple[Product, float]]:
+    """
+    prefix, full-text and typo tolerant product name search, ranked and
+    paginated, using whichever index the connected database provides
+
+    Args:
+        query: raw search text
+        limit: page size
+        offset: rows to skip
+        db: sqlalchemy db object
+
+    Returns:
+        list[tuple[Product, float]]: products with their score, best first
+    """
+    tokens = get_search_tokens(query=query)
+    if not tokens:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        search = search_products_postgres
+    else:
+        search = search_products_sqlite
+    return await search(
+        query=query.strip(), tokens=tokens, limit=limit, offset=offset, db=db
+    )
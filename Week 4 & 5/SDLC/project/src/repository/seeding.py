@@ -0,0 +1,299 @@
+import argparse
+import asyncio
+import json
+from csv import DictReader
+from itertools import islice
+from time import perf_counter
+from typing import Any, Iterable, Iterator, Optional
+
+from inventory_manager import ProductTypes
+from inventory_manager.src.model import BaseProduct, ProductFactory
+from inventory_manager.src.utility import ProductDetails, convert_to_bool
+from pydantic import ValidationError
+from sqlalchemy import exists, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.config import settings
+from src.core.exceptions import DatabaseException
+from src.core.log import get_logger
+from src.models.category import Category
+from src.models.product import Product
+from src.repository.category_summary import refresh_category_summary
+from src.repository.database import engine
+from src.repository.utility import get_integer_product_id
+
+logger = get_logger(__name__)
+
+PRODUCT_COLUMNS = ("id", "name", "quantity", "price", "category_id")
+
+# header of the inventory csv (new_inventory.csv)
+CSV_COLUMNS = (
+    "product_id",
+    "product_name",
+    "quantity",
+    "price",
+    "type",
+    "days_to_expire",
+    "is_vegetarian",
+    "warranty_period_in_years",
+)
+
+
+def read_category_names(csv_filepath: str) -> list[str]:
+    """
+    scans the type column of the inventory csv and returns the known
+    product types that appear in it, sorted so ids are stable across runs
+
+    Args:
+        csv_filepath: path to inventory csv
+
+    Returns:
+        list[str]: category names
+    """
+    known_types = set(ProductTypes.get_values())
+    with open(csv_filepath, "r", newline="") as csv_file:
+        found_types = {row["type"] for row in DictReader(csv_file)}
+    return sorted(found_types & known_types)
+
+
+def create_product(row: dict[str, Any], factory: ProductFactory) -> BaseProduct | None:
+    """
+    validates a csv row with the inventory_manager product models
+
+    Args:
+        row: csv row as dict, with every column of CSV_COLUMNS
+        factory: inventory_manager product factory
+
+    Returns:
+        BaseProduct | None: product model, None if the type has no model
+
+    Raises:
+        ValidationError: if the row is invalid
+    """
+    return factory.create_product(
+        product_details=ProductDetails(
+            id=row["product_id"],
+            name=row["product_name"],
+            type=row["type"],
+            quantity=row["quantity"],
+            price=row["price"],
+            days_to_expire=row["days_to_expire"],
+            is_vegetarian=convert_to_bool(data=row["is_vegetarian"]),
+            warranty_period_in_years=row["warranty_period_in_years"],
+        )
+    )
+
+
+def build_product(row: dict[str, Any], factory: ProductFactory) -> BaseProduct | None:
+    """
+    validates a csv row, logging and skipping it if invalid
+
+    Args:
+        row: csv row as dict
+        factory: inventory_manager product factory
+
+    Returns:
+        BaseProduct | None: product model, None if the row is invalid
+    """
+    try:
+        return create_product(row=row, factory=factory)
+    except ValidationError as e:
+        logger.warning(
+            f"Skipping product {row.get('product_id')}: {e.errors()[0]['msg']}"
+        )
+        return None
+
+
+def iter_product_records(
+    csv_filepath: str, category_ids: dict[str, int]
+) -> Iterator[tuple]:
+    """
+    streams valid products from the inventory csv as COPY records, one row
+    in memory at a time; only the ids seen so far are kept, so a repeated
+    id is skipped instead of aborting the COPY
+
+    Args:
+        csv_filepath: path to inventory csv
+        category_ids: category name -> category id
+
+    Yields:
+        tuple: values in PRODUCT_COLUMNS order
+    """
+    factory = ProductFactory()
+    seen_ids: set[int] = set()
+    with open(csv_filepath, "r", newline="") as csv_file:
+        for row in DictReader(csv_file):
+            product = build_product(row=row, factory=factory)
+            if product is None:
+                continue
+            product_id = get_integer_product_id(product_id=product.product_id)
+            if product_id in seen_ids:
+                logger.warning(f"Skipping repeated product {product.product_id}")
+                continue
+            seen_ids.add(product_id)
+            yield (
+                product_id,
+                product.product_name,
+                product.quantity,
+                product.price,
+                category_ids[product.type.value],
+            )
+
+
+def chunked(records: Iterable[tuple], size: int) -> Iterator[list[tuple]]:
+    """
+    splits an iterable into lists of at most size items
+
+    Args:
+        records: iterable to split
+        size: maximum chunk length
+
+    Yields:
+        list[tuple]: next chunk
+    """
+    iterator = iter(records)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+async def is_database_empty(connection: AsyncConnection) -> bool:
+    """
+    checks no category or product exists yet
+
+    Args:
+        connection: open connection
+
+    Returns:
+        bool: True if both tables are empty
+    """
+    stmt = select(
+        ~exists().where(Category.id.is_not(None)),
+        ~exists().where(Product.id.is_not(None)),
+    )
+    return all((await connection.execute(stmt)).one())
+
+
+async def insert_categories(
+    names: list[str], connection: AsyncConnection
+) -> dict[str, int]:
+    """
+    inserts the categories and reads back the ids the database gave them
+
+    Args:
+        names: category names
+        connection: open connection inside the seeding transaction
+
+    Returns:
+        dict: category name -> category id
+    """
+    if not names:
+        return {}
+    stmt = insert(Category.__table__).returning(Category.name, Category.id)
+    result = await connection.execute(stmt, [{"name": name} for name in names])
+    return {row.name: row.id for row in result}
+
+
+async def reset_sequences(connection: AsyncConnection) -> None:
+    """
+    moves the product and product_category id sequences past the seeded ids
+
+    Args:
+        connection: open connection inside the seeding transaction
+    """
+    for tablename in ("product", "product_category"):
+        await connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{tablename}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {tablename}), 1), true);"
+            )
+        )
+
+
+async def seed_db_bulk(
+    csv_filepath: Optional[str] = None, chunk_size: Optional[int] = None
+) -> dict[str, Any]:
+    """Seed the database from the inventory CSV using COPY.
+
+    Unlike seed_db, the CSV is never fully loaded: products are validated and
+    streamed to Postgres with asyncpg's copy_records_to_table in chunks of
+    chunk_size rows, all within one transaction. Only an empty database is
+    seeded, so the copied ids cannot collide with existing rows.
+
+    Args:
+        csv_filepath: Inventory CSV, defaults to settings.INVENTORY_CSV_FILEPATH.
+        chunk_size: Rows per COPY, defaults to settings.SEED_CHUNK_SIZE.
+
+    Returns:
+        Dictionary with category and product counts, elapsed seconds and
+        products per second.
+
+    Raises:
+        DatabaseException: If the database is not empty, or any COPY or the
+            sequence reset fails.
+    """
+    csv_filepath = csv_filepath or settings.INVENTORY_CSV_FILEPATH
+    chunk_size = chunk_size or settings.SEED_CHUNK_SIZE
+    start = perf_counter()
+
+    category_names = read_category_names(csv_filepath=csv_filepath)
+    product_count = 0
+
+    try:
+        async with engine.begin() as connection:
+            if not await is_database_empty(connection=connection):
+                raise DatabaseException(
+                    message="Bulk seeding needs an empty database",
+                    field_errors=[
+                        {"field": "product", "message": "Database is not empty"}
+                    ],
+                )
+            # going through SQLAlchemy first opens the transaction COPY joins
+            category_ids = await insert_categories(
+                names=category_names, connection=connection
+            )
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+
+            records = iter_product_records(
+                csv_filepath=csv_filepath, category_ids=category_ids
+            )
+            for chunk in chunked(records=records, size=chunk_size):
+                await driver_connection.copy_records_to_table(
+                    "product", records=chunk, columns=PRODUCT_COLUMNS
+                )
+                product_count += len(chunk)
+                logger.info(f"Copied {product_count} products")
+
+            await reset_sequences(connection=connection)
+            if settings.CATEGORY_SUMMARY_MATERIALIZED:
+                # COPY bypasses the ORM hooks that maintain the summary
+                await refresh_category_summary(db=connection)
+    except DatabaseException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk seeding failed: {str(e)}")
+        raise DatabaseException(
+            message="Failed to bulk seed database",
+            field_errors=[{"field": "product", "message": f"Seeding failed: {str(e)}"}],
+        )
+
+    elapsed = perf_counter() - start
+    stats = {
+        "categories": len(category_ids),
+        "products": product_count,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(product_count / elapsed, 1) if elapsed else 0.0,
+    }
+    logger.info("Bulk seeding finished", **stats)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk seed the inventory database")
+    parser.add_argument("csv_filepath", nargs="?", default=None)
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+    result = asyncio.run(
+        seed_db_bulk(csv_filepath=args.csv_filepath, chunk_size=args.chunk_size)
+    )
+    print(json.dumps(result))
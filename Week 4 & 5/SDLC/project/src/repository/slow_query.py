@@ -0,0 +1,150 @@
+import random
+import re
+from time import perf_counter
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.config import settings
+from src.core.log import correlation_id, get_logger
+from src.core.work_queue import work_queue
+
+logger = get_logger(__name__)
+
+# longest parameter repr written to the log
+MAX_PARAMETERS_LENGTH = 1000
+
+# statements on tables holding credentials or personal data, their
+# parameters (eg: password hashes, emails) are never logged
+SENSITIVE_TABLE = re.compile(r'\b(?:FROM|INTO|UPDATE|JOIN)\s+"?user"?(?:\s|$)', re.I)
+REDACTED = "[redacted]"
+
+
+def format_parameters(statement: str, parameters: Any) -> Optional[str]:
+    """
+    renders statement parameters for the log, truncated so a bulk insert
+    does not flood it
+
+    Args:
+        statement: SQL statement the parameters belong to
+        parameters: DBAPI parameters, a tuple, dict or list of them
+
+    Returns:
+        str | None: repr of the parameters, None if they are not logged
+    """
+    if not settings.SLOW_QUERY_LOG_PARAMETERS:
+        return None
+    if SENSITIVE_TABLE.search(statement):
+        return REDACTED
+    rendered = repr(parameters)
+    if len(rendered) > MAX_PARAMETERS_LENGTH:
+        return rendered[:MAX_PARAMETERS_LENGTH] + "..."
+    return rendered
+
+
+def should_explain(statement: str, dialect_name: str) -> bool:
+    """
+    picks the slow statements worth an EXPLAIN (ANALYZE, BUFFERS); ANALYZE
+    runs the statement again, so only postgres SELECTs are sampled
+
+    Args:
+        statement: slow SQL statement
+        dialect_name: dialect it ran on
+
+    Returns:
+        bool: True if a plan should be captured
+    """
+    rate = settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    return (
+        rate > 0
+        and dialect_name == "postgresql"
+        and statement.lstrip()[:6].upper() == "SELECT"
+        and random.random() < rate
+    )
+
+
+async def explain_statement(
+    engine: AsyncEngine, statement: str, parameters: Any, request_id: str
+) -> None:
+    """
+    logs the plan of a slow statement, on its own connection and in a
+    transaction that is rolled back
+
+    Args:
+        engine: engine the statement ran on
+        statement: slow SQL statement
+        parameters: its DBAPI parameters
+        request_id: correlation id of the request that ran it
+    """
+    try:
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+            )
+            plan = "\n".join(row[0] for row in result)
+            await conn.rollback()
+    except Exception as e:
+        # not raised: the work queue would retry, running the query again
+        logger.warning(f"EXPLAIN of slow query failed: {e}")
+        return
+    token = correlation_id.set(request_id)
+    try:
+        logger.warning("Slow query plan", statement=statement, plan=plan)
+    finally:
+        correlation_id.reset(token)
+
+
+def install_slow_query_log(engine: AsyncEngine) -> None:
+    """
+    times every statement the engine runs; ones slower than
+    SLOW_QUERY_THRESHOLD_MS are logged with their parameters, and a sample
+    of them has its plan captured in the background
+
+    Args:
+        engine: engine to instrument
+    """
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start_timer(
+        conn: Connection, cursor, statement, parameters, context, executemany
+    ) -> None:
+        """
+        stamps the execution context, which a failed statement discards
+        """
+        context.slow_query_start = perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def log_slow_query(
+        conn: Connection, cursor, statement, parameters, context, executemany
+    ) -> None:
+        """
+        logs the statement if it crossed the threshold, 0 disables the log;
+        EXPLAIN statements are skipped so a captured plan never asks for
+        another
+        """
+        threshold = settings.SLOW_QUERY_THRESHOLD_MS
+        elapsed_ms = (perf_counter() - context.slow_query_start) * 1000
+        if threshold <= 0 or elapsed_ms < threshold:
+            return
+        if statement.startswith("EXPLAIN"):
+            return
+        logger.warning(
+            "Slow query",
+            statement=statement,
+            parameters=format_parameters(statement=statement, parameters=parameters),
+            elapsed_ms=round(elapsed_ms, 1),
+            executemany=executemany,
+        )
+        if not executemany and should_explain(
+            statement=statement, dialect_name=conn.dialect.name
+        ):
+            work_queue.submit(
+                "explain-slow-query",
+                explain_statement,
+                engine=engine,
+                statement=statement,
+                parameters=parameters,
+                request_id=correlation_id.get(),
+            )
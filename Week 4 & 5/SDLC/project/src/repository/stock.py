@@ -0,0 +1,96 @@
+from collections import defaultdict
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.log import get_logger
+from src.models.product import Product
+from src.repository.category_summary import apply_summary_deltas
+from src.repository.change_log import UPSERT, record_changes
+from src.repository.invalidation import PRODUCT_SCOPE, queue_invalidations
+
+logger = get_logger(__name__)
+
+
+def merge_lines(lines: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """
+    sums repeated products and sorts by product id, so concurrent
+    multi-line reservations always lock product rows in the same order
+    and cannot deadlock
+
+    Args:
+        lines: (product_id, quantity) pairs
+
+    Returns:
+        list[tuple[int, int]]: one pair per product, ascending product id
+    """
+    merged: dict[int, int] = defaultdict(int)
+    for product_id, quantity in lines:
+        merged[product_id] += quantity
+    return sorted(merged.items())
+
+
+async def adjust_stock(
+    lines: Iterable[tuple[int, int]], reserve: bool, db: AsyncSession
+) -> tuple[dict[int, int], Optional[int]]:
+    """
+    moves stock for every line with one conditional UPDATE ... RETURNING
+    per product, without reading the row first
+
+    A reservation only matches while quantity >= n, so two racing
+    checkouts can never oversell: the loser's UPDATE matches no row once
+    the row lock is released. Stops at the first line that fails; the
+    caller rolls back so a multi-line reservation is all or nothing.
+
+    Args:
+        lines: (product_id, quantity) pairs
+        reserve: True to take stock, False to put it back
+        db: sqlalchemy db object, committed or rolled back by the caller
+
+    Returns:
+        tuple: (product_id -> remaining quantity, id of the failed product
+        or None)
+    """
+    remaining: dict[int, int] = {}
+    deltas: dict[int, list] = defaultdict(lambda: [0, 0, 0.0])
+    for product_id, quantity in merge_lines(lines=lines):
+        change = -quantity if reserve else quantity
+        stmt = (
+            update(Product)
+            .where(Product.id == product_id)
+            .values(quantity=Product.quantity + change, version=Product.version + 1)
+            .returning(Product.quantity, Product.category_id, Product.price)
+            .execution_options(synchronize_session=False)
+        )
+        if reserve:
+            stmt = stmt.where(Product.quantity >= quantity)
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            return remaining, product_id
+        remaining[product_id] = row.quantity
+        delta = deltas[row.category_id]
+        delta[1] += change
+        delta[2] += change * row.price
+
+    # shared rows last, so they are locked only until the caller commits
+    await record_changes(
+        table_name=Product.__tablename__, row_ids=remaining, operation=UPSERT, db=db
+    )
+    queue_invalidations(session=db, scope=PRODUCT_SCOPE, keys=remaining)
+    await apply_summary_deltas(deltas=deltas, db=db)
+    return remaining, None
+
+
+async def get_stock_quantity(product_id: int, db: AsyncSession) -> Optional[int]:
+    """
+    reads a product's current quantity
+
+    Args:
+        product_id: product id
+        db: sqlalchemy db object
+
+    Returns:
+        int | None: quantity, None if the product does not exist
+    """
+    return await db.scalar(select(Product.quantity).where(Product.id == product_id))
@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Optional
+
+from src.core.config import settings
+from src.core.invalidation import invalidation_bus
+from src.models.user import User
+from src.repository.invalidation import USER_SCOPE
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Detached snapshot of a user row, safe to share between sessions.
+
+    Attributes:
+        id: User's id.
+        name: User's name.
+        email: User's email, the cache key.
+        role: User's role.
+        password: Password hash, checked on login.
+    """
+
+    id: int
+    name: str
+    email: str
+    role: str
+    password: str
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        """Copy the columns of a loaded user.
+
+        Args:
+            user: User read from the database.
+
+        Returns:
+            CachedUser: snapshot of its columns
+        """
+        return cls(
+            id=user.id,
+            name=user.name,
+            email=user.email,
+            role=user.role,
+            password=user.password,
+        )
+
+
+class UserCache:
+    """Bounded LRU cache of users by email, with a time to live.
+
+    Logins and registration checks read users by email; the cache answers
+    repeated lookups without a query. Commits writing a user drop its entry
+    through the invalidation bus, on this worker and on every other one, and
+    the TTL bounds staleness should a notification be lost.
+
+    A lookup that missed reads the database before storing its result; a
+    write committed meanwhile bumps the generation, and the stale result is
+    then not stored.
+
+    Attributes:
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to query the database.
+        generation: Number of invalidations applied.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: Maximum number of users to keep, 0 disables the cache.
+            ttl: Seconds an entry is served for.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[CachedUser, float]] = OrderedDict()
+
+    def get(self, email: str) -> CachedUser | None:
+        """Look up a user.
+
+        Args:
+            email: User's email.
+
+        Returns:
+            CachedUser: cached user if present and not expired, else None
+        """
+        entry = self._entries.get(email)
+        if entry is None or entry[1] <= monotonic():
+            self._entries.pop(email, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(email)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, user: CachedUser, generation: int) -> None:
+        """Store a user, evicting the least recently used entry.
+
+        Args:
+            user: Snapshot to keep.
+            generation: Value of generation before the user was read; the
+                user is dropped if an invalidation happened since.
+        """
+        if self.maxsize <= 0 or generation != self.generation:
+            return
+        self._entries[user.email] = (user, monotonic() + self.ttl)
+        self._entries.move_to_end(user.email)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, email: Optional[str]) -> None:
+        """Remove a user that was written, on any worker.
+
+        Args:
+            email: User's email, None to remove every user.
+        """
+        self.generation += 1
+        if email is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        """Remove every cached user and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return cache counters.
+
+        Returns:
+            dict: cached users, hits and misses
+        """
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
+invalidation_bus.register(scope=USER_SCOPE, handler=user_cache.discard)
@@ -9,11 +9,11 @@ from src.repository.database import (
     add_commit_refresh_db,
     commit_refresh_db,
     delete_commit_db,
-    hash_password,
-    verify_password,
 )
+from src.repository.user_cache import CachedUser, user_cache
 from src.schema.user import UserEdit, UserRegister
 from src.services.models import ResponseStatus
+from src.services.password_service import password_service
 
 logger = get_logger(__name__)
 
@@ -64,6 +64,20 @@ class UserRepository(AbstractUserRepository):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def fetch_users_page(self, limit: int, offset: int) -> list[User]:
+        """Retrieves one page of users, ordered by id.
+
+        Args:
+            limit: Maximum number of users to return.
+            offset: Number of users to skip.
+
+        Returns:
+            A list of at most limit User objects.
+        """
+        stmt = select(User).order_by(User.id).limit(limit).offset(offset)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
     async def create_user(self, user: UserRegister) -> User:
         """Hashes the password and persists a new user to the database.
 
@@ -76,7 +90,7 @@ class UserRepository(AbstractUserRepository):
         db_user = User(
             name=user.name,
             email=user.email,
-            password=hash_password(user.password),
+            password=await password_service.hash(password=user.password),
             role=user.role.value,
         )
 
@@ -94,7 +108,7 @@ class UserRepository(AbstractUserRepository):
         Returns:
             True if the email exists, False otherwise.
         """
-        existing_user = await self.fetch_user_by_email(email_id=user.email)
+        existing_user = await self.fetch_cached_user_by_email(email_id=user.email)
         return True if existing_user else False
 
     async def fetch_user_by_email(self, email_id: str) -> User | None:
@@ -111,27 +125,49 @@ class UserRepository(AbstractUserRepository):
         result = await self.session.execute(stmt)
         return result.scalars().first()
 
-    async def authenticate_user(self, email: str, password: str) -> User | None:
-        """Verifies user credentials against the database.
+    async def fetch_cached_user_by_email(self, email_id: str) -> CachedUser | None:
+        """Retrieves a read-only snapshot of a user by their email.
+
+        Served from the user cache when possible; commits writing the user
+        drop its entry, so update_user and delete_user are seen at once. Use
+        fetch_user_by_email for a user that will be modified.
+
+        Args:
+            email_id: The email address to search for.
+
+        Returns:
+            The CachedUser snapshot if found, otherwise None.
+        """
+        cached_user = user_cache.get(email=email_id)
+        if cached_user is not None:
+            return cached_user
+        generation = user_cache.generation
+        user = await self.fetch_user_by_email(email_id=email_id)
+        if user is None:
+            return None
+        cached_user = CachedUser.from_user(user=user)
+        user_cache.put(user=cached_user, generation=generation)
+        return cached_user
+
+    async def authenticate_user(self, email: str, password: str) -> CachedUser | None:
+        """Verifies user credentials against the stored user.
 
         Args:
             email: The user's email address.
             password: The plain-text password to verify.
 
         Returns:
-            The authenticated User object if credentials are valid, else None.
+            The authenticated user's snapshot if credentials are valid, else None.
         """
         logger.debug(f"Authenticating user: {email}")
 
-        stmt = select(User).filter_by(email=email)
-        result = await self.session.execute(stmt)
-        user = result.scalars().first()
+        user = await self.fetch_cached_user_by_email(email_id=email)
 
         if not user:
             logger.warning(f"Authentication failed: user not found for email: {email}")
             return None
 
-        if not verify_password(
+        if not await password_service.verify(
             plain_password=password, hashed_password=str(user.password)
         ):
             logger.warning(
@@ -173,7 +209,7 @@ class UserRepository(AbstractUserRepository):
         """
         message = self.update_user_name(
             current_user=current_user, update_details=update_details
-        ) + self.update_user_password(
+        ) + await self.update_user_password(
             current_user=current_user, update_details=update_details
         )
         await commit_refresh_db(object=current_user, db=self.session)
@@ -201,9 +237,14 @@ class UserRepository(AbstractUserRepository):
         logger.debug("No name update required - names are identical")
         return "existing name and new name are same. "
 
-    def update_user_password(self, current_user: User, update_details: UserEdit) -> str:
+    async def update_user_password(
+        self, current_user: User, update_details: UserEdit
+    ) -> str:
         """Updates and hashes the user's password if a new one is provided.
 
+        The new password is checked against the stored hash with bcrypt
+        verification, a freshly salted hash never equals the stored one.
+
         Args:
             current_user: The current User database instance.
             update_details: Object containing the potential new password.
@@ -211,11 +252,15 @@ class UserRepository(AbstractUserRepository):
         Returns:
             A message indicating if the password was updated or remained the same.
         """
-        if (
-            update_details.new_password is not None
-            and current_user.password != hash_password(update_details.new_password)
+        if update_details.new_password is not None and not (
+            await password_service.verify(
+                plain_password=update_details.new_password,
+                hashed_password=str(current_user.password),
+            )
         ):
-            current_user.password = hash_password(update_details.new_password)
+            current_user.password = await password_service.hash(
+                password=update_details.new_password
+            )
             logger.info(f"Password updated for user: {current_user.email}")
             return "password updated"
         logger.debug("No password update required")
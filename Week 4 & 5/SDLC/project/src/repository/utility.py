@@ -64,6 +64,7 @@ def get_initial_product_data(products: list, initial_data: dict):
     Returns:
         dict: containing table name as key (eg: product) and list of dict for each product
     """
+    category_ids = get_category_id_lookup(initial_data=initial_data)
     for product in products:
         initial_data["product"].append(
             {
@@ -71,9 +72,7 @@ def get_initial_product_data(products: list, initial_data: dict):
                 "name": product.product_name,
                 "quantity": product.quantity,
                 "price": product.price,
-                "category_id": get_category_id_from_type(
-                    type=product.type.value, initial_data=initial_data
-                ),
+                "category_id": category_ids.get(product.type.value),
             }
         )
 
@@ -93,6 +92,23 @@ def get_integer_product_id(product_id: str) -> int:
     return int(product_id[1:])
 
 
+def get_category_id_lookup(initial_data: dict) -> dict[str, int]:
+    """
+    builds a category name -> id dict so each product resolves its
+    category in O(1) instead of scanning the category list
+
+    Args:
+        initial_data: dict containing all product_category information
+
+    Returns:
+        dict[str, int]: category name to category id
+    """
+    return {
+        category["name"]: category["id"]
+        for category in initial_data["product_category"]
+    }
+
+
 def get_category_id_from_type(type: str, initial_data: dict) -> int | None:
     """
     gets category id for a specific product type (from csv)
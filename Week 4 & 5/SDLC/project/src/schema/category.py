@@ -1,6 +1,6 @@
 from typing import Any, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 from src.services.models import ResponseStatus
 
 
@@ -45,5 +45,22 @@ class CategoryRead(BaseModel):
 
     id: int
     name: str
+    version: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CategorySummaryRead(BaseModel):
+    """
+    Model for per category product count and stock value
+    """
+
+    category_id: int
+    name: str
+    product_count: int
+    total_quantity: int
+    stock_value: float
+
+
+category_read_list = TypeAdapter(list[CategoryRead])
+category_summary_read_list = TypeAdapter(list[CategorySummaryRead])
@@ -0,0 +1,39 @@
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from src.services.models import ResponseStatus
+
+
+class ChangeOperation(str, Enum):
+    """
+    Enum for change feed operations
+
+    Attributes:
+        UPSERT: row was created or updated, data holds its current state
+        DELETE: row was deleted, data is None
+    """
+
+    UPSERT = "upsert"
+    DELETE = "delete"
+
+
+class ChangeRead(BaseModel):
+    """
+    Model for one change feed entry
+    """
+
+    cursor: int
+    table: str
+    id: int
+    operation: ChangeOperation
+    data: Optional[dict[str, Any]] = None
+
+
+class ChangeFeedResponse(BaseModel):
+    """
+    Model for change feed response
+    """
+
+    status: ResponseStatus
+    message: dict[str, Any]
@@ -0,0 +1,73 @@
+from enum import Enum
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field, PositiveFloat, TypeAdapter, model_validator
+from src.services.models import ResponseStatus
+
+
+class PricingRuleKind(str, Enum):
+    """
+    Enum for pricing rule kinds
+
+    Attributes:
+        TAX: adds rate * price
+        DISCOUNT: removes rate * price
+    """
+
+    TAX = "tax"
+    DISCOUNT = "discount"
+
+
+class PricingRuleCreate(BaseModel):
+    """
+    Model for one pricing rule, optionally limited to a category and/or
+    a [min_price, max_price) range
+    """
+
+    kind: PricingRuleKind
+    rate: float = Field(gt=0, lt=1)
+    category_id: Optional[int] = None
+    min_price: Optional[PositiveFloat] = None
+    max_price: Optional[PositiveFloat] = None
+
+    @model_validator(mode="after")
+    def validate_price_range(self) -> "PricingRuleCreate":
+        if (
+            self.min_price is not None
+            and self.max_price is not None
+            and self.min_price > self.max_price
+        ):
+            raise ValueError("min_price must not be greater than max_price")
+        return self
+
+
+class PricingRuleSet(BaseModel):
+    """
+    Model for an ordered list of pricing rules applied together
+    """
+
+    rules: list[PricingRuleCreate] = Field(min_length=1)
+
+
+class PricingChangeRead(BaseModel):
+    """
+    Model for one product's price before and after a rule set
+    """
+
+    id: int
+    name: str
+    old_price: float
+    new_price: float
+    price_type: str
+
+
+class PricingResponse(BaseModel):
+    """
+    Model for pricing response
+    """
+
+    status: ResponseStatus
+    message: dict[str, Any]
+
+
+pricing_change_list = TypeAdapter(list[PricingChangeRead])
@@ -1,4 +1,5 @@
-from typing import Optional
+from enum import Enum
+from typing import Any, Optional
 
 from pydantic import (
     BaseModel,
@@ -6,7 +7,10 @@ from pydantic import (
     Field,
     PositiveFloat,
     PositiveInt,
+    TypeAdapter,
 )
+from src.schema.category import CategoryRead
+from src.services.models import ResponseStatus
 
 
 class BaseProduct(BaseModel):
@@ -56,3 +60,136 @@ class ProductUpdate(BaseModel):
 
 class ProductResponse(BaseProduct):
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductRead(BaseModel):
+    """
+    Model for reading product data (serializable), built only from column
+    attributes so relationships are never lazy loaded. Database generated
+    values are optional since they are unset before the first flush.
+    """
+
+    id: Optional[int] = None
+    name: str
+    quantity: int
+    price: float
+    price_type: Optional[str] = None
+    category_id: int
+    version: Optional[int] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProductDetailRead(ProductRead):
+    """
+    Model for reading a product together with its eagerly loaded category
+    """
+
+    category: Optional[CategoryRead] = None
+
+
+class ProductSearchResult(BaseModel):
+    """
+    Model for one ranked product search hit
+    """
+
+    product: ProductRead
+    score: float
+
+
+class StockLine(BaseModel):
+    """
+    One product and quantity of a stock reservation
+    """
+
+    product_id: int
+    quantity: PositiveInt
+
+
+class StockReservation(BaseModel):
+    """
+    Schema to reserve or release stock of one or more products in a single
+    transaction
+    """
+
+    lines: list[StockLine] = Field(min_length=1)
+
+
+class LowStockRead(BaseModel):
+    """
+    Model for a product under the low-stock threshold
+    """
+
+    id: int
+    name: str
+    quantity: int
+    category_id: int
+
+
+class StockState(str, Enum):
+    """
+    Enum for low-stock transitions
+
+    Attributes:
+        LOW: product fell under the threshold
+        RECOVERED: product is back at or over the threshold
+        DELETED: low-stock product was deleted
+    """
+
+    LOW = "low"
+    RECOVERED = "recovered"
+    DELETED = "deleted"
+
+
+class StockTransition(BaseModel):
+    """
+    Model for a product entering or leaving the low-stock set
+    """
+
+    product_id: int
+    name: str
+    state: StockState
+    quantity: Optional[int] = None
+    at: float
+
+
+class ImportRowError(BaseModel):
+    """
+    Model for a csv row rejected by an import
+    """
+
+    row: int
+    product_id: Optional[str] = None
+    message: str
+
+
+class ImportJobRead(BaseModel):
+    """
+    Model for the progress of a csv import
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    status: str
+    rows_read: int
+    rows_imported: int
+    rows_failed: int
+    errors: list[ImportRowError]
+    message: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+
+class WrapperProductResponse(BaseModel):
+    """
+    Wrapper model around product payloads to match the response json format
+    """
+
+    status: ResponseStatus
+    message: dict[str, Any]
+
+
+product_read_list = TypeAdapter(list[ProductRead])
+product_detail_read_list = TypeAdapter(list[ProductDetailRead])
+low_stock_read_list = TypeAdapter(list[LowStockRead])
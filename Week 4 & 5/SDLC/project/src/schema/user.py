@@ -126,4 +126,4 @@ class WrapperUserResponse(BaseModel):
     """
 
     status: str
-    message: dict[str, str | list[UserResponse] | UserResponse | dict]
+    message: dict[str, str | int | None | list[UserResponse] | UserResponse | dict]
@@ -0,0 +1,28 @@
+from typing import Any
+
+from src.core.log import get_logger
+
+logger = get_logger("audit")
+
+
+async def record_audit(
+    entity: str, action: str, entity_id: Any, user_email: str
+) -> None:
+    """
+    logs a structured audit line for a committed write on the "audit"
+    logger, run from the work queue; nothing is stored in the database,
+    the line is kept wherever the deployment ships its logs
+
+    Args:
+        entity: entity type (eg: product)
+        action: create, update or delete
+        entity_id: primary key of the written row
+        user_email: user who made the change
+    """
+    logger.info(
+        "audit",
+        entity=entity,
+        action=action,
+        entity_id=entity_id,
+        user_email=user_email,
+    )
@@ -1,15 +1,34 @@
+import asyncio
+from typing import AsyncContextManager, Callable, Optional
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
-from src.core.exceptions import DatabaseException
+from src.core.config import settings
+from src.core.etag import if_match_holds, make_etag
+from src.core.exceptions import ConflictException, DatabaseException
 from src.core.log import get_logger
 from src.models.category import Category
-from src.schema.category import BaseCategory
+from src.repository.category_summary import (
+    compact_summary_deltas,
+    get_category_summary_rows,
+)
+from src.repository.change_tracking import get_table_version
+from src.repository.database import commit_refresh_db
+from src.schema.category import (
+    BaseCategory,
+    CategoryRead,
+    CategorySummaryRead,
+    category_summary_read_list,
+)
 from src.services.models import ResponseStatus
 
 logger = get_logger(__name__)
 
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
 
 async def get_category_by_id(category_id: int, db: Session) -> Category | None:
     """
@@ -113,3 +132,187 @@ def handle_missing_category(category_id: int):
         "status": ResponseStatus.E.value,
         "message": {"response": message},
     }
+
+
+async def get_category_etag(
+    category_id: Optional[int], db: AsyncSession
+) -> Optional[str]:
+    """
+    computes the ETag of a category read without loading the category
+
+    Args:
+        category_id: id of a single category, None for the full list
+        db: sqlalchemy db object
+
+    Returns:
+        Optional[str]: ETag, None if the category does not exist
+    """
+    if category_id is None:
+        version = await get_table_version(table_name="product_category", db=db)
+        return make_etag("categories", version)
+
+    version = await db.scalar(select(Category.version).filter_by(id=category_id))
+    if version is None:
+        return None
+    return make_etag("category", category_id, f"v{version}")
+
+
+async def raise_stale_category(category_id: int, db: AsyncSession) -> None:
+    """
+    rejects a write made against an old version of a category, sending the
+    current representation and ETag so the client can merge and retry
+
+    Args:
+        category_id: id of the category
+        db: sqlalchemy db object
+
+    Raises:
+        ConflictException: always
+    """
+    stmt = (
+        select(Category)
+        .filter_by(id=category_id)
+        .execution_options(populate_existing=True)
+    )
+    current = (await db.execute(stmt)).scalars().first()
+    if current is None:
+        raise ConflictException(message=f"category {category_id} was deleted")
+    etag = make_etag("category", category_id, f"v{current.version}")
+    raise ConflictException(
+        message=f"category {category_id} was changed by another request",
+        field_errors=[{"field": "If-Match", "message": f"Current ETag is {etag}"}],
+        current=CategoryRead.model_validate(current).model_dump(mode="json"),
+        headers={"ETag": etag},
+    )
+
+
+async def commit_category_update(
+    category: Category, if_match: Optional[str], db: AsyncSession
+) -> str:
+    """
+    commits an edited category, conditional on the version that was read,
+    and on the client's If-Match when sent
+
+    Args:
+        category: loaded and modified category
+        if_match: If-Match header, ETag of the version the client edited
+        db: sqlalchemy db object
+
+    Returns:
+        str: ETag of the updated category
+
+    Raises:
+        ConflictException: if the category changed since it was read
+    """
+    # the loaded version, not the pending one, is what the client edited
+    loaded_etag = make_etag("category", category.id, f"v{category.version}")
+    if not if_match_holds(if_match=if_match, etag=loaded_etag):
+        await db.rollback()
+        await raise_stale_category(category_id=category.id, db=db)
+    try:
+        await commit_refresh_db(object=category, db=db)
+    except StaleDataError:
+        await db.rollback()
+        logger.warning(f"Concurrent update of category {category.id} rejected")
+        await raise_stale_category(category_id=category.id, db=db)
+    return make_etag("category", category.id, f"v{category.version}")
+
+
+async def get_category_summary(db: AsyncSession) -> list[CategorySummaryRead]:
+    """
+    per category product counts, total quantity and stock value
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        list[CategorySummaryRead]: one entry per category, ordered by id
+    """
+    rows = await get_category_summary_rows(db=db)
+    for row in rows:
+        # float sums drift slightly across incremental updates
+        row["stock_value"] = round(row["stock_value"], 2)
+    return category_summary_read_list.validate_python(rows)
+
+
+async def get_category_summary_etag(db: AsyncSession) -> str:
+    """
+    computes the ETag of the category summary from the table versions
+
+    Args:
+        db: sqlalchemy db object
+
+    Returns:
+        str: ETag
+    """
+    product_version = await get_table_version(table_name="product", db=db)
+    category_version = await get_table_version(table_name="product_category", db=db)
+    return make_etag("category-summary", product_version, category_version)
+
+
+class CategorySummaryCompactor:
+    """Periodic job folding appended deltas into the category summary.
+
+    Writers append delta rows instead of updating the summary, so they never
+    wait on each other; this job keeps the number of rows a read sums small.
+    Every worker runs one, each run claims disjoint deltas. Only runs while
+    CATEGORY_SUMMARY_MATERIALIZED is set.
+
+    Attributes:
+        interval: Seconds between runs.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Initialize a stopped compactor, the task is created by start.
+
+        Args:
+            interval: Seconds between runs.
+        """
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the periodic job is running."""
+        return self._task is not None
+
+    def start(self, session_factory: SessionFactory) -> None:
+        """Start compacting on the running event loop.
+
+        Args:
+            session_factory: Opens the session each run folds deltas with.
+        """
+        if self._task is not None or not settings.CATEGORY_SUMMARY_MATERIALIZED:
+            return
+        self._task = asyncio.create_task(
+            self._run(session_factory=session_factory),
+            name="category-summary-compactor",
+        )
+        logger.info(f"Category summary compactor started, every {self.interval}s")
+
+    async def stop(self) -> None:
+        """Cancel the periodic job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, session_factory: SessionFactory) -> None:
+        """Compact every interval until cancelled.
+
+        Args:
+            session_factory: Opens the session each run folds deltas with.
+        """
+        while True:
+            try:
+                async with session_factory() as db:
+                    await compact_summary_deltas(db=db)
+            except Exception as e:
+                logger.error(f"Category summary compaction failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+category_summary_compactor = CategorySummaryCompactor(
+    interval=settings.CATEGORY_SUMMARY_COMPACT_INTERVAL
+)
@@ -0,0 +1,217 @@
+import asyncio
+from typing import AsyncContextManager, Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.models.category import Category
+from src.models.change_log import ChangeLog
+from src.models.product import Product
+from src.repository.change_log import (
+    DELETE,
+    delete_expired_changes,
+    get_change_page,
+    get_latest_cursor,
+)
+from src.schema.category import CategoryRead
+from src.schema.change import ChangeRead
+from src.schema.product import ProductRead
+from src.services.models import ResponseStatus
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# feed table -> (model, read schema) used to attach current state to upserts
+FEED_MODELS = {
+    Product.__tablename__: (Product, ProductRead),
+    Category.__tablename__: (Category, CategoryRead),
+}
+
+
+def compact_changes(rows: list[ChangeLog]) -> list[ChangeLog]:
+    """
+    keeps only the newest change of each row in a page, since upserts carry
+    the current state anyway
+
+    Args:
+        rows: change log rows in cursor order
+
+    Returns:
+        list[ChangeLog]: one row per (table, row id), in cursor order
+    """
+    newest = {(row.table_name, row.row_id): row for row in rows}
+    return sorted(newest.values(), key=lambda row: (row.txid, row.id))
+
+
+async def get_current_rows(
+    rows: list[ChangeLog], db: AsyncSession
+) -> dict[tuple[str, int], dict]:
+    """
+    loads the current state of upserted rows, one query per table
+
+    Args:
+        rows: compacted change log rows
+        db: sqlalchemy db object
+
+    Returns:
+        dict: (table, row id) -> serialized row, missing if since deleted
+    """
+    current = {}
+    for table_name, (model, schema) in FEED_MODELS.items():
+        ids = [
+            row.row_id
+            for row in rows
+            if row.table_name == table_name and row.operation != DELETE
+        ]
+        if not ids:
+            continue
+        result = await db.execute(select(model).where(model.id.in_(ids)))
+        for instance in result.scalars():
+            current[(table_name, instance.id)] = schema.model_validate(
+                instance
+            ).model_dump(mode="json")
+    return current
+
+
+async def read_changes(
+    since: int, limit: int, db: AsyncSession
+) -> tuple[list[ChangeRead], int, bool]:
+    """
+    reads a compacted page of changes after a cursor
+
+    The cursor is the id of the writing transaction, so a page always holds
+    whole transactions. Upserts carry the row's current state; a row deleted
+    after the change was logged is reported as a delete.
+
+    Args:
+        since: cursor of the last transaction already read
+        limit: maximum number of changes read from the log
+        db: sqlalchemy db object
+
+    Returns:
+        tuple: (changes in cursor order, next cursor, whether more follow)
+    """
+    rows, has_more = await get_change_page(since=since, limit=limit, db=db)
+    compacted = compact_changes(rows=rows)
+    current = await get_current_rows(rows=compacted, db=db)
+
+    changes = []
+    for row in compacted:
+        data = current.get((row.table_name, row.row_id))
+        changes.append(
+            ChangeRead(
+                cursor=row.txid,
+                table=row.table_name,
+                id=row.row_id,
+                operation=DELETE if data is None else row.operation,
+                data=data,
+            )
+        )
+    logger.debug(f"Changes after {since}: {len(changes)} of {len(rows)} rows")
+    return changes, rows[-1].txid if rows else since, has_more
+
+
+async def get_change_feed(
+    user_email: str, since: int, limit: int, db: AsyncSession
+) -> dict:
+    """
+    reads a page of product and category changes after a cursor, so a
+    consumer syncs in time proportional to what changed, not the catalog
+
+    A new consumer reads "latest cursor", takes a full snapshot, then
+    follows the feed from that cursor.
+
+    Args:
+        user_email: current user's email id
+        since: cursor of the last change the consumer applied, 0 for all
+        limit: maximum number of changes read from the log
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response
+    """
+    changes, next_cursor, has_more = await read_changes(
+        since=since, limit=limit, db=db
+    )
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            "changes": changes,
+            "next cursor": next_cursor,
+            "latest cursor": await get_latest_cursor(db=db),
+            "has more": has_more,
+        },
+    }
+
+
+class ChangeLogPruner:
+    """Periodic job keeping the change log to its retention period.
+
+    Every worker runs one; the deletes are idempotent, so overlapping runs
+    only repeat work. The first run happens at start, in the background.
+
+    Attributes:
+        retention: Seconds a change is kept, 0 keeps every change.
+        interval: Seconds between runs.
+    """
+
+    def __init__(self, retention: float, interval: float) -> None:
+        """Initialize a stopped pruner, the task is created by start.
+
+        Args:
+            retention: Seconds a change is kept, 0 keeps every change.
+            interval: Seconds between runs.
+        """
+        self.retention = retention
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the periodic job is running."""
+        return self._task is not None
+
+    def start(self, session_factory: SessionFactory) -> None:
+        """Start pruning on the running event loop.
+
+        Args:
+            session_factory: Opens the session each run deletes with.
+        """
+        if self._task is not None or self.retention <= 0:
+            return
+        self._task = asyncio.create_task(
+            self._run(session_factory=session_factory), name="change-log-pruner"
+        )
+        logger.info(f"Change log pruner started, retention {self.retention}s")
+
+    async def stop(self) -> None:
+        """Cancel the periodic job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, session_factory: SessionFactory) -> None:
+        """Prune every interval until cancelled.
+
+        Args:
+            session_factory: Opens the session each run deletes with.
+        """
+        while True:
+            try:
+                async with session_factory() as db:
+                    await delete_expired_changes(retention=self.retention, db=db)
+            except Exception as e:
+                logger.error(f"Change log pruning failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+change_log_pruner = ChangeLogPruner(
+    retention=settings.CHANGE_LOG_RETENTION,
+    interval=settings.CHANGE_LOG_PRUNE_INTERVAL,
+)
@@ -0,0 +1,349 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, AsyncContextManager, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.models.category import Category
+from src.repository.change_log import CHANNEL, commit_hooks, get_latest_cursor
+from src.schema.change import ChangeRead
+from src.services.change_service import read_changes
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# changes read from the log per query while catching up
+PAGE_SIZE = 500
+
+
+@dataclass(frozen=True)
+class StreamFilter:
+    """Which changes a subscriber receives; no criteria means everything.
+
+    Attributes:
+        category_id: Changes of this category and of its products.
+        product_ids: Changes of these products.
+    """
+
+    category_id: Optional[int] = None
+    product_ids: frozenset[int] = frozenset()
+
+    def matches(self, change: ChangeRead) -> bool:
+        """Check whether a change passes the filter.
+
+        A deleted product's category is no longer known, so its delete goes
+        to every category subscriber; clients ignore ids they do not hold.
+
+        Args:
+            change: Change read from the change log.
+
+        Returns:
+            bool: True if the subscriber should receive the change.
+        """
+        if self.category_id is None and not self.product_ids:
+            return True
+        if change.table == Category.__tablename__:
+            return change.id == self.category_id
+        if change.id in self.product_ids:
+            return True
+        if self.category_id is None:
+            return False
+        return change.data is None or change.data["category_id"] == self.category_id
+
+
+class Subscriber:
+    """One stream client with a bounded buffer of pending changes.
+
+    Attributes:
+        stream_filter: Changes this client receives.
+        queue: Pending changes; None marks the end of the stream.
+        dropped: Whether the client fell behind and was disconnected.
+    """
+
+    def __init__(self, stream_filter: StreamFilter, buffer_size: int) -> None:
+        """Initialize a subscriber with an empty buffer.
+
+        Args:
+            stream_filter: Changes this client receives.
+            buffer_size: Maximum number of undelivered changes.
+        """
+        self.stream_filter = stream_filter
+        self.queue: asyncio.Queue[Optional[ChangeRead]] = asyncio.Queue(
+            maxsize=buffer_size
+        )
+        self.dropped = False
+
+    def close(self) -> None:
+        """Discard pending changes and end the stream."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+
+class ChangeStreamBroker:
+    """Shared in-process fan-out of committed catalog changes.
+
+    One task per worker reads new change log rows after every commit and
+    hands them to the matching subscribers, so N clients cost one query per
+    batch of writes rather than N polls. Commits in this process wake the
+    task directly; on postgres it also LISTENs on the channel the change
+    log NOTIFYs, so writes made by other workers reach its clients. A slow
+    poll covers notifications lost while the listening connection is down.
+
+    A subscriber whose buffer is full is dropped rather than slowing the
+    others; it resumes from its last cursor through GET /changes.
+
+    Attributes:
+        buffer_size: Maximum undelivered changes per subscriber.
+        poll_interval: Seconds between reads when nothing wakes the task.
+    """
+
+    def __init__(self, buffer_size: int, poll_interval: float) -> None:
+        """Initialize a stopped broker, the task is created by start.
+
+        Args:
+            buffer_size: Maximum undelivered changes per subscriber.
+            poll_interval: Seconds between reads when nothing wakes the task.
+        """
+        self.buffer_size = buffer_size
+        self.poll_interval = poll_interval
+        self.subscribers: set[Subscriber] = set()
+        self.cursor = 0
+        self._session_factory: Optional[SessionFactory] = None
+        self._listen_engine: Optional[AsyncEngine] = None
+        self._listen_connection: Optional[AsyncConnection] = None
+        self._driver_connection: Any = None
+        self._listening = False
+        self._wake: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._deferred: Optional[tuple[SessionFactory, Optional[AsyncEngine]]] = None
+        self._start_lock = asyncio.Lock()
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        """Whether the delivery task is running."""
+        return self._task is not None
+
+    async def start(
+        self,
+        session_factory: SessionFactory,
+        listen_engine: Optional[AsyncEngine] = None,
+    ) -> None:
+        """Start delivering changes committed from now on.
+
+        Args:
+            session_factory: Opens the session changes are read with.
+            listen_engine: Postgres engine to LISTEN on, None to rely on
+                commits in this process and polling.
+        """
+        if self._task is not None:
+            return
+        self._session_factory = session_factory
+        self._listen_engine = listen_engine
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        async with session_factory() as db:
+            self.cursor = await get_latest_cursor(db=db)
+        await self._listen()
+        commit_hooks.append(self.notify)
+        self._task = asyncio.create_task(self._run(), name="change-stream")
+        logger.info(f"Change stream started at cursor {self.cursor}")
+
+    def defer_start(
+        self,
+        session_factory: SessionFactory,
+        listen_engine: Optional[AsyncEngine] = None,
+    ) -> None:
+        """Keep the start arguments, the first subscriber starts the broker.
+
+        Saves the cursor read and the LISTEN connection at boot, for workers
+        that may never serve a stream.
+
+        Args:
+            session_factory: Opens the session changes are read with.
+            listen_engine: Postgres engine to LISTEN on, None to rely on
+                commits in this process and polling.
+        """
+        self._deferred = (session_factory, listen_engine)
+
+    async def ensure_started(self) -> None:
+        """Start the broker if its start was deferred and has not happened."""
+        if self._task is not None or self._deferred is None:
+            return
+        async with self._start_lock:
+            if self._task is None:
+                session_factory, listen_engine = self._deferred
+                await self.start(
+                    session_factory=session_factory, listen_engine=listen_engine
+                )
+
+    async def stop(self) -> None:
+        """Stop delivering, end every stream and release the connection."""
+        self._deferred = None
+        if self._task is None:
+            return
+        commit_hooks.remove(self.notify)
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        for subscriber in list(self.subscribers):
+            self.unsubscribe(subscriber=subscriber)
+            subscriber.close()
+        await self._unlisten()
+
+    def notify(self, *args: Any) -> None:
+        """Wake the delivery task, from any thread.
+
+        Args:
+            *args: Ignored, asyncpg passes connection, pid, channel, payload.
+        """
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wake.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def subscribe(self, stream_filter: StreamFilter) -> Subscriber:
+        """Register a client.
+
+        Args:
+            stream_filter: Changes the client receives.
+
+        Returns:
+            Subscriber: the client's buffer
+        """
+        subscriber = Subscriber(
+            stream_filter=stream_filter, buffer_size=self.buffer_size
+        )
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a client, safe to call more than once.
+
+        Args:
+            subscriber: Client to remove.
+        """
+        self.subscribers.discard(subscriber)
+
+    def publish(self, changes: list[ChangeRead]) -> None:
+        """Hand changes to matching subscribers without ever waiting.
+
+        Args:
+            changes: Changes in cursor order.
+        """
+        for subscriber in list(self.subscribers):
+            for change in changes:
+                if not subscriber.stream_filter.matches(change):
+                    continue
+                try:
+                    subscriber.queue.put_nowait(change)
+                except asyncio.QueueFull:
+                    logger.warning("Change stream subscriber too slow, dropped")
+                    subscriber.dropped = True
+                    self.unsubscribe(subscriber=subscriber)
+                    subscriber.close()
+                    self.dropped += 1
+                    break
+        self.published += len(changes)
+
+    async def deliver(self) -> None:
+        """Read every change after the cursor and publish it."""
+        async with self._session_factory() as db:
+            if not self.subscribers:
+                # nobody listening, skip the reads but keep the cursor current
+                self.cursor = await get_latest_cursor(db=db)
+                return
+            has_more = True
+            while has_more:
+                changes, self.cursor, has_more = await read_changes(
+                    since=self.cursor, limit=PAGE_SIZE, db=db
+                )
+                self.publish(changes=changes)
+
+    async def _run(self) -> None:
+        """Deliver after every wake up or poll interval until cancelled."""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                if self._listen_engine is not None and not self._listening:
+                    await self._unlisten()
+                    await self._listen()
+                await self.deliver()
+            except Exception as e:
+                logger.error(f"Change stream delivery failed: {e}")
+
+    async def _listen(self) -> None:
+        """LISTEN on the change log channel, if an engine was given."""
+        if self._listen_engine is None:
+            return
+        try:
+            connection = await self._listen_engine.connect()
+            raw_connection = await connection.get_raw_connection()
+            driver_connection = raw_connection.driver_connection
+            driver_connection.add_termination_listener(self._on_listen_lost)
+            await driver_connection.add_listener(CHANNEL, self.notify)
+        except Exception as e:
+            logger.error(f"Change stream LISTEN failed, polling instead: {e}")
+            return
+        self._listen_connection = connection
+        self._driver_connection = driver_connection
+        self._listening = True
+        logger.info(f"Change stream listening on {CHANNEL}")
+
+    def _on_listen_lost(self, *args: Any) -> None:
+        """Reconnect on the next delivery after the connection dropped.
+
+        Args:
+            *args: Ignored, asyncpg passes the connection.
+        """
+        logger.warning("Change stream LISTEN connection lost")
+        self._listening = False
+        self.notify()
+
+    async def _unlisten(self) -> None:
+        """Return the listening connection to the pool, without the listener."""
+        self._listening = False
+        if self._listen_connection is None:
+            return
+        connection, self._listen_connection = self._listen_connection, None
+        driver_connection, self._driver_connection = self._driver_connection, None
+        try:
+            driver_connection.remove_termination_listener(self._on_listen_lost)
+            await driver_connection.remove_listener(CHANNEL, self.notify)
+            await connection.close()
+        except Exception as e:
+            logger.warning(f"Closing change stream connection failed: {e}")
+
+    def stats(self) -> dict[str, int]:
+        """Return subscriber and delivery counters.
+
+        Returns:
+            dict: subscribers, published and dropped counts
+        """
+        return {
+            "subscribers": len(self.subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+change_stream_broker = ChangeStreamBroker(
+    buffer_size=settings.CHANGE_STREAM_BUFFER_SIZE,
+    poll_interval=settings.CHANGE_STREAM_POLL_INTERVAL,
+)
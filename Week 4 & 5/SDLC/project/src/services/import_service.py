@@ -0,0 +1,308 @@
+import os
+from csv import DictReader
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import AsyncContextManager, AsyncIterator, Callable
+
+from inventory_manager.src.model import BaseProduct, ProductFactory
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.core.work_queue import work_queue
+from src.models.import_job import ImportJob
+from src.models.product import Product
+from src.repository.category_summary import refresh_category_summary
+from src.repository.database import async_session_local
+from src.repository.product_import import (
+    FAILED,
+    RUNNING,
+    SUCCEEDED,
+    create_import_job,
+    get_category_ids,
+    get_import_job,
+    upsert_products,
+)
+from src.repository.seeding import CSV_COLUMNS, chunked, create_product, reset_sequences
+from src.repository.utility import get_integer_product_id
+from src.schema.product import ImportJobRead
+from src.services.models import ResponseStatus
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+# limits of the product columns, a row over them would abort its batch
+NAME_LENGTH = Product.name.type.length
+INTEGER_RANGE = range(-(2**31), 2**31)
+
+
+async def save_upload(chunks: AsyncIterator[bytes], max_bytes: int) -> str | None:
+    """
+    streams the request body to a temporary file, so the upload never sits
+    in memory whatever its size
+
+    Args:
+        chunks: request body chunks
+        max_bytes: largest accepted upload
+
+    Returns:
+        str | None: path of the file, None if the upload was too large
+    """
+    size = 0
+    with NamedTemporaryFile(suffix=".csv", delete=False) as upload:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                break
+            upload.write(chunk)
+    if size > max_bytes:
+        os.remove(upload.name)
+        return None
+    return upload.name
+
+
+def check_columns(product: BaseProduct, product_id: int) -> None:
+    """
+    checks a validated product fits the product table's columns
+
+    Args:
+        product: inventory_manager product
+        product_id: integer product id
+
+    Raises:
+        LookupError: naming the first column the value does not fit
+    """
+    if len(product.product_name) > NAME_LENGTH:
+        raise LookupError(f"product_name: at most {NAME_LENGTH} characters")
+    if product.quantity not in INTEGER_RANGE:
+        raise LookupError("quantity: out of range")
+    if product_id not in INTEGER_RANGE:
+        raise LookupError("product_id: out of range")
+
+
+def read_batch(
+    rows: list[tuple[int, dict]], factory: ProductFactory
+) -> tuple[dict[int, BaseProduct], list[dict]]:
+    """
+    validates a batch of csv rows with the inventory_manager models
+
+    Args:
+        rows: (line number, csv row) pairs
+        factory: inventory_manager product factory
+
+    Returns:
+        tuple: products by id (a repeated id keeps its last row) and the
+            rejected rows
+    """
+    products: dict[int, BaseProduct] = {}
+    errors = []
+    for line, row in rows:
+        try:
+            product = create_product(row=row, factory=factory)
+            if product is None:
+                # the factory returns None for a type it has no model for
+                raise LookupError("type: unknown product type")
+            product_id = get_integer_product_id(product_id=product.product_id)
+            check_columns(product=product, product_id=product_id)
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error["loc"])
+            message = f"{field}: {error['msg']}" if field else error["msg"]
+        except LookupError as e:
+            message = str(e)
+        except ValueError:
+            message = "product_id: expected a letter followed by digits"
+        else:
+            products[product_id] = product
+            continue
+        errors.append(
+            {"row": line, "product_id": row["product_id"], "message": message}
+        )
+    return products, errors
+
+
+async def import_batch(
+    job: ImportJob,
+    rows: list[tuple[int, dict]],
+    factory: ProductFactory,
+    db: AsyncSession,
+) -> None:
+    """
+    validates and upserts one batch, then commits it with the job progress
+
+    Args:
+        job: running import job, attached to db
+        rows: (line number, csv row) pairs
+        factory: inventory_manager product factory
+        db: sqlalchemy db object
+    """
+    products, errors = read_batch(rows=rows, factory=factory)
+    if products:
+        category_ids = await get_category_ids(
+            names={product.type.value for product in products.values()}, db=db
+        )
+        records = [
+            {
+                "id": product_id,
+                "name": product.product_name,
+                "quantity": product.quantity,
+                "price": product.price,
+                "category_id": category_ids[product.type.value],
+            }
+            for product_id, product in products.items()
+        ]
+        await upsert_products(records=records, db=db)
+    job.rows_read += len(rows)
+    job.rows_imported += len(rows) - len(errors)
+    job.rows_failed += len(errors)
+    room = settings.IMPORT_MAX_ERRORS - len(job.errors)
+    if errors and room > 0:
+        # reassigned, JSON columns do not track in-place changes
+        job.errors = job.errors + errors[:room]
+    job.updated_at = time()
+    await db.commit()
+
+
+async def run_import(
+    job_id: int,
+    csv_path: str,
+    session_factory: SessionFactory = async_session_local,
+) -> None:
+    """
+    imports an uploaded csv in batches of IMPORT_BATCH_SIZE rows, each in its
+    own transaction, so memory stays flat and progress is visible on the
+    job; rows are never held beyond their batch
+
+    Args:
+        job_id: pending import job
+        csv_path: uploaded file, removed once the import ends
+        session_factory: opens the session the import writes with
+    """
+    try:
+        async with session_factory() as db:
+            job = await get_import_job(job_id=job_id, db=db)
+            job.status = RUNNING
+            job.updated_at = time()
+            await db.commit()
+            try:
+                await import_file(job=job, csv_path=csv_path, db=db)
+            except Exception as e:
+                logger.error(f"Import job {job_id} failed: {e}")
+                await db.rollback()
+                job = await get_import_job(job_id=job_id, db=db)
+                job.status = FAILED
+                job.message = str(e)[:500]
+                job.updated_at = time()
+                await db.commit()
+    finally:
+        os.remove(csv_path)
+
+
+async def import_file(job: ImportJob, csv_path: str, db: AsyncSession) -> None:
+    """
+    reads the csv and imports it batch by batch
+
+    Args:
+        job: running import job, attached to db
+        csv_path: uploaded file
+        db: sqlalchemy db object
+
+    Raises:
+        ValueError: if the header misses a column of the inventory csv
+    """
+    factory = ProductFactory()
+    with open(csv_path, "r", newline="", encoding="utf-8-sig") as csv_file:
+        reader = DictReader(csv_file)
+        header = reader.fieldnames or ()
+        missing = [column for column in CSV_COLUMNS if column not in header]
+        if missing:
+            raise ValueError(f"missing columns: {', '.join(missing)}")
+        # line numbers as an editor shows them, the header is line 1
+        rows = enumerate(reader, start=2)
+        for batch in chunked(records=rows, size=settings.IMPORT_BATCH_SIZE):
+            await import_batch(job=job, rows=batch, factory=factory, db=db)
+            logger.info(f"Import job {job.id}: {job.rows_read} rows read")
+
+    if db.bind.dialect.name == "postgresql":
+        # explicit ids do not advance the serial sequence
+        await reset_sequences(connection=db)
+    if settings.CATEGORY_SUMMARY_MATERIALIZED:
+        # the upserts bypass the ORM hooks that maintain the summary
+        await refresh_category_summary(db=db)
+    job.status = SUCCEEDED
+    job.updated_at = time()
+    await db.commit()
+    logger.info(
+        "Import finished",
+        job_id=job.id,
+        imported=job.rows_imported,
+        failed=job.rows_failed,
+    )
+
+
+async def start_import(
+    user_email: str, chunks: AsyncIterator[bytes], db: AsyncSession
+) -> dict:
+    """
+    saves an uploaded inventory csv and queues its import
+
+    Args:
+        user_email: current user's email id
+        chunks: request body chunks
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response with the job to poll
+    """
+    csv_path = await save_upload(chunks=chunks, max_bytes=settings.IMPORT_MAX_BYTES)
+    if csv_path is None:
+        message = f"upload larger than {settings.IMPORT_MAX_BYTES} bytes"
+        logger.warning(message)
+        return {"status": ResponseStatus.E.value, "message": {"response": message}}
+
+    job = await create_import_job(user_email=user_email, db=db)
+    queued = work_queue.submit(
+        f"product-import-{job.id}", run_import, job_id=job.id, csv_path=csv_path
+    )
+    if not queued:
+        os.remove(csv_path)
+        job.status = FAILED
+        job.message = "work queue unavailable, retry later"
+        job.updated_at = time()
+        await db.commit()
+    logger.info(f"Import job {job.id} queued by {user_email}")
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            "import job": ImportJobRead.model_validate(job),
+        },
+    }
+
+
+async def get_import_status(job_id: int, user_email: str, db: AsyncSession) -> dict:
+    """
+    reports an import job's progress and rejected rows
+
+    Args:
+        job_id: import job id
+        user_email: current user's email id
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response
+    """
+    job = await get_import_job(job_id=job_id, db=db)
+    if job is None:
+        message = f"import job with id {job_id} not found"
+        logger.error(message)
+        return {"status": ResponseStatus.E.value, "message": {"response": message}}
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            "import job": ImportJobRead.model_validate(job),
+        },
+    }
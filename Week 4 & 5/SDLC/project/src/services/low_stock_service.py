@@ -0,0 +1,208 @@
+import asyncio
+from collections import deque
+from time import time
+from typing import AsyncContextManager, Callable, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.models.product import LOW_STOCK_THRESHOLD
+from src.repository.low_stock import get_low_stock_rows, get_quantities
+from src.schema.product import (
+    LowStockRead,
+    StockState,
+    StockTransition,
+    low_stock_read_list,
+)
+from src.services.models import ResponseStatus
+
+logger = get_logger(__name__)
+
+SessionFactory = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+class LowStockMonitor:
+    """Periodic job keeping the set of low-stock products in memory.
+
+    Every interval one query reads the products under the threshold through
+    the ix_product_low_stock partial index, so the cost follows the number
+    of low-stock products, not the catalog. The set is diffed with the
+    previous one and only transitions are emitted: products newly low,
+    recovered or deleted. The first check is the baseline and emits
+    nothing, so a restart does not repeat every alert. Stock writes also
+    queue a recheck on the work queue, so a transition does not wait for
+    the next interval.
+
+    Attributes:
+        threshold: Quantity under which a product is low on stock.
+        interval: Seconds between checks.
+        low_stock: Current low-stock products by id.
+        transitions: Most recent transitions, oldest first.
+        checked_at: Unix time of the last check, None before the first.
+        recheck_pending: Whether a recheck is queued and not started yet.
+    """
+
+    def __init__(self, threshold: int, interval: float, history_size: int) -> None:
+        """Initialize a stopped monitor, the task is created by start.
+
+        Args:
+            threshold: Quantity under which a product is low on stock.
+            interval: Seconds between checks.
+            history_size: Number of transitions kept for the endpoint.
+        """
+        self.threshold = threshold
+        self.interval = interval
+        self.low_stock: dict[int, LowStockRead] = {}
+        self.transitions: deque[StockTransition] = deque(maxlen=history_size)
+        self.checked_at: Optional[float] = None
+        self.recheck_pending = False
+        self._session_factory: Optional[SessionFactory] = None
+        self._check_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the periodic job is running."""
+        return self._task is not None
+
+    def start(self, session_factory: SessionFactory) -> None:
+        """Start checking on the running event loop.
+
+        Args:
+            session_factory: Opens the session each check reads with.
+        """
+        if self._task is not None:
+            return
+        self._session_factory = session_factory
+        self._task = asyncio.create_task(
+            self._run(session_factory=session_factory), name="low-stock"
+        )
+        logger.info(f"Low stock monitor started, threshold {self.threshold}")
+
+    async def stop(self) -> None:
+        """Cancel the periodic job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._session_factory = None
+
+    async def recheck(self) -> None:
+        """Check right away, run from the work queue after a stock write.
+
+        The pending flag is cleared before reading, so writes committed
+        while this check runs queue another one. Does nothing while the
+        monitor is stopped.
+        """
+        self.recheck_pending = False
+        if self._session_factory is None:
+            return
+        async with self._check_lock, self._session_factory() as db:
+            await self.check(db=db)
+
+    async def check(self, db: AsyncSession) -> list[StockTransition]:
+        """Refresh the low-stock set and emit what changed.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            list[StockTransition]: transitions since the previous check
+        """
+        rows = await get_low_stock_rows(db=db)
+        current = {row.id: row for row in low_stock_read_list.validate_python(rows)}
+        now = time()
+        baseline = self.checked_at is None
+
+        transitions = [
+            StockTransition(
+                product_id=product.id,
+                name=product.name,
+                state=StockState.LOW,
+                quantity=product.quantity,
+                at=now,
+            )
+            for product_id, product in current.items()
+            if product_id not in self.low_stock
+        ]
+        left = sorted(self.low_stock.keys() - current.keys())
+        quantities = await get_quantities(product_ids=left, db=db) if left else {}
+        for product_id in left:
+            quantity = quantities.get(product_id)
+            state = StockState.RECOVERED
+            if quantity is None:
+                state = StockState.DELETED
+            transitions.append(
+                StockTransition(
+                    product_id=product_id,
+                    name=self.low_stock[product_id].name,
+                    state=state,
+                    quantity=quantity,
+                    at=now,
+                )
+            )
+
+        self.low_stock = current
+        self.checked_at = now
+        if baseline:
+            logger.info(f"Low stock baseline: {len(current)} products")
+            return []
+        for transition in transitions:
+            logger.warning(
+                "low stock transition",
+                product_id=transition.product_id,
+                state=transition.state.value,
+                quantity=transition.quantity,
+            )
+        self.transitions.extend(transitions)
+        return transitions
+
+    async def _run(self, session_factory: SessionFactory) -> None:
+        """Check every interval until cancelled.
+
+        Args:
+            session_factory: Opens the session each check reads with.
+        """
+        while True:
+            try:
+                # a recheck may run meanwhile, one diff at a time
+                async with self._check_lock, session_factory() as db:
+                    await self.check(db=db)
+            except Exception as e:
+                logger.error(f"Low stock check failed: {e}")
+            await asyncio.sleep(self.interval)
+
+
+low_stock_monitor = LowStockMonitor(
+    threshold=LOW_STOCK_THRESHOLD,
+    interval=settings.LOW_STOCK_CHECK_INTERVAL,
+    history_size=settings.LOW_STOCK_HISTORY_SIZE,
+)
+
+
+async def get_low_stock_report(user_email: str, db: AsyncSession) -> dict:
+    """
+    returns the cached low-stock set and its recent transitions; without the
+    background job (eg: tests, scripts) the set is read on demand
+
+    Args:
+        user_email: current user's email id
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response
+    """
+    if not low_stock_monitor.running:
+        await low_stock_monitor.check(db=db)
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            "threshold": low_stock_monitor.threshold,
+            "checked at": low_stock_monitor.checked_at,
+            "low stock": list(low_stock_monitor.low_stock.values()),
+            "transitions": list(low_stock_monitor.transitions),
+        },
+    }
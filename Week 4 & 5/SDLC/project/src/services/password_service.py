@@ -0,0 +1,121 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+from weakref import WeakKeyDictionary
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.repository.database import hash_password, verify_password
+
+logger = get_logger(__name__)
+
+
+class PasswordService:
+    """Runs bcrypt hashing and verification off the event loop.
+
+    bcrypt is deliberately slow (tens of milliseconds per call), so calling it
+    directly inside a request handler stalls every other request on the loop.
+    Calls are handed to a dedicated thread pool instead, and an asyncio
+    semaphore caps how many can be in flight so a login storm queues cheaply
+    on the loop rather than piling work into the executor.
+
+    Attributes:
+        max_workers: Number of bcrypt worker threads.
+        max_concurrency: Maximum number of hash/verify calls in flight.
+    """
+
+    def __init__(self, max_workers: int, max_concurrency: int) -> None:
+        """Initialize the service, the executor is created on first use.
+
+        Args:
+            max_workers: Number of bcrypt worker threads.
+            max_concurrency: Maximum number of hash/verify calls in flight.
+        """
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: WeakKeyDictionary[
+            asyncio.AbstractEventLoop, asyncio.Semaphore
+        ] = WeakKeyDictionary()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the bcrypt thread pool, creating it if needed.
+
+        Returns:
+            ThreadPoolExecutor: executor dedicated to password hashing
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency limiter bound to the running loop.
+
+        Returns:
+            asyncio.Semaphore: semaphore for the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def _run(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        """Run a blocking function in the bcrypt executor.
+
+        Args:
+            func: Blocking callable to run.
+            **kwargs: Keyword arguments forwarded to func.
+
+        Returns:
+            Any: result of func
+        """
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), partial(func, **kwargs)
+            )
+
+    async def hash(self, password: str) -> str:
+        """Hash a plain text password without blocking the event loop.
+
+        Args:
+            password: Plain text password to hash.
+
+        Returns:
+            str: Bcrypt hash of the password.
+        """
+        return await self._run(hash_password, password=password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password against a bcrypt hash without blocking the loop.
+
+        Args:
+            plain_password: Plain text password to verify.
+            hashed_password: Bcrypt hash to compare against.
+
+        Returns:
+            bool: True if password matches hash, False otherwise.
+        """
+        return await self._run(
+            verify_password,
+            plain_password=plain_password,
+            hashed_password=hashed_password,
+        )
+
+    def shutdown(self) -> None:
+        """Wait for in-flight hashes and release the worker threads."""
+        if self._executor is not None:
+            logger.info("Shutting down password hashing executor")
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_service = PasswordService(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_CONCURRENCY,
+)
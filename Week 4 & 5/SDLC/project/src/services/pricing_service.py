@@ -0,0 +1,128 @@
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import settings
+from src.core.log import get_logger
+from src.models.product import Product
+from src.repository.category_summary import refresh_category_summary
+from src.repository.change_log import UPSERT, record_changes
+from src.repository.invalidation import PRODUCT_SCOPE, queue_invalidations
+from src.repository.pricing import PricingRule, compile_rules
+from src.schema.pricing import PricingRuleSet, pricing_change_list
+from src.services.models import ResponseStatus
+
+logger = get_logger(__name__)
+
+
+def get_rules(rule_set: PricingRuleSet) -> tuple[PricingRule, ...]:
+    """
+    converts a validated rule set into the hashable form compile_rules caches
+
+    Args:
+        rule_set: pydantic rule set
+
+    Returns:
+        tuple[PricingRule, ...]: rules in request order
+    """
+    return tuple(
+        PricingRule(
+            kind=rule.kind.value,
+            rate=rule.rate,
+            category_id=rule.category_id,
+            min_price=rule.min_price,
+            max_price=rule.max_price,
+        )
+        for rule in rule_set.rules
+    )
+
+
+async def preview_pricing(
+    user_email: str, rule_set: PricingRuleSet, db: AsyncSession
+) -> dict:
+    """
+    dry run: lists old and new price of every product the rule set matches,
+    computed by the same expressions apply_pricing writes
+
+    Args:
+        user_email: current user's email id
+        rule_set: pricing rules
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response
+    """
+    compiled = compile_rules(rules=get_rules(rule_set=rule_set))
+    stmt = (
+        select(
+            Product.id,
+            Product.name,
+            Product.price.label("old_price"),
+            compiled.price.label("new_price"),
+            compiled.price_type.label("price_type"),
+        )
+        .where(compiled.matches)
+        .order_by(Product.id)
+    )
+    result = await db.execute(stmt)
+    changes = pricing_change_list.validate_python(result.mappings().all())
+
+    logger.info(f"Pricing dry run matched {len(changes)} products")
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            "matched products": len(changes),
+            "changes": changes,
+        },
+    }
+
+
+async def apply_pricing(
+    user_email: str, rule_set: PricingRuleSet, db: AsyncSession
+) -> dict:
+    """
+    reprices every matching product with a single UPDATE ... CASE
+
+    The bulk UPDATE bypasses the ORM flush, so product versions, the change
+    log (which the product table version is read from) and the materialized
+    category summary are updated here, in the same transaction.
+
+    Args:
+        user_email: current user's email id
+        rule_set: pricing rules
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response
+    """
+    compiled = compile_rules(rules=get_rules(rule_set=rule_set))
+    stmt = (
+        update(Product)
+        .where(compiled.matches)
+        .values(
+            price=compiled.price,
+            price_type=compiled.price_type,
+            version=Product.version + 1,
+        )
+        .returning(Product.id)
+        .execution_options(synchronize_session=False)
+    )
+    product_ids = (await db.execute(stmt)).scalars().all()
+    updated = len(product_ids)
+    if updated:
+        await record_changes(
+            table_name=Product.__tablename__,
+            row_ids=product_ids,
+            operation=UPSERT,
+            db=db,
+        )
+        queue_invalidations(session=db, scope=PRODUCT_SCOPE, keys=product_ids)
+        if settings.CATEGORY_SUMMARY_MATERIALIZED:
+            await refresh_category_summary(db=db)
+    await db.commit()
+
+    logger.info(f"Applied {len(rule_set.rules)} pricing rules to {updated} products")
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {"user email": user_email, "updated products": updated},
+    }
@@ -4,19 +4,35 @@ from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.exc import StaleDataError
 
 from src.core.decorator_pattern import ConcretePrice, DiscountDecorator, TaxDecorator
-from src.core.exceptions import DatabaseException
+from src.core.etag import if_match_holds, make_etag
+from src.core.exceptions import ConflictException, DatabaseException
 from src.core.log import get_logger
+from src.core.work_queue import work_queue
 from src.models.category import Category
 from src.models.product import Product
+from src.repository.change_tracking import get_table_version
 from src.repository.database import (
     add_commit_refresh_db,
     commit_refresh_db,
     delete_commit_db,
 )
-from src.schema.product import ProductCreate
+from src.repository.product_search import search_products
+from src.repository.stock import adjust_stock, get_stock_quantity
+from src.schema.product import (
+    ProductCreate,
+    ProductDetailRead,
+    ProductRead,
+    ProductSearchResult,
+    StockReservation,
+    product_detail_read_list,
+    product_read_list,
+)
+from src.services.audit_service import record_audit
 from src.services.category_service import handle_missing_category
+from src.services.low_stock_service import low_stock_monitor
 from src.services.models import ResponseStatus
 from src.services.utility import check_id_type
 
@@ -130,13 +146,51 @@ async def post_product(
 
     await add_commit_refresh_db(object=db_product, db=db)
     logger.info(f"Product '{db_product.name}' created successfully")
+    submit_product_audit(
+        action="create", product_id=db_product.id, user_email=user_email
+    )
 
     return {
         "status": ResponseStatus.S.value,
-        "message": {"user email": user_email, "inserted product": db_product},
+        "message": {
+            "user email": user_email,
+            "inserted product": ProductRead.model_validate(db_product),
+        },
     }
 
 
+def submit_product_audit(action: str, product_id: int, user_email: str) -> None:
+    """
+    queues the audit record of a committed product write, so the endpoint
+    can respond without waiting for it
+
+    Args:
+        action: create, update, delete, reserve or release
+        product_id: id of the written product
+        user_email: user who made the change
+    """
+    work_queue.submit(
+        "product-audit",
+        record_audit,
+        entity="product",
+        action=action,
+        entity_id=product_id,
+        user_email=user_email,
+    )
+
+
+def submit_low_stock_check() -> None:
+    """
+    queues a low-stock check after a committed stock write; a burst of
+    writes queues a single check, which reads all of them
+    """
+    if low_stock_monitor.recheck_pending:
+        return
+    low_stock_monitor.recheck_pending = work_queue.submit(
+        "low-stock-check", low_stock_monitor.recheck
+    )
+
+
 def apply_discount_or_tax(product: Product) -> Product:
     """
     Applies dicount or tax to product's price
@@ -177,7 +231,93 @@ async def get_all_products(user_email: str, db: AsyncSession) -> dict:
     logger.info(f"Retrieved {len(products)} products")
     return {
         "status": ResponseStatus.S.value,
-        "message": {"user email": user_email, "products": products},
+        "message": {
+            "user email": user_email,
+            "products": product_read_list.validate_python(
+                products, from_attributes=True
+            ),
+        },
+    }
+
+
+async def get_products_etag(
+    product_id: Optional[int], category_id: Optional[int], db: AsyncSession
+) -> Optional[str]:
+    """
+    computes the ETag of a product read from version columns and table
+    versions, without loading or serializing any product
+
+    Args:
+        product_id: id of a single product
+        category_id: category filter for the product list
+        db: sqlalchemy db object
+
+    Returns:
+        Optional[str]: ETag, None if the requested product does not exist
+    """
+    if product_id:
+        # the single product response embeds its category
+        stmt = (
+            select(Product.version, Category.version)
+            .join(Product.category)
+            .where(Product.id == product_id)
+        )
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            return None
+        product_version, category_version = row
+        return make_etag(
+            "product", product_id, f"v{product_version}", f"c{category_version}"
+        )
+
+    # versions are read before the list, so a write racing the read can
+    # only make the ETag older than the body, never newer
+    product_version = await get_table_version(table_name="product", db=db)
+    if category_id:
+        category_version = await get_table_version(
+            table_name="product_category", db=db
+        )
+        return make_etag(
+            "products", product_version, "category", category_id, category_version
+        )
+    return make_etag("products", product_version)
+
+
+async def get_product_search_results(
+    user_email: str, query: str, limit: int, offset: int, db: AsyncSession
+) -> dict:
+    """
+    ranked, paginated product name search
+
+    Args:
+        user_email: current user's email id
+        query: search text
+        limit: page size
+        offset: rows to skip
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response, "next offset" is None on the last page
+    """
+    logger.debug(f"Searching products for '{query}', limit {limit}, offset {offset}")
+    # one extra row tells whether another page exists without a COUNT(*)
+    hits = await search_products(query=query, limit=limit + 1, offset=offset, db=db)
+    has_more = len(hits) > limit
+    results = [
+        ProductSearchResult(
+            product=ProductRead.model_validate(product), score=round(score, 4)
+        )
+        for product, score in hits[:limit]
+    ]
+
+    logger.info(f"Product search '{query}' returned {len(results)} results")
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            "results": results,
+            "next offset": offset + limit if has_more else None,
+        },
     }
 
 
@@ -215,7 +355,10 @@ async def get_specific_product(
     logger.info(f"Retrieved product: {product.name}")
     return {
         "status": ResponseStatus.S.value,
-        "message": {"user_email": user_email, "product": product},
+        "message": {
+            "user_email": user_email,
+            "product": ProductDetailRead.model_validate(product),
+        },
     }
 
 
@@ -249,42 +392,106 @@ async def get_category_specific_products(
         "status": ResponseStatus.S.value,
         "message": {
             "user_email": user_email,
-            f"products with category id: {category_id}": products,
+            f"products with category id: {category_id}": (
+                product_detail_read_list.validate_python(
+                    products, from_attributes=True
+                )
+            ),
         },
     }
 
 
+async def raise_stale_product(product_id: int, db: AsyncSession) -> None:
+    """
+    rejects a write made against an old version of a product, sending the
+    current representation and ETag so the client can merge and retry
+
+    Args:
+        product_id: id of the product
+        db: sqlalchemy db object
+
+    Raises:
+        ConflictException: always
+    """
+    stmt = (
+        select(Product)
+        .filter_by(id=product_id)
+        .execution_options(populate_existing=True)
+    )
+    current = (await db.execute(stmt)).scalars().first()
+    if current is None:
+        raise ConflictException(message=f"product {product_id} was deleted")
+    etag = await get_products_etag(product_id=product_id, category_id=None, db=db)
+    raise ConflictException(
+        message=f"product {product_id} was changed by another request",
+        field_errors=[{"field": "If-Match", "message": f"Current ETag is {etag}"}],
+        current=ProductRead.model_validate(current).model_dump(mode="json"),
+        headers={"ETag": etag},
+    )
+
+
 async def put_product(
-    current_user_email: str, product_id: int, product_update: BaseModel, db: Session
+    current_user_email: str,
+    product_id: int,
+    product_update: BaseModel,
+    db: Session,
+    if_match: Optional[str] = None,
 ) -> dict:
     """
     update product details
 
+    The version column makes the UPDATE conditional on the version that was
+    read, so a concurrent edit is rejected instead of silently overwritten,
+    without holding a row lock.
+
     Args:
         current_user_email: email id of user in session
         product_id: id of the product to update
         product: detail's of product to update
         db: sqlalchemy db object
+        if_match: If-Match header, ETag of the version the client edited
 
     Returns:
         dict: fastapi response
+
+    Raises:
+        ConflictException: if the product changed since the client read it
     """
     logger.debug(f"Updating product with id: {product_id}")
     check_id_type(id=product_id)
-    db_product = db.query(Product).filter_by(id=product_id).first()
+    result = await db.execute(select(Product).filter_by(id=product_id))
+    db_product = result.scalars().first()
     if db_product is None:
         logger.warning(f"Product not found for update: {product_id}")
         return handle_missing_product(product_id=product_id)
 
+    if if_match:
+        etag = await get_products_etag(product_id=product_id, category_id=None, db=db)
+        if not if_match_holds(if_match=if_match, etag=etag):
+            await raise_stale_product(product_id=product_id, db=db)
+
     update_data = product_update.model_dump(exclude_unset=True)  # type: ignore
     for field, value in update_data.items():
         setattr(db_product, field, value)
 
-    await commit_refresh_db(object=db_product, db=db)
+    try:
+        await commit_refresh_db(object=db_product, db=db)
+    except StaleDataError:
+        await db.rollback()
+        logger.warning(f"Concurrent update of product {product_id} rejected")
+        await raise_stale_product(product_id=product_id, db=db)
     logger.info(f"Product '{db_product.name}' updated successfully")
+    submit_product_audit(
+        action="update", product_id=product_id, user_email=current_user_email
+    )
+    if "quantity" in update_data:
+        submit_low_stock_check()
     return {
         "status": ResponseStatus.S.value,
-        "message": {"user email": current_user_email, "updated product": db_product},
+        "message": {
+            "user email": current_user_email,
+            "updated product": ProductRead.model_validate(db_product),
+        },
     }
 
 
@@ -312,9 +519,73 @@ async def delete_product(current_user_email: str, product_id: int, db: Session)
         logger.warning(f"Product not found for deletion: {product_id}")
         return handle_missing_product(product_id=product_id)
 
+    # read before deleting, the instance is unusable once the row is gone
+    deleted_product = ProductRead.model_validate(db_product)
     await delete_commit_db(object=db_product, db=db)
-    logger.info(f"Product '{db_product.name}' (id: {product_id}) deleted successfully")
+    submit_product_audit(
+        action="delete", product_id=product_id, user_email=current_user_email
+    )
+    logger.info(
+        f"Product '{deleted_product.name}' (id: {product_id}) deleted successfully"
+    )
     return {
         "status": ResponseStatus.S.value,
-        "message": {"user email": current_user_email, "deleted product": db_product},
+        "message": {
+            "user email": current_user_email,
+            "deleted product": deleted_product,
+        },
+    }
+
+
+async def change_stock(
+    user_email: str, reservation: StockReservation, reserve: bool, db: AsyncSession
+) -> dict:
+    """
+    reserves or releases stock for every line of a reservation in one
+    transaction, all lines or none
+
+    Args:
+        user_email: current user's email id
+        reservation: products and quantities
+        reserve: True to take stock, False to put it back
+        db: sqlalchemy db object
+
+    Returns:
+        dict: fastapi response
+
+    Raises:
+        ConflictException: if a product has less stock than requested
+    """
+    lines = [(line.product_id, line.quantity) for line in reservation.lines]
+    remaining, failed_id = await adjust_stock(lines=lines, reserve=reserve, db=db)
+    if failed_id is not None:
+        await db.rollback()
+        available = await get_stock_quantity(product_id=failed_id, db=db)
+        if available is None:
+            return handle_missing_product(product_id=failed_id)
+        logger.warning(f"Insufficient stock for product {failed_id}: {available}")
+        raise ConflictException(
+            message=f"Insufficient stock for product {failed_id}",
+            field_errors=[
+                {"field": "quantity", "message": f"Only {available} in stock"}
+            ],
+        )
+    await db.commit()
+
+    action = "reserve" if reserve else "release"
+    logger.info(f"Stock {action} of {len(remaining)} products by {user_email}")
+    for product_id in remaining:
+        submit_product_audit(
+            action=action, product_id=product_id, user_email=user_email
+        )
+    submit_low_stock_check()
+    return {
+        "status": ResponseStatus.S.value,
+        "message": {
+            "user email": user_email,
+            f"{action}d stock": [
+                {"product_id": product_id, "quantity": quantity}
+                for product_id, quantity in remaining.items()
+            ],
+        },
     }
@@ -110,17 +110,27 @@ class UserService(AbstractUserService):
         logger.info(f"User {current_user.email} details updated successfully")
         return message, current_user
 
-    async def get_users(self, user_email: str) -> list[User]:
-        """Retrieves a list of all registered users.
+    async def get_users(
+        self, user_email: str, limit: int, offset: int = 0
+    ) -> tuple[list[User], int | None]:
+        """Retrieves one page of registered users, ordered by id.
+
+        One extra row is read to tell whether another page follows, so no
+        count query is needed.
 
         Args:
             user_email: The email of the user requesting the list (for logging/audit).
+            limit: Maximum number of users to return.
+            offset: Number of users to skip.
 
         Returns:
-            A list of User instances.
+            A tuple of the User instances and the offset of the next page,
+            None on the last page.
         """
-        logger.debug(f"Fetching all users, requested by: {user_email}")
-        return await self.repo.fetch_all_users()
+        logger.debug(f"Fetching users from {offset}, requested by: {user_email}")
+        users = await self.repo.fetch_users_page(limit=limit + 1, offset=offset)
+        next_offset = offset + limit if len(users) > limit else None
+        return users[:limit], next_offset
 
     async def delete_user(self, user_id: int, user_email: str) -> Any:
         """Removes a user from the system.
@@ -178,6 +178,28 @@ class TestGetSpecificCategory:
         assert data["status"] == "error"
 
 
+class TestCategorySummary:
+    """Test suite for the category summary endpoint"""
+
+    def test_summary_counts_products(
+        self, client: TestClient, staff_headers: dict, products_with_different_categories
+    ):
+        """Test one summary per category with product count and stock value"""
+        response = client.get("/category/summary", headers=staff_headers)
+
+        assert response.status_code == 200
+        summary = response.json()["message"]["category summary"]
+        assert len(summary) == 4
+        assert summary[0] == {
+            "category_id": 1,
+            "name": "electronics",
+            "product_count": 2,
+            "total_quantity": 30,
+            "stock_value": 8250.0,
+        }
+        assert "etag" in response.headers
+
+
 class TestCreateCategory:
     """Test suite for creating new categories"""
 
@@ -386,6 +408,51 @@ class TestUpdateCategory:
         assert data["status"] == "error"
         assert "existing category with same name" in data["message"]["response"]
 
+    def test_update_with_current_etag(
+        self, client: TestClient, manager_headers: dict, sample_category
+    ):
+        """Test If-Match with the ETag from GET lets the update through"""
+        etag = client.get(
+            "/category",
+            params={"category_id": sample_category.id},
+            headers=manager_headers,
+        ).headers["ETag"]
+
+        response = client.put(
+            "/category/update",
+            headers={**manager_headers, "If-Match": etag},
+            json={"id": sample_category.id, "name": "conditional"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_update_with_stale_etag_is_conflict(
+        self, client: TestClient, manager_headers: dict, sample_category
+    ):
+        """Test a stale If-Match gets 409 and the current category"""
+        etag = client.get(
+            "/category",
+            params={"category_id": sample_category.id},
+            headers=manager_headers,
+        ).headers["ETag"]
+        client.put(
+            "/category/update",
+            headers=manager_headers,
+            json={"id": sample_category.id, "name": "first_writer"},
+        )
+
+        response = client.put(
+            "/category/update",
+            headers={**manager_headers, "If-Match": etag},
+            json={"id": sample_category.id, "name": "second_writer"},
+        )
+
+        assert response.status_code == 409
+        current = response.json()["error"]["details"]["current"]
+        assert current["name"] == "first_writer"
+        assert response.headers["ETag"] != etag
+
     def test_update_category_without_authentication(
         self, client: TestClient, sample_category
     ):
@@ -0,0 +1,89 @@
+# test_change_routes.py - Tests for the /changes feed endpoint
+import pytest
+from fastapi.testclient import TestClient
+from src.api.routes.change import stream_changes
+from src.schema.change import ChangeRead
+from src.services import change_stream_service
+
+
+class TestChangeRoutes:
+    """Test suite for the change feed"""
+
+    def test_feed_returns_writes_after_cursor(
+        self, client: TestClient, manager_headers: dict, sample_product
+    ):
+        """Test a consumer only gets changes made after its cursor"""
+        first = client.get("/changes", headers=manager_headers).json()["message"]
+        client.put(
+            f"/product?product_id={sample_product.id}",
+            headers=manager_headers,
+            json={"quantity": 1},
+        )
+
+        response = client.get(
+            "/changes",
+            params={"since": first["next cursor"]},
+            headers=manager_headers,
+        )
+
+        assert response.status_code == 200
+        changes = response.json()["message"]["changes"]
+        assert [(c["table"], c["id"], c["operation"]) for c in changes] == [
+            ("product", sample_product.id, "upsert")
+        ]
+        assert changes[0]["data"]["quantity"] == 1
+
+    def test_rejects_negative_cursor(self, client: TestClient, staff_headers: dict):
+        """Test the cursor is validated"""
+        response = client.get(
+            "/changes", params={"since": -1}, headers=staff_headers
+        )
+
+        assert response.status_code == 422
+
+
+class TestChangeStream:
+    """Test suite for the server-sent events stream"""
+
+    class ConnectedRequest:
+        """Request stand-in that never disconnects"""
+
+        async def is_disconnected(self) -> bool:
+            return False
+
+    @pytest.mark.asyncio
+    async def test_stream_sends_changes_then_dropped(self):
+        """Test events carry cursors and a drop resumes before a cut transaction"""
+        broker = change_stream_service.ChangeStreamBroker(
+            buffer_size=1, poll_interval=5.0
+        )
+        subscriber = broker.subscribe(
+            stream_filter=change_stream_service.StreamFilter()
+        )
+        change = ChangeRead(
+            cursor=8, table="product", id=3, operation="upsert", data={"id": 3}
+        )
+        broker.publish(changes=[change])
+
+        stream = stream_changes(
+            request=self.ConnectedRequest(),
+            subscriber=subscriber,
+            cursor=7,
+            heartbeat=1,
+        )
+        events = [await anext(stream), await anext(stream)]
+        broker.publish(changes=[change, change])
+        events += [event async for event in stream]
+
+        assert events[0] == 'event: ready\ndata: {"cursor": 7}\n\n'
+        assert events[1].startswith("id: 8\nevent: upsert\ndata: ")
+        # transaction 8 may not have been sent whole, it is read again
+        assert events[2] == 'event: dropped\ndata: {"cursor": 7}\n\n'
+
+    def test_rejects_invalid_category(self, client: TestClient, staff_headers: dict):
+        """Test the category filter is validated"""
+        response = client.get(
+            "/changes/stream", params={"category_id": 0}, headers=staff_headers
+        )
+
+        assert response.status_code == 422
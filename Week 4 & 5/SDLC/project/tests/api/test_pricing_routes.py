@@ -0,0 +1,50 @@
+# test_pricing_routes.py - Tests for bulk pricing endpoints
+from fastapi.testclient import TestClient
+
+
+class TestPricingRoutes:
+    """Test suite for pricing preview and apply"""
+
+    def test_preview_then_apply(
+        self, client: TestClient, admin_headers: dict, multiple_products
+    ):
+        """Test the dry run diff and the applied prices agree"""
+        body = {"rules": [{"kind": "discount", "rate": 0.2, "min_price": 100}]}
+
+        preview = client.post("/pricing/preview", json=body, headers=admin_headers)
+        applied = client.post("/pricing/apply", json=body, headers=admin_headers)
+        products = client.get("/products", headers=admin_headers)
+
+        assert preview.status_code == 200
+        changes = preview.json()["message"]["changes"]
+        assert {change["id"]: change["new_price"] for change in changes} == {
+            1: 1200.0,
+            3: 80.0,
+        }
+        assert applied.json()["message"]["updated products"] == 2
+        prices = {
+            product["id"]: product["price"]
+            for product in products.json()["message"]["products"]
+        }
+        assert prices == {1: 1200.0, 2: 50.0, 3: 80.0}
+
+    def test_rejects_invalid_rate(self, client: TestClient, admin_headers: dict):
+        """Test rates outside (0, 1) are a validation error"""
+        body = {"rules": [{"kind": "discount", "rate": 1.5}]}
+
+        response = client.post("/pricing/apply", json=body, headers=admin_headers)
+
+        assert response.status_code == 422
+
+    def test_rejects_inverted_price_range(
+        self, client: TestClient, admin_headers: dict
+    ):
+        """Test a min_price above max_price is a validation error"""
+        rule = {"kind": "tax", "rate": 0.1, "min_price": 100, "max_price": 10}
+
+        response = client.post(
+            "/pricing/apply", json={"rules": [rule]}, headers=admin_headers
+        )
+
+        assert response.status_code == 422
+        assert "max_price" in response.json()["detail"][0]["msg"]
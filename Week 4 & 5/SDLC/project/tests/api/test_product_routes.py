@@ -1,7 +1,15 @@
 # test_product_routes.py - Tests for product CRUD operations
+import os
+
+import pytest
 from fastapi.testclient import TestClient  # noqa: F401
+from sqlalchemy import update
 from sqlalchemy.orm import Session  # noqa: F401
+from src.core.config import settings
+from src.core.idempotency import idempotency_cache
 from src.models.category import Category  # noqa: F401
+from src.models.product import Product
+from src.services import import_service, low_stock_service, product_service
 
 
 class TestGetProducts:
@@ -79,6 +87,71 @@ class TestGetProducts:
         assert response.status_code == 500
 
 
+class TestConditionalGetProducts:
+    """Test suite for ETag based conditional product reads"""
+
+    def test_matching_etag_returns_304(
+        self, client: TestClient, staff_headers: dict, multiple_products
+    ):
+        """Test If-None-Match with the current ETag skips the body"""
+        first = client.get("/products", headers=staff_headers)
+        etag = first.headers["etag"]
+
+        second = client.get(
+            "/products", headers={**staff_headers, "If-None-Match": etag}
+        )
+
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["etag"] == etag
+
+    def test_update_changes_product_and_list_etags(
+        self, client: TestClient, manager_headers: dict, sample_product
+    ):
+        """Test a write invalidates both the single product and list ETags"""
+        url = f"/products?product_id={sample_product.id}"
+        product_etag = client.get(url, headers=manager_headers).headers["etag"]
+        list_etag = client.get("/products", headers=manager_headers).headers["etag"]
+
+        client.put(
+            f"/product?product_id={sample_product.id}",
+            headers=manager_headers,
+            json={"quantity": 3},
+        )
+
+        product_response = client.get(
+            url, headers={**manager_headers, "If-None-Match": product_etag}
+        )
+        list_response = client.get(
+            "/products", headers={**manager_headers, "If-None-Match": list_etag}
+        )
+        assert product_response.status_code == 200
+        assert product_response.headers["etag"] != product_etag
+        assert list_response.status_code == 200
+        assert list_response.headers["etag"] != list_etag
+
+
+class TestSearchProducts:
+    """Test suite for the product search endpoint"""
+
+    def test_search_returns_ranked_page(
+        self, client: TestClient, staff_headers: dict, multiple_products
+    ):
+        """Test search hits carry a score and the next page offset"""
+        response = client.get("/products/search?q=key&limit=1", headers=staff_headers)
+
+        assert response.status_code == 200
+        message = response.json()["message"]
+        assert message["results"][0]["product"]["name"] == "Keyboard"
+        assert message["results"][0]["score"] > 0
+        assert message["next offset"] is None
+
+    def test_empty_query_is_rejected(self, client: TestClient, staff_headers: dict):
+        """Test q is required to be non empty"""
+        response = client.get("/products/search?q=", headers=staff_headers)
+        assert response.status_code == 422
+
+
 class TestCreateProduct:
     """Test suite for creating products"""
 
@@ -162,6 +235,58 @@ class TestCreateProduct:
         assert response.status_code == 500
 
 
+class TestIdempotentCreateProduct:
+    """Test suite for Idempotency-Key on product creation"""
+
+    @pytest.fixture(autouse=True)
+    def clear_idempotency_cache(self):
+        """Keys stored by other tests must not leak into this one"""
+        idempotency_cache.clear()
+        yield
+        idempotency_cache.clear()
+
+    def post(self, client: TestClient, headers: dict, key: str, name: str):
+        """POST a product with an Idempotency-Key"""
+        return client.post(
+            "/products",
+            headers={**headers, "Idempotency-Key": key},
+            json={"name": name, "price": 10, "quantity": 1, "category_id": 1},
+        )
+
+    def test_retry_replays_first_response(
+        self, client: TestClient, admin_headers: dict, sample_category, test_db
+    ):
+        """Test a retry gets the stored response and creates nothing"""
+        first = self.post(client, admin_headers, key="k-1", name="Retried")
+        idempotency_cache.clear()  # force the replay through the table
+        retry = self.post(client, admin_headers, key="k-1", name="Retried")
+
+        assert first.status_code == 200
+        assert retry.status_code == 200
+        assert retry.json() == first.json()
+        assert retry.headers["Idempotent-Replayed"] == "true"
+        assert test_db.query(Product).filter_by(name="Retried").count() == 1
+
+    def test_key_reused_for_other_request_conflicts(
+        self, client: TestClient, admin_headers: dict, sample_category
+    ):
+        """Test a key cannot be reused with a different body"""
+        self.post(client, admin_headers, key="k-2", name="First Body")
+        response = self.post(client, admin_headers, key="k-2", name="Other Body")
+
+        assert response.status_code == 409
+
+    def test_oversized_key_is_rejected(
+        self, client: TestClient, admin_headers: dict, sample_category, test_db
+    ):
+        """Test a key longer than the column fails validation, nothing is written"""
+        response = self.post(client, admin_headers, key="k" * 256, name="Too Long")
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["header", "Idempotency-Key"]
+        assert test_db.query(Product).filter_by(name="Too Long").count() == 0
+
+
 class TestUpdateProduct:
     """Test suite for updating products"""
 
@@ -228,6 +353,77 @@ class TestUpdateProduct:
         assert data["message"]["response"].endswith("not found")
 
 
+    def test_update_with_current_etag(
+        self, client: TestClient, manager_headers: dict, sample_product
+    ):
+        """Test If-Match with the ETag from GET lets the update through"""
+        url = f"/products?product_id={sample_product.id}"
+        etag = client.get(url, headers=manager_headers).headers["etag"]
+
+        response = client.put(
+            f"/product?product_id={sample_product.id}",
+            headers={**manager_headers, "If-Match": etag},
+            json={"price": 900},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["etag"] == (
+            client.get(url, headers=manager_headers).headers["etag"]
+        )
+        assert response.headers["etag"] != etag
+
+    def test_update_with_stale_etag_is_conflict(
+        self, client: TestClient, manager_headers: dict, sample_product
+    ):
+        """Test a stale If-Match gets 409 with the current product"""
+        url = f"/products?product_id={sample_product.id}"
+        etag = client.get(url, headers=manager_headers).headers["etag"]
+        client.put(
+            f"/product?product_id={sample_product.id}",
+            headers=manager_headers,
+            json={"price": 900},
+        )
+
+        response = client.put(
+            f"/product?product_id={sample_product.id}",
+            headers={**manager_headers, "If-Match": etag},
+            json={"price": 700},
+        )
+
+        assert response.status_code == 409
+        assert response.json()["error"]["details"]["current"]["price"] == 900
+        assert response.headers["etag"] != etag
+
+    def test_concurrent_update_is_conflict(
+        self, client: TestClient, manager_headers: dict, sample_product, monkeypatch
+    ):
+        """Test a write racing between read and commit is rejected, not lost"""
+        original = product_service.commit_refresh_db
+
+        async def commit_after_other_writer(object, db):
+            # another session commits first, bumping the version under us
+            await db.execute(
+                update(Product)
+                .where(Product.id == object.id)
+                .values(version=Product.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            await original(object=object, db=db)
+
+        monkeypatch.setattr(
+            product_service, "commit_refresh_db", commit_after_other_writer
+        )
+
+        response = client.put(
+            f"/product?product_id={sample_product.id}",
+            headers=manager_headers,
+            json={"price": 700},
+        )
+
+        assert response.status_code == 409
+        assert response.json()["error"]["details"]["current"]["price"] != 700
+
+
 class TestDeleteProduct:
     """Test suite for deleting products"""
 
@@ -338,3 +534,137 @@ class TestUpdateProductCategory:
         data = response.json()
         assert data["status"] == "error"
         assert "Cannot find category" in data["message"]["response"]
+
+
+class TestStockReservation:
+    """Test suite for stock reserve and release endpoints"""
+
+    def test_reserve_then_release(
+        self, client: TestClient, admin_headers: dict, multiple_products
+    ):
+        """Test reserving and releasing the same lines restores stock"""
+        body = {"lines": [{"product_id": 2, "quantity": 5}]}
+
+        reserved = client.post("/products/reserve", json=body, headers=admin_headers)
+        released = client.post("/products/release", json=body, headers=admin_headers)
+
+        assert reserved.status_code == 200
+        assert reserved.json()["message"]["reserved stock"] == [
+            {"product_id": 2, "quantity": 15}
+        ]
+        assert released.json()["message"]["released stock"] == [
+            {"product_id": 2, "quantity": 20}
+        ]
+
+    def test_oversell_is_conflict(
+        self, client: TestClient, admin_headers: dict, multiple_products
+    ):
+        """Test asking for more than is in stock returns 409"""
+        body = {"lines": [{"product_id": 1, "quantity": 6}]}
+
+        response = client.post("/products/reserve", json=body, headers=admin_headers)
+
+        assert response.status_code == 409
+
+    def test_rejects_empty_reservation(self, client: TestClient, admin_headers: dict):
+        """Test a reservation needs at least one line"""
+        response = client.post(
+            "/products/reserve", json={"lines": []}, headers=admin_headers
+        )
+
+        assert response.status_code == 422
+
+
+class TestLowStock:
+    """Test suite for the low-stock endpoint"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_monitor(self, monkeypatch):
+        """Start every test from a monitor that has not checked yet"""
+        monitor = low_stock_service.LowStockMonitor(
+            threshold=10, interval=60.0, history_size=10
+        )
+        monkeypatch.setattr(low_stock_service, "low_stock_monitor", monitor)
+
+    def test_lists_low_stock(
+        self, client: TestClient, staff_headers: dict, multiple_products
+    ):
+        """Test only products under the threshold are listed"""
+        response = client.get("/products/low-stock", headers=staff_headers)
+
+        assert response.status_code == 200
+        message = response.json()["message"]
+        assert message["threshold"] == 10
+        assert [p["id"] for p in message["low stock"]] == [1]
+        assert message["transitions"] == []
+
+    def test_reports_transition(
+        self, client: TestClient, staff_headers: dict, test_db, multiple_products
+    ):
+        """Test a product dropping under the threshold shows as low"""
+        client.get("/products/low-stock", headers=staff_headers)
+        test_db.get(Product, 2).quantity = 2
+        test_db.commit()
+
+        response = client.get("/products/low-stock", headers=staff_headers)
+
+        transitions = response.json()["message"]["transitions"]
+        assert [(t["product_id"], t["state"]) for t in transitions] == [(2, "low")]
+
+
+class TestProductImport:
+    """Test suite for the csv import endpoints"""
+
+    @pytest.fixture
+    def queued(self, monkeypatch) -> list:
+        """Record queued imports instead of running them"""
+        queued = []
+
+        def submit(name, func, **kwargs):
+            queued.append(kwargs)
+            return True
+
+        monkeypatch.setattr(import_service.work_queue, "submit", submit)
+        yield queued
+        for kwargs in queued:
+            os.remove(kwargs["csv_path"])
+
+    def test_upload_queues_job(
+        self, client: TestClient, admin_headers: dict, queued: list
+    ):
+        """Test the body is saved and a pending job is returned"""
+        body = b"product_id,product_name\nP001,Cereal\n"
+
+        response = client.post(
+            "/products/import",
+            content=body,
+            headers={**admin_headers, "Content-Type": "text/csv"},
+        )
+
+        job = response.json()["message"]["import job"]
+        assert job["status"] == "pending"
+        assert queued[0]["job_id"] == job["id"]
+        with open(queued[0]["csv_path"], "rb") as upload:
+            assert upload.read() == body
+
+        status = client.get(f"/products/import/{job['id']}", headers=admin_headers)
+        assert status.json()["message"]["import job"]["id"] == job["id"]
+
+    def test_oversized_upload(
+        self, client: TestClient, admin_headers: dict, queued: list, monkeypatch
+    ):
+        """Test a body over IMPORT_MAX_BYTES is refused"""
+        monkeypatch.setattr(settings, "IMPORT_MAX_BYTES", 4)
+
+        response = client.post(
+            "/products/import", content=b"0123456789", headers=admin_headers
+        )
+
+        assert response.json()["status"] == "error"
+        assert queued == []
+
+    def test_unknown_job(self, client: TestClient, admin_headers: dict):
+        """Test polling a job that does not exist"""
+        response = client.get("/products/import/999", headers=admin_headers)
+
+        assert response.json()["status"] == "error"
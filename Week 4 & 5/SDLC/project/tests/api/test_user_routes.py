@@ -1,6 +1,7 @@
 # test_user_routes.py - Tests for user registration, login, and management with new async architecture
 import pytest
 from fastapi.testclient import TestClient
+from src.core.idempotency import idempotency_cache
 
 
 @pytest.mark.asyncio
@@ -114,6 +115,31 @@ class TestUserRegistration:
 
         assert response.status_code == 422  # Validation error for invalid role
 
+    def test_register_replay_has_no_password(self, client: TestClient):
+        """
+        Test replaying a registration with the same Idempotency-Key.
+        Should return the first body, without the password hash.
+        """
+        payload = {
+            "name": "Replay User",
+            "email": "replay@test.com",
+            "password": "Securepass123#",
+            "role": "staff",
+        }
+        headers = {"Idempotency-Key": "register-replay"}
+
+        idempotency_cache.clear()
+        first = client.post("/user/register", json=payload, headers=headers)
+        idempotency_cache.clear()  # force the replay through the table
+        replay = client.post("/user/register", json=payload, headers=headers)
+        idempotency_cache.clear()
+
+        assert first.status_code == 200
+        assert replay.status_code == 200
+        assert replay.json() == first.json()
+        assert "password" not in first.json()["message"]["registered user"]
+        assert "password" not in replay.text
+
 
 @pytest.mark.asyncio
 class TestUserLogin:
@@ -340,6 +366,23 @@ class TestGetAllUsers:
         # This might pass if staff role is allowed, or fail if not
         assert response.status_code in [200, 403]
 
+    def test_users_are_paged(
+        self, client: TestClient, admin_headers, staff_user, manager_user
+    ):
+        """Test limit and offset page through users with a next offset"""
+        first = client.get("/user/all?limit=2", headers=admin_headers).json()
+        second = client.get("/user/all?limit=2&offset=2", headers=admin_headers).json()
+
+        assert len(first["message"]["users"]) == 2
+        assert first["message"]["next offset"] == 2
+        assert len(second["message"]["users"]) == 1
+        assert second["message"]["next offset"] is None
+
+    def test_invalid_limit(self, client: TestClient, admin_headers):
+        """Test page sizes outside 1..200 are rejected"""
+        response = client.get("/user/all?limit=0", headers=admin_headers)
+        assert response.status_code == 422
+
 
 @pytest.mark.asyncio
 class TestUpdateUser:
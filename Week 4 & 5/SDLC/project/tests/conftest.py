@@ -13,7 +13,8 @@ from src.core.jwt import create_access_token
 from src.models.category import Category
 from src.models.product import Product
 from src.models.user import User
-from src.repository.database import Base, get_db, hash_password
+from src.repository.database import Base, get_db, get_read_db, hash_password
+from src.repository.user_cache import user_cache
 
 # Sync database setup for legacy tests
 SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
@@ -99,9 +100,19 @@ def client(test_db):
         def __init__(self, sync_session):
             self._session = sync_session
 
-        async def execute(self, statement):
+        @property
+        def bind(self):
+            """Engine the session is bound to"""
+            return self._session.get_bind()
+
+        @property
+        def info(self):
+            """Session info dictionary"""
+            return self._session.info
+
+        async def execute(self, statement, params=None):
             """Execute statement synchronously but return awaitable"""
-            return self._session.execute(statement)
+            return self._session.execute(statement, params)
 
         async def commit(self):
             """Commit transaction"""
@@ -151,16 +162,19 @@ def client(test_db):
 
     # Create a test app without lifespan to avoid PostgreSQL connection
     from fastapi import FastAPI
-    from src.api.routes import category, product, user
+    from src.api.routes import category, change, pricing, product, user
     from src.core.exception_handler import add_exception_handlers_to_app
 
     test_app = FastAPI()  # No lifespan for testing
     test_app.include_router(product.product)
     test_app.include_router(user.user)
     test_app.include_router(category.category)
+    test_app.include_router(pricing.pricing)
+    test_app.include_router(change.change)
     add_exception_handlers_to_app(app=test_app)
 
     test_app.dependency_overrides[get_db] = override_get_db
+    test_app.dependency_overrides[get_read_db] = override_get_db
 
     try:
         with TestClient(app=test_app) as test_client:
@@ -187,6 +201,8 @@ def test_db():
     finally:
         db.close()
         Base.metadata.drop_all(bind=engine)
+        # drop_all removes users without the commits that invalidate them
+        user_cache.clear()
 
 
 @pytest.fixture(scope="function")
@@ -202,9 +218,19 @@ def db_session(test_db):
         def __init__(self, sync_session):
             self._session = sync_session
 
-        async def execute(self, statement):
+        @property
+        def bind(self):
+            """Engine the session is bound to"""
+            return self._session.get_bind()
+
+        @property
+        def info(self):
+            """Session info dictionary"""
+            return self._session.info
+
+        async def execute(self, statement, params=None):
             """Execute statement synchronously but return awaitable"""
-            return self._session.execute(statement)
+            return self._session.execute(statement, params)
 
         async def commit(self):
             """Commit transaction"""
@@ -263,6 +289,7 @@ def sync_client(test_db):
             test_db.close()
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     with TestClient(app=app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -11,32 +11,31 @@ class TestConcretePrice:
         price = ConcretePrice(100.0)
         # Test that the object is initialized correctly
         assert price.amount == 100.0
-        # get_amount() returns None due to missing return statement in source
-        assert price.get_amount() is None
+        assert price.get_amount() == 100.0
 
     def test_concrete_price_zero_amount(self):
         """Test ConcretePrice with zero amount"""
         price = ConcretePrice(0.0)
         assert price.amount == 0.0
-        assert price.get_amount() is None
+        assert price.get_amount() == 0.0
 
     def test_concrete_price_negative_amount(self):
         """Test ConcretePrice with negative amount"""
         price = ConcretePrice(-50.0)
         assert price.amount == -50.0
-        assert price.get_amount() is None
+        assert price.get_amount() == -50.0
 
     def test_concrete_price_decimal_amount(self):
         """Test ConcretePrice with decimal amount"""
         price = ConcretePrice(99.99)
         assert price.amount == 99.99
-        assert price.get_amount() is None
+        assert price.get_amount() == 99.99
 
     def test_concrete_price_large_amount(self):
         """Test ConcretePrice with large amount"""
         price = ConcretePrice(999999.99)
         assert price.amount == 999999.99
-        assert price.get_amount() is None
+        assert price.get_amount() == 999999.99
 
 
 class TestDiscountDecorator:
@@ -46,8 +45,7 @@ class TestDiscountDecorator:
         discount_price = DiscountDecorator(base_price, 0.2)
         assert discount_price._price is base_price
         assert discount_price.discount_percentage == 0.2
-        # get_amount() fails due to missing return statements in source
-        # assert discount_price.get_amount() is None
+        assert discount_price.get_amount() == pytest.approx(80.0)
 
 
 class TestTaxDecorator:
@@ -57,8 +55,7 @@ class TestTaxDecorator:
         tax_price = TaxDecorator(base_price, 0.2)
         assert tax_price._price is base_price
         assert tax_price.tax_percentage == 0.2
-        # get_amount() fails due to missing return statements in source
-        # assert tax_price.get_amount() is None
+        assert tax_price.get_amount() == pytest.approx(120.0)
 
 
 class TestDecoratorPatternChaining:
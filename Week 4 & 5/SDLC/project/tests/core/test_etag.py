@@ -0,0 +1,54 @@
+# test_etag.py - Tests for ETag helpers
+from src.core.etag import etag_matches, if_match_holds, make_etag
+
+
+class TestMakeEtag:
+    """Test ETag construction"""
+
+    def test_parts_are_joined_and_quoted(self):
+        """Test parts become a single quoted strong tag"""
+        assert make_etag("product", 3, "v7") == '"product-3-v7"'
+
+
+class TestEtagMatches:
+    """Test If-None-Match comparison"""
+
+    def test_missing_header_never_matches(self):
+        """Test no header means the body must be sent"""
+        assert etag_matches(None, '"products-1"') is False
+
+    def test_match_in_tag_list(self):
+        """Test any tag in a comma separated list can match"""
+        assert etag_matches('"products-0", "products-1"', '"products-1"') is True
+
+    def test_weak_tag_matches_strong(self):
+        """Test If-None-Match uses weak comparison"""
+        assert etag_matches('W/"products-1"', '"products-1"') is True
+
+    def test_star_matches_anything(self):
+        """Test the wildcard matches any current representation"""
+        assert etag_matches("*", '"products-1"') is True
+
+    def test_stale_tag_does_not_match(self):
+        """Test an older tag does not match"""
+        assert etag_matches('"products-1"', '"products-2"') is False
+
+
+class TestIfMatchHolds:
+    """Test If-Match comparison"""
+
+    def test_missing_header_is_unconditional(self):
+        """Test no header means the write is not conditional"""
+        assert if_match_holds(None, '"product-1-v2-c1"') is True
+
+    def test_current_tag_holds(self):
+        """Test the current tag in a list lets the write through"""
+        assert if_match_holds('"a", "product-1-v2-c1"', '"product-1-v2-c1"') is True
+
+    def test_weak_tag_never_holds(self):
+        """Test If-Match uses strong comparison"""
+        assert if_match_holds('W/"product-1-v2-c1"', '"product-1-v2-c1"') is False
+
+    def test_stale_tag_does_not_hold(self):
+        """Test an older version is rejected"""
+        assert if_match_holds('"product-1-v1-c1"', '"product-1-v2-c1"') is False
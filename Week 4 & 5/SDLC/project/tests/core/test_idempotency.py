@@ -0,0 +1,215 @@
+# test_idempotency.py - Tests for Idempotency-Key handling
+import asyncio
+from time import time
+
+import pytest
+from starlette.requests import Request
+from src.core.exceptions import ConflictException
+from src.core.config import settings
+from src.core.idempotency import (
+    IdempotencyCache,
+    StoredResponse,
+    get_request_fingerprint,
+    idempotency_cache,
+    idempotent,
+)
+from src.repository.idempotency import claim_idempotency_key
+
+
+def make_request(
+    key: str, body: bytes = b'{"name": "a"}', email: str = "user@test.com"
+) -> Request:
+    """Build a POST request carrying an Idempotency-Key from a user"""
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/products",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", key.encode())],
+        "state": {"email": email},
+    }
+    return Request(scope, receive)
+
+
+def stored(fingerprint: str = "f", expires_at: float = None) -> StoredResponse:
+    """Completed response for cache tests"""
+    return StoredResponse(
+        fingerprint=fingerprint,
+        status_code=200,
+        body=b"{}",
+        expires_at=expires_at or time() + 60,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_idempotency_cache():
+    """Start every test with an empty front cache"""
+    idempotency_cache.clear()
+    yield
+    idempotency_cache.clear()
+
+
+class TestIdempotencyCache:
+    """Test suite for the in-memory front cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test the cache stays within maxsize"""
+        cache = IdempotencyCache(maxsize=2)
+        cache.put("a", stored())
+        cache.put("b", stored())
+        cache.get("a")
+        cache.put("c", stored())
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+
+    def test_expired_entry_is_dropped(self):
+        """Test entries past their TTL are not replayed"""
+        cache = IdempotencyCache(maxsize=2)
+        cache.put("a", stored(expires_at=time() - 1))
+
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_fingerprint_depends_on_body(self):
+        """Test different bodies give different fingerprints"""
+        request = make_request(key="k")
+
+        assert get_request_fingerprint(request, b"a") == get_request_fingerprint(
+            request, b"a"
+        )
+        assert get_request_fingerprint(request, b"a") != get_request_fingerprint(
+            request, b"b"
+        )
+
+
+class TestIdempotentDecorator:
+    """Test suite for the idempotent endpoint decorator"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_wait_for_first(self, db_session):
+        """Test duplicates sent while the first runs get its response"""
+        calls = []
+
+        @idempotent
+        async def endpoint(request, db):
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return {"status": "success", "message": {"call": len(calls)}}
+
+        responses = await asyncio.gather(
+            *[
+                endpoint(request=make_request(key="same"), db=db_session)
+                for _ in range(3)
+            ]
+        )
+
+        expected = b'{"status":"success","message":{"call":1}}'
+        assert len(calls) == 1
+        assert responses[0] == {"status": "success", "message": {"call": 1}}
+        assert all(response.body == expected for response in responses[1:])
+
+    @pytest.mark.asyncio
+    async def test_failure_releases_key(self, db_session):
+        """Test a failed first attempt can be retried with the same key"""
+        attempts = []
+
+        @idempotent
+        async def endpoint(request, db):
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("boom")
+            return {"status": "success"}
+
+        with pytest.raises(RuntimeError):
+            await endpoint(request=make_request(key="retry"), db=db_session)
+        result = await endpoint(request=make_request(key="retry"), db=db_session)
+
+        assert result == {"status": "success"}
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_different_request_with_same_key_conflicts(self, db_session):
+        """Test a key cannot be reused for another body"""
+
+        @idempotent
+        async def endpoint(request, db):
+            return {"status": "success"}
+
+        await endpoint(request=make_request(key="k"), db=db_session)
+        with pytest.raises(ConflictException):
+            await endpoint(request=make_request(key="k", body=b"{}"), db=db_session)
+
+    @pytest.mark.asyncio
+    async def test_without_header_runs_every_time(self, db_session):
+        """Test requests without the header are not deduplicated"""
+        calls = []
+
+        @idempotent
+        async def endpoint(request, db):
+            calls.append(1)
+            return {}
+
+        request = make_request(key="")
+        await endpoint(request=request, db=db_session)
+        await endpoint(request=request, db=db_session)
+
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_claim_is_taken_over(self, db_session):
+        """Test a claim whose holder never finished is retried after its lease"""
+        request = make_request(key="stale")
+        fingerprint = get_request_fingerprint(request, await request.body())
+        await claim_idempotency_key(
+            key="/products:user@test.com:stale",
+            fingerprint=fingerprint,
+            expires_at=time() - 1,
+            db=db_session,
+        )
+
+        @idempotent
+        async def endpoint(request, db):
+            return {"status": "success"}
+
+        result = await endpoint(request=make_request(key="stale"), db=db_session)
+
+        assert result == {"status": "success"}
+
+    @pytest.mark.asyncio
+    async def test_saved_response_outlives_lease(self, db_session, monkeypatch):
+        """Test a completed response is kept for the TTL, not the lease"""
+        monkeypatch.setattr(settings, "IDEMPOTENCY_LEASE", 0.0)
+        calls = []
+
+        @idempotent
+        async def endpoint(request, db):
+            calls.append(1)
+            return {"status": "success"}
+
+        await endpoint(request=make_request(key="kept"), db=db_session)
+        idempotency_cache.clear()
+        replay = await endpoint(request=make_request(key="kept"), db=db_session)
+
+        assert len(calls) == 1
+        assert replay.headers["Idempotent-Replayed"] == "true"
+
+    @pytest.mark.asyncio
+    async def test_same_key_from_other_user_runs(self, db_session):
+        """Test keys are scoped per user, so equal keys do not collide"""
+        calls = []
+
+        @idempotent
+        async def endpoint(request, db):
+            calls.append(1)
+            return {"status": "success"}
+
+        await endpoint(request=make_request(key="k", email="a@test.com"), db=db_session)
+        await endpoint(request=make_request(key="k", email="b@test.com"), db=db_session)
+
+        assert len(calls) == 2
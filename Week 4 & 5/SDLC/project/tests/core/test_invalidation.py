@@ -0,0 +1,159 @@
+# test_invalidation.py - Tests for the cache invalidation bus
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from src.core import invalidation
+from src.core.invalidation import InvalidationBus, encode_invalidations
+from src.core.jwt import VerifiedTokenCache
+from src.schema.token import TokenData
+
+
+def recording_bus() -> tuple[InvalidationBus, list]:
+    """Bus with one handler per scope recording what it receives"""
+    bus = InvalidationBus()
+    received = []
+    for scope in ("product", "user"):
+        bus.register(scope, lambda key, scope=scope: received.append((scope, key)))
+    return bus, received
+
+
+class TestEncodeInvalidations:
+    """Test NOTIFY payloads stay compact and under the size limit"""
+
+    def test_compact_json(self):
+        """Test keys are sorted and separators stripped"""
+        payload = encode_invalidations({"product": {3, 1}, "user": None})
+
+        assert payload == '{"product":[1,3],"user":null}'
+
+    def test_oversized_scope_sent_whole(self, monkeypatch):
+        """Test the largest scope collapses to null until the payload fits"""
+        monkeypatch.setattr(invalidation, "MAX_PAYLOAD", 40)
+
+        payload = encode_invalidations(
+            {"product": set(range(100)), "user": {"a@test.com"}}
+        )
+
+        assert json.loads(payload) == {"product": None, "user": ["a@test.com"]}
+
+
+class TestInvalidationBus:
+    """Test messages reach the registered handlers"""
+
+    def test_apply_dispatches_per_key(self):
+        """Test each key goes to its scope's handlers, unknown scopes ignored"""
+        bus, received = recording_bus()
+
+        bus.apply({"product": [1, 2], "product_category": [5], "user": None})
+
+        assert received == [("product", 1), ("product", 2), ("user", None)]
+
+    def test_receive_parses_notification(self):
+        """Test the asyncpg callback applies the payload"""
+        bus, received = recording_bus()
+
+        bus.receive(None, 1234, invalidation.CHANNEL, '{"user":["a@test.com"]}')
+
+        assert received == [("user", "a@test.com")]
+
+    def test_malformed_payload_clears_everything(self):
+        """Test an unreadable message drops every cache rather than none"""
+        bus, received = recording_bus()
+
+        bus.receive(None, 1234, invalidation.CHANNEL, "not json")
+
+        assert sorted(received) == [("product", None), ("user", None)]
+
+    def test_failing_handler_does_not_stop_others(self):
+        """Test one broken cache cannot leave another stale"""
+        bus, received = recording_bus()
+        bus.register("product", lambda key: 1 / 0)
+        bus.register("product", lambda key: received.append(("second", key)))
+
+        bus.apply({"product": [7]})
+
+        assert ("second", 7) in received
+
+
+class FlakyListenEngine:
+    """Postgres engine stand-in whose first connect fails"""
+
+    def __init__(self, dialect_name: str = "postgresql"):
+        self.dialect = SimpleNamespace(name=dialect_name)
+        self.attempts = 0
+        self.listeners = {}
+        self.driver_connection = self
+
+    async def connect(self):
+        self.attempts += 1
+        if self.attempts == 1:
+            raise OSError("connection refused")
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+    def add_termination_listener(self, callback):
+        pass
+
+    def remove_termination_listener(self, callback):
+        pass
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        self.listeners.pop(channel, None)
+
+    async def close(self):
+        pass
+
+
+class TestStart:
+    """Test the bus gets to LISTEN on postgres only"""
+
+    @pytest.mark.asyncio
+    async def test_failed_first_listen_is_retried(self):
+        """Test a database down at startup is retried in the background"""
+        engine = FlakyListenEngine()
+        bus = InvalidationBus(reconnect_delay=0)
+
+        await bus.start(listen_engine=engine)
+        assert not bus.listening
+        await asyncio.wait_for(bus._reconnect_task, timeout=1)
+
+        assert bus.listening
+        assert invalidation.CHANNEL in engine.listeners
+        await bus.stop()
+
+    @pytest.mark.asyncio
+    async def test_other_dialects_do_not_listen(self):
+        """Test sqlite is not connected to, nor retried"""
+        engine = FlakyListenEngine(dialect_name="sqlite")
+        bus = InvalidationBus(reconnect_delay=0)
+
+        await bus.start(listen_engine=engine)
+
+        assert engine.attempts == 0
+        assert bus._reconnect_task is None
+        assert not bus.listening
+        await bus.stop()
+
+
+class TestTokenCacheInvalidation:
+    """Test the verified token cache drops a written user's tokens"""
+
+    def test_discard_email(self):
+        """Test only the written user's tokens are removed"""
+        cache = VerifiedTokenCache(maxsize=10)
+        cache.put("a", TokenData(email="a@test.com", role="user"), 9e9)
+        cache.put("b", TokenData(email="b@test.com", role="user"), 9e9)
+
+        cache.discard_email("a@test.com")
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        cache.discard_email(None)
+        assert len(cache) == 0
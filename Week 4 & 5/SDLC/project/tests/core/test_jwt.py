@@ -1,9 +1,17 @@
 # test_jwt.py - Tests for JWT authentication functionality
 from datetime import datetime, timedelta
+from time import time
+from unittest.mock import patch
 
 import jwt
 from src.core.config import settings
-from src.core.jwt import create_access_token, decode_access_token
+from src.core.jwt import (
+    VerifiedTokenCache,
+    create_access_token,
+    decode_access_token,
+    verified_token_cache,
+)
+from src.schema.token import TokenData
 
 
 class TestCreateAccessToken:
@@ -91,3 +99,41 @@ class TestCreateAccessToken:
         if settings.ALGORITHM == "HS256":
             payload = decode_access_token(token)
             assert payload.email == "wrongalgo@example.com"
+
+
+class TestVerifiedTokenCache:
+    """Test suite for the verified-token LRU cache"""
+
+    def test_decode_populates_cache(self):
+        """Test a verified token is served from cache on the next decode"""
+        verified_token_cache.clear()
+        token = create_access_token(data={"sub": "cache@example.com", "role": "staff"})
+
+        first = decode_access_token(token)
+        assert len(verified_token_cache) == 1
+
+        with patch("src.core.jwt.jwt.decode") as mock_decode:
+            second = decode_access_token(token)
+            mock_decode.assert_not_called()
+        assert second == first
+
+    def test_expired_entry_is_dropped(self):
+        """Test an entry past its exp claim is not returned"""
+        cache = VerifiedTokenCache(maxsize=4)
+        cache.put("token", TokenData(email="a@b.com", role="staff"), time() - 1)
+
+        assert cache.get("token") is None
+        assert len(cache) == 0
+
+    def test_least_recently_used_is_evicted(self):
+        """Test the cache never grows beyond maxsize"""
+        cache = VerifiedTokenCache(maxsize=2)
+        expires_at = time() + 60
+        cache.put("one", TokenData(email="1@b.com", role="staff"), expires_at)
+        cache.put("two", TokenData(email="2@b.com", role="staff"), expires_at)
+        cache.get("one")
+        cache.put("three", TokenData(email="3@b.com", role="staff"), expires_at)
+
+        assert cache.get("two") is None
+        assert cache.get("one").email == "1@b.com"
+        assert cache.get("three").email == "3@b.com"
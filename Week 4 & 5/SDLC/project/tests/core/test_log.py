@@ -0,0 +1,99 @@
+# test_log.py - Tests for the structured logging pipeline
+import io
+import threading
+
+import pytest
+import structlog
+from src.core import log
+from src.core.log import (
+    LogFormat,
+    LogSettings,
+    QueueLogger,
+    QueueLogWriter,
+    make_sampling_processor,
+)
+
+
+class TestSamplingProcessor:
+    """Test level-aware sampling"""
+
+    def test_rate_zero_drops_event(self):
+        """Test a zero rate drops every event at that level"""
+        processor = make_sampling_processor(rates={"debug": 0.0})
+        with pytest.raises(structlog.DropEvent):
+            processor(None, "debug", {"event": "x"})
+
+    def test_unsampled_level_is_kept(self):
+        """Test levels without a rate pass through untouched"""
+        processor = make_sampling_processor(rates={"debug": 0.0})
+        event_dict = {"event": "x"}
+        assert processor(None, "error", event_dict) is event_dict
+
+
+class TestLogSettings:
+    """Test environment-derived logging defaults"""
+
+    def test_production_defaults_to_json_and_queue(self):
+        """Test production resolves to JSON output through the queue writer"""
+        settings = LogSettings.model_construct(
+            environment="production", LOG_FORMAT=None, LOG_QUEUE_WRITER=None
+        )
+        assert settings.log_format == LogFormat.JSON
+        assert settings.use_queue_writer is True
+        assert settings.is_development is False
+
+    def test_explicit_format_wins(self):
+        """Test LOG_FORMAT overrides the environment default"""
+        settings = LogSettings.model_construct(
+            environment="production",
+            LOG_FORMAT=LogFormat.CONSOLE,
+            LOG_QUEUE_WRITER=False,
+        )
+        assert settings.log_format == LogFormat.CONSOLE
+        assert settings.use_queue_writer is False
+
+
+class TestQueueLogWriter:
+    """Test the background log writer"""
+
+    def test_stop_flushes_pending_lines(self, monkeypatch):
+        """Test every queued line is written before stop returns"""
+        stream = io.StringIO()
+        writer = QueueLogWriter(maxsize=100, stream=stream)
+        monkeypatch.setattr(log, "_queue_writer", writer)
+        logger = QueueLogger()
+        for i in range(10):
+            logger.info(f"line {i}")
+        writer.stop()
+
+        assert stream.getvalue().splitlines() == [f"line {i}" for i in range(10)]
+
+    def test_cached_logger_follows_new_writer(self, monkeypatch):
+        """Test a logger from before a restart writes to the new writer"""
+        streams = [io.StringIO(), io.StringIO()]
+        logger = QueueLogger()
+        for i, stream in enumerate(streams):
+            monkeypatch.setattr(
+                log, "_queue_writer", QueueLogWriter(maxsize=100, stream=stream)
+            )
+            logger.info(f"run {i}")
+            log.shutdown_logging()
+
+        assert [stream.getvalue() for stream in streams] == ["run 0\n", "run 1\n"]
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test writes never block when the writer thread is stuck"""
+        release = threading.Event()
+
+        class BlockingStream(io.StringIO):
+            def write(self, text):
+                release.wait(timeout=5)
+                return super().write(text)
+
+        writer = QueueLogWriter(maxsize=1, stream=BlockingStream())
+        for i in range(20):
+            writer.write(f"line {i}")
+
+        assert writer.dropped > 0
+        release.set()
+        writer.stop()
@@ -0,0 +1,89 @@
+# test_metrics.py - Tests for request latency metrics
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from src.core.metrics import (
+    Histogram,
+    MetricsRegistry,
+    escape_label_value,
+    get_route_template,
+)
+
+
+class TestHistogram:
+    """Test suite for the bucket histogram"""
+
+    def test_observations_land_in_cumulative_buckets(self):
+        """Test cumulative counts and the +Inf bucket"""
+        histogram = Histogram(buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        assert histogram.cumulative_counts() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+        assert histogram.count == 4
+        assert histogram.total == 3.65
+
+
+class TestMetricsRegistry:
+    """Test suite for Prometheus rendering"""
+
+    def test_render_latency_and_in_flight(self):
+        """Test rendered output contains bucket, sum, count and gauge series"""
+        registry = MetricsRegistry(buckets=(0.1,))
+        registry.observe_request(
+            method="GET", route="/products", status=200, seconds=0.05
+        )
+        registry.add_in_flight(method="GET", delta=1)
+
+        text = registry.render(extra_gauges={"db_pool_idle": 3})
+
+        assert (
+            'http_request_duration_seconds_bucket{method="GET",route="/products",'
+            'status="200",le="0.1"} 1' in text
+        )
+        assert (
+            'http_request_duration_seconds_count{method="GET",route="/products",'
+            'status="200"} 1' in text
+        )
+        assert 'http_requests_in_flight{method="GET"} 1' in text
+        assert "db_pool_idle 3" in text
+        assert text.endswith("\n")
+
+    def test_escape_label_value(self):
+        """Test quotes and backslashes are escaped"""
+        assert escape_label_value('a"b\\c') == 'a\\"b\\\\c'
+
+
+class TestRouteTemplate:
+    """Test route template resolution"""
+
+    def make_app(self, seen: list) -> FastAPI:
+        """App whose middleware reads the template after dispatch"""
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def record_route(request: Request, call_next):
+            response = await call_next(request)
+            seen.append(get_route_template(request=request))
+            return response
+
+        @app.get("/items/{item_id}")
+        async def read_item(item_id: int):
+            return {}
+
+        return app
+
+    def test_template_not_raw_path(self):
+        """Test path parameters resolve to the template"""
+        seen = []
+        with TestClient(self.make_app(seen)) as client:
+            client.get("/items/42")
+
+        assert seen == ["/items/{item_id}"]
+
+    def test_unmatched_path(self):
+        """Test a 404 is labelled unmatched, not with its raw path"""
+        seen = []
+        with TestClient(self.make_app(seen)) as client:
+            client.get("/nowhere/42")
+
+        assert seen == ["unmatched"]
@@ -0,0 +1,22 @@
+# test_responses.py - Tests for the JSON response class
+import json
+
+from src.core.responses import FastJSONResponse
+
+
+class TestFastJSONResponse:
+    """Test suite for FastJSONResponse rendering"""
+
+    def test_render_round_trips(self):
+        """Test the body decodes back to the original content"""
+        content = {"status": "success", "message": {"products": [{"id": 1}]}}
+        response = FastJSONResponse(content=content)
+
+        assert json.loads(response.body) == content
+        assert response.media_type == "application/json"
+
+    def test_non_ascii_is_utf8(self):
+        """Test non ASCII text is encoded as UTF-8, not escaped"""
+        response = FastJSONResponse(content={"name": "café"})
+
+        assert "café".encode("utf-8") in response.body
@@ -0,0 +1,37 @@
+# test_startup_profiler.py - Tests for boot phase timings
+from src.core.startup_profiler import StartupProfiler
+
+
+class TestStartupProfiler:
+    """Test phases are timed and reported"""
+
+    def test_mark_times_since_previous_mark(self):
+        """Test marks split the clock into consecutive phases"""
+        profiler = StartupProfiler()
+        profiler.mark("imports")
+        profiler.mark("app setup")
+
+        assert list(profiler.phases) == ["imports", "app setup"]
+        assert all(seconds >= 0 for seconds in profiler.phases.values())
+
+    def test_phase_accumulates(self):
+        """Test a phase entered twice adds up"""
+        profiler = StartupProfiler()
+        with profiler.phase("schema"):
+            pass
+        first = profiler.phases["schema"]
+        with profiler.phase("schema"):
+            pass
+
+        assert profiler.phases["schema"] >= first
+
+    def test_stats_include_total_once_finished(self):
+        """Test total is only reported after finish"""
+        profiler = StartupProfiler()
+        with profiler.phase("logging"):
+            pass
+
+        assert "total" not in profiler.stats()
+        profiler.finish()
+        stats = profiler.stats()
+        assert stats["total"] >= stats["logging"]
@@ -0,0 +1,94 @@
+# test_work_queue.py - Tests for the background work queue
+import asyncio
+
+import pytest
+from src.core.work_queue import WorkQueue
+
+
+def make_queue(**overrides) -> WorkQueue:
+    """Queue with fast retries for tests"""
+    options = {"maxsize": 10, "workers": 2, "max_retries": 2, "retry_delay": 0.001}
+    return WorkQueue(**{**options, **overrides})
+
+
+class TestWorkQueue:
+    """Test suite for WorkQueue"""
+
+    @pytest.mark.asyncio
+    async def test_drain_runs_every_queued_job(self):
+        """Test drain waits for all accepted jobs"""
+        queue = make_queue()
+        done = []
+
+        async def job(value):
+            await asyncio.sleep(0)
+            done.append(value)
+
+        queue.start()
+        for i in range(5):
+            assert queue.submit("job", job, value=i) is True
+        await queue.drain(timeout=1)
+
+        assert sorted(done) == [0, 1, 2, 3, 4]
+        assert queue.stats()["processed"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failing_job_is_retried(self):
+        """Test a job succeeding on its last attempt counts as processed"""
+        queue = make_queue()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("transient")
+
+        queue.start()
+        queue.submit("flaky", flaky)
+        await queue.drain(timeout=1)
+
+        assert len(attempts) == 3
+        assert queue.stats()["retried"] == 2
+        assert queue.stats()["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_exhausted_retries_count_as_failed(self):
+        """Test a job that never succeeds is given up on"""
+        queue = make_queue(max_retries=1)
+
+        async def broken():
+            raise RuntimeError("permanent")
+
+        queue.start()
+        queue.submit("broken", broken)
+        await queue.drain(timeout=1)
+
+        assert queue.stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_without_blocking(self):
+        """Test submit refuses jobs beyond maxsize"""
+        queue = make_queue(maxsize=1, workers=1)
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+
+        queue.start()
+        queue.submit("first", blocked)
+        await asyncio.sleep(0)  # worker takes the first job
+        queue.submit("second", blocked)
+
+        assert queue.submit("third", blocked) is False
+        assert queue.stats()["rejected"] == 1
+        release.set()
+        await queue.drain(timeout=1)
+
+    def test_submit_before_start_is_rejected(self):
+        """Test jobs are refused when the queue is not running"""
+        queue = make_queue()
+
+        async def job():
+            pass
+
+        assert queue.submit("job", job) is False
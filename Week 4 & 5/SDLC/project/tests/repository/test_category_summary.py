@@ -0,0 +1,129 @@
+# test_category_summary.py - Tests for the category summary read model
+import pytest
+from sqlalchemy import select
+from src.core.config import settings
+from src.models.category import Category
+from src.models.category_summary import CategorySummary
+from src.models.category_summary_delta import CategorySummaryDelta
+from src.models.product import Product
+from src.repository.category_summary import (
+    backfill_category_summary,
+    compact_summary_deltas,
+    get_category_summary_rows,
+    refresh_category_summary,
+)
+
+
+@pytest.fixture
+def materialized(monkeypatch):
+    """Enable the materialized summary for one test"""
+    monkeypatch.setattr(settings, "CATEGORY_SUMMARY_MATERIALIZED", True)
+
+
+def read_summary(test_db) -> dict[int, tuple]:
+    """Read the materialized summary rows plus their pending deltas"""
+    totals: dict[int, tuple] = {}
+    for model in (CategorySummary, CategorySummaryDelta):
+        for row in test_db.execute(select(model)).scalars():
+            count, quantity, value = totals.get(row.category_id, (0, 0, 0.0))
+            totals[row.category_id] = (
+                count + row.product_count,
+                quantity + row.total_quantity,
+                value + row.stock_value,
+            )
+    return totals
+
+
+class TestAggregateSummary:
+    """Test the GROUP BY path"""
+
+    @pytest.mark.asyncio
+    async def test_counts_and_stock_value(
+        self, db_session, products_with_different_categories
+    ):
+        """Test per category aggregates, including the multi product category"""
+        rows = await get_category_summary_rows(db=db_session)
+        by_id = {row["category_id"]: row for row in rows}
+
+        assert len(rows) == 4
+        assert by_id[1]["product_count"] == 2
+        assert by_id[1]["total_quantity"] == 30
+        assert by_id[1]["stock_value"] == 5 * 1500 + 25 * 30
+
+    @pytest.mark.asyncio
+    async def test_empty_category_is_zero(self, db_session, multiple_categories):
+        """Test categories without products are reported with zeros"""
+        rows = await get_category_summary_rows(db=db_session)
+
+        assert all(row["product_count"] == 0 for row in rows)
+
+
+class TestMaterializedSummary:
+    """Test incremental maintenance from product writes"""
+
+    def test_insert_update_delete_deltas(self, test_db, materialized):
+        """Test every kind of product write keeps the summary exact"""
+        test_db.add_all([Category(id=1, name="a"), Category(id=2, name="b")])
+        test_db.add_all(
+            [
+                Product(id=1, name="p1", quantity=2, price=10, category_id=1),
+                Product(id=2, name="p2", quantity=3, price=5, category_id=1),
+            ]
+        )
+        test_db.commit()
+        assert read_summary(test_db) == {1: (2, 5, 35.0)}
+
+        product = test_db.get(Product, 1)
+        product.quantity = 4
+        test_db.commit()
+        assert read_summary(test_db) == {1: (2, 7, 55.0)}
+
+        product = test_db.get(Product, 2)
+        product.category_id = 2
+        test_db.commit()
+        assert read_summary(test_db) == {1: (1, 4, 40.0), 2: (1, 3, 15.0)}
+
+        test_db.delete(test_db.get(Product, 1))
+        test_db.commit()
+        assert read_summary(test_db)[1] == (0, 0, 0.0)
+
+    @pytest.mark.asyncio
+    async def test_compaction_folds_deltas(self, db_session, test_db, materialized):
+        """Test writes only append deltas until a compaction folds them"""
+        test_db.add(Category(id=1, name="a"))
+        test_db.add(Product(id=1, name="p1", quantity=2, price=10, category_id=1))
+        test_db.commit()
+        product = test_db.get(Product, 1)
+        product.quantity = 4
+        test_db.commit()
+        assert test_db.query(CategorySummary).count() == 0
+        assert test_db.query(CategorySummaryDelta).count() == 2
+
+        assert await compact_summary_deltas(db=db_session) == 2
+
+        assert test_db.query(CategorySummaryDelta).count() == 0
+        assert read_summary(test_db) == {1: (1, 4, 40.0)}
+        rows = await get_category_summary_rows(db=db_session)
+        assert rows[0]["total_quantity"] == 4
+
+    @pytest.mark.asyncio
+    async def test_refresh_rebuilds_from_products(
+        self, test_db, db_session, products_with_different_categories, materialized
+    ):
+        """Test a rebuild covers rows written while the summary was off"""
+        await refresh_category_summary(db=db_session)
+        await db_session.commit()
+
+        rows = await get_category_summary_rows(db=db_session)
+        assert [row["product_count"] for row in rows] == [2, 1, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_backfill_builds_empty_summary_once(
+        self, test_db, db_session, products_with_different_categories, materialized
+    ):
+        """Test turning the flag on for an existing database serves its products"""
+        assert await backfill_category_summary(db=db_session)
+        assert not await backfill_category_summary(db=db_session)
+
+        rows = await get_category_summary_rows(db=db_session)
+        assert [row["product_count"] for row in rows] == [2, 1, 1, 1]
@@ -0,0 +1,165 @@
+# test_change_log.py - Tests for the change log behind the /changes feed
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from src.models.category import Category
+from src.models.change_log import ChangeLog
+from src.models.product import Product
+from src.repository.change_log import (
+    delete_expired_changes,
+    get_change_page,
+    get_changes_stmt,
+    get_latest_cursor,
+)
+from src.repository.stock import adjust_stock
+
+
+def read_log(test_db) -> list[tuple[str, int, str]]:
+    """Read the change log in cursor order"""
+    rows = test_db.execute(select(ChangeLog).order_by(ChangeLog.id)).scalars()
+    return [(row.table_name, row.row_id, row.operation) for row in rows]
+
+
+class TestFlushedChanges:
+    """Test changes appended by the after_flush hook"""
+
+    def test_insert_update_delete(self, test_db, sample_category):
+        """Test each write of a product is logged in order"""
+        product = Product(name="Lamp", price=20, quantity=3, category_id=1)
+        test_db.add(product)
+        test_db.commit()
+        product.price = 25
+        test_db.commit()
+        test_db.delete(product)
+        test_db.commit()
+
+        assert read_log(test_db) == [
+            ("product_category", 1, "upsert"),
+            ("product", product.id, "upsert"),
+            ("product", product.id, "upsert"),
+            ("product", product.id, "delete"),
+        ]
+
+    def test_unchanged_rows_are_not_logged(self, test_db, sample_product):
+        """Test a flush without real modifications appends nothing"""
+        before = read_log(test_db)
+        sample_product.quantity = sample_product.quantity
+        test_db.commit()
+
+        assert read_log(test_db) == before
+
+    def test_rollback_discards_changes(self, test_db, sample_category):
+        """Test the log commits or rolls back with the rows"""
+        before = read_log(test_db)
+        test_db.add(Product(name="Gone", price=1, quantity=1, category_id=1))
+        test_db.flush()
+        test_db.rollback()
+
+        assert read_log(test_db) == before
+
+    def test_category_delete_logs_cascaded_products(
+        self, test_db, products_with_different_categories
+    ):
+        """Test products removed by ON DELETE CASCADE are logged as deletes"""
+        test_db.expunge_all()
+        test_db.delete(test_db.get(Category, 1))
+        test_db.commit()
+
+        assert read_log(test_db)[-3:] == [
+            ("product", 1, "delete"),
+            ("product", 5, "delete"),
+            ("product_category", 1, "delete"),
+        ]
+
+
+class TestBulkChanges:
+    """Test changes appended by statements that bypass the flush"""
+
+    @pytest.mark.asyncio
+    async def test_stock_reservation_is_logged(
+        self, db_session, test_db, products_with_different_categories
+    ):
+        """Test every reserved product is logged as an upsert"""
+        before = await get_latest_cursor(db=db_session)
+
+        await adjust_stock(lines=[(3, 1), (2, 1)], reserve=True, db=db_session)
+        await db_session.commit()
+
+        assert read_log(test_db)[-2:] == [
+            ("product", 2, "upsert"),
+            ("product", 3, "upsert"),
+        ]
+        # one transaction, one cursor
+        assert await get_latest_cursor(db=db_session) == before + 1
+
+
+class TestCursor:
+    """Test the transaction id cursor and its paging"""
+
+    def test_changes_share_their_transaction_id(self, test_db, sample_category):
+        """Test every flush of a transaction is stamped with one cursor"""
+        test_db.add(Product(name="A", price=1, quantity=1, category_id=1))
+        test_db.flush()
+        test_db.add(Product(name="B", price=1, quantity=1, category_id=1))
+        test_db.commit()
+
+        rows = test_db.execute(select(ChangeLog).order_by(ChangeLog.id)).scalars()
+        txids = [row.txid for row in rows]
+        assert txids[0] < txids[1] == txids[2]
+
+    def test_postgres_reads_only_finished_transactions(self):
+        """Test the page query stops below the oldest running transaction"""
+        stmt = get_changes_stmt(since=5, limit=10, dialect_name="postgresql")
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "pg_snapshot_xmin(pg_current_snapshot())" in sql
+        assert "ORDER BY change_log.txid, change_log.id" in sql
+
+    @pytest.mark.asyncio
+    async def test_page_ends_on_a_whole_transaction(
+        self, db_session, test_db, sample_category
+    ):
+        """Test a transaction is never split across pages"""
+        since = await get_latest_cursor(db=db_session)
+        test_db.add(Product(name="A", price=1, quantity=1, category_id=1))
+        test_db.commit()
+        test_db.add_all(
+            [Product(name=name, price=1, quantity=1, category_id=1) for name in "BC"]
+        )
+        test_db.commit()
+
+        page, has_more = await get_change_page(since=since, limit=2, db=db_session)
+        assert [row.row_id for row in page] == [1]
+        assert has_more
+
+        page, has_more = await get_change_page(
+            since=page[-1].txid, limit=1, db=db_session
+        )
+        assert [row.row_id for row in page] == [2, 3]
+
+
+class TestRetention:
+    """Test old changes are pruned"""
+
+    @pytest.mark.asyncio
+    async def test_old_changes_are_deleted(
+        self, db_session, test_db, sample_category, monkeypatch
+    ):
+        """Test expired changes go, each table's newest transaction stays"""
+        product = Product(name="Old", price=1, quantity=1, category_id=1)
+        test_db.add(product)
+        test_db.commit()
+        product.price = 2
+        test_db.commit()
+        test_db.execute(ChangeLog.__table__.update().values(changed_at=0))
+        test_db.commit()
+        latest = await get_latest_cursor(db=db_session)
+
+        deleted = await delete_expired_changes(retention=60, db=db_session)
+
+        assert deleted == 1
+        assert read_log(test_db) == [
+            ("product_category", 1, "upsert"),
+            ("product", product.id, "upsert"),
+        ]
+        assert await get_latest_cursor(db=db_session) == latest
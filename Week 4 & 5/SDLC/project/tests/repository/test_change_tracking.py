@@ -0,0 +1,67 @@
+# test_change_tracking.py - Tests for table versions read from the change log
+import pytest
+from sqlalchemy.dialects import postgresql
+from src.models.category import Category
+from src.models.product import Product
+from src.repository.change_tracking import get_table_version, get_table_version_stmt
+
+
+class TestTableVersions:
+    """Test versions move with committed writes to their table only"""
+
+    @pytest.mark.asyncio
+    async def test_insert_changes_only_written_table(self, db_session, test_db):
+        """Test adding a category leaves the product version alone"""
+        products = await get_table_version(table_name="product", db=db_session)
+        categories = await get_table_version(
+            table_name="product_category", db=db_session
+        )
+        test_db.add(Category(id=1, name="Lighting"))
+        test_db.commit()
+
+        assert products == categories == "0"
+        assert await get_table_version(table_name="product", db=db_session) == "0"
+        assert (
+            await get_table_version(table_name="product_category", db=db_session)
+            != categories
+        )
+
+    @pytest.mark.asyncio
+    async def test_update_changes_version(self, db_session, test_db, sample_product):
+        """Test an update changes the table version and the row version"""
+        before = await get_table_version(table_name="product", db=db_session)
+        sample_product.quantity = 1
+        test_db.commit()
+
+        after = await get_table_version(table_name="product", db=db_session)
+        assert after != before
+        assert len(after) == 40  # sha1 digest, however many txids
+        assert sample_product.version == 2
+
+    @pytest.mark.asyncio
+    async def test_unmodified_dirty_object_keeps_version(
+        self, db_session, test_db, sample_product
+    ):
+        """Test setting an attribute to its current value is not a change"""
+        before = await get_table_version(table_name="product", db=db_session)
+        sample_product.quantity = sample_product.quantity
+        test_db.commit()
+
+        assert await get_table_version(table_name="product", db=db_session) == before
+
+    @pytest.mark.asyncio
+    async def test_rollback_keeps_version(self, db_session, test_db, sample_category):
+        """Test the version moves with the transaction"""
+        test_db.add(Product(id=9, name="Rolled", quantity=1, price=1, category_id=1))
+        test_db.flush()
+        test_db.rollback()
+
+        assert await get_table_version(table_name="product", db=db_session) == "0"
+
+    def test_postgres_version_includes_recent_commits(self):
+        """Test postgres reads commits above xmin with the newest finished one"""
+        stmt = get_table_version_stmt(table_name="product", dialect_name="postgresql")
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "pg_snapshot_xmin" in sql
+        assert "DISTINCT" in sql
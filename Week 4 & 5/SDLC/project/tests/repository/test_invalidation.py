@@ -0,0 +1,88 @@
+# test_invalidation.py - Tests for publishing invalidations on commit
+import subprocess
+import sys
+
+import pytest
+from src.core.invalidation import invalidation_bus
+from src.models.category import Category
+from src.models.product import Product
+from src.repository.invalidation import PRODUCT_SCOPE, USER_SCOPE
+from src.repository.stock import adjust_stock
+
+
+@pytest.fixture
+def received(monkeypatch) -> list:
+    """Record what the global bus applies, without the app's own caches"""
+    monkeypatch.setattr(invalidation_bus, "handlers", {})
+    received = []
+    for scope in (PRODUCT_SCOPE, USER_SCOPE):
+        invalidation_bus.register(
+            scope, lambda key, scope=scope: received.append((scope, key))
+        )
+    return received
+
+
+class TestPublishOnCommit:
+    """Test written rows are invalidated once their transaction commits"""
+
+    def test_flushed_write(self, test_db, received, multiple_products):
+        """Test an ORM update invalidates the product after commit only"""
+        received.clear()
+        test_db.get(Product, 2).price = 60
+        test_db.flush()
+
+        assert received == []
+        test_db.commit()
+        assert received == [(PRODUCT_SCOPE, 2)]
+
+    def test_rollback_publishes_nothing(self, test_db, received, multiple_products):
+        """Test a rolled back write leaves caches alone"""
+        received.clear()
+        test_db.get(Product, 2).price = 60
+        test_db.flush()
+        test_db.rollback()
+
+        assert received == []
+
+    def test_user_keyed_by_email(self, test_db, received, admin_user):
+        """Test users are invalidated under their email"""
+        received.clear()
+        admin_user.name = "Renamed"
+        test_db.commit()
+
+        assert received == [(USER_SCOPE, admin_user.email)]
+
+    def test_category_delete_clears_products(
+        self, test_db, received, multiple_products
+    ):
+        """Test products removed by the cascade are covered"""
+        received.clear()
+        test_db.delete(test_db.get(Category, multiple_products[0].category_id))
+        test_db.commit()
+
+        assert received == [(PRODUCT_SCOPE, None)]
+
+    @pytest.mark.asyncio
+    async def test_bulk_update(self, db_session, received, multiple_products):
+        """Test statements bypassing the flush queue their rows"""
+        received.clear()
+        await adjust_stock(lines=[(1, 2), (3, 1)], reserve=True, db=db_session)
+        await db_session.commit()
+
+        assert sorted(received) == [(PRODUCT_SCOPE, 1), (PRODUCT_SCOPE, 3)]
+
+
+class TestListenerRegistration:
+    """Test loading a model is enough to register the session listeners"""
+
+    def test_model_import_registers_listeners(self):
+        """Test a fresh interpreter importing one model has every listener"""
+        code = (
+            "import sys, src.models.user; "
+            "sys.exit(not {'src.repository.invalidation', "
+            "'src.repository.change_log', 'src.repository.category_summary'}"
+            " <= set(sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True)
+
+        assert result.returncode == 0, result.stderr.decode()
@@ -0,0 +1,60 @@
+# test_migrations.py - Tests for the alembic head check used by fast boot
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.repository.migrations import get_script_heads, schema_at_head
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path):
+    """Engine on an empty sqlite file"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'boot.db'}")
+    yield engine
+    await engine.dispose()
+
+
+async def stamp(engine, revision: str) -> None:
+    """Write a revision into alembic_version the way alembic does"""
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("CREATE TABLE alembic_version (version_num VARCHAR(32) PRIMARY KEY)")
+        )
+        await conn.execute(
+            text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision}
+        )
+
+
+class TestSchemaAtHead:
+    """Test create_all is only skipped for a database at head"""
+
+    def test_reads_single_head(self):
+        """Test the shipped migrations have one head"""
+        assert len(get_script_heads()) == 1
+
+    @pytest.mark.asyncio
+    async def test_unstamped_database(self, file_engine):
+        """Test a database alembic never ran on is not at head"""
+        assert await schema_at_head(engine=file_engine) is False
+
+    @pytest.mark.asyncio
+    async def test_stamped_with_head(self, file_engine):
+        """Test a database stamped with the head is at head"""
+        (head,) = get_script_heads()
+        await stamp(file_engine, revision=head)
+
+        assert await schema_at_head(engine=file_engine) is True
+
+    @pytest.mark.asyncio
+    async def test_stamped_with_older_revision(self, file_engine):
+        """Test a database behind the scripts is not at head"""
+        await stamp(file_engine, revision="3d6e1f9a2b84")
+
+        assert await schema_at_head(engine=file_engine) is False
+
+    @pytest.mark.asyncio
+    async def test_missing_scripts(self, file_engine, tmp_path):
+        """Test an image without alembic.ini falls back to create_all"""
+        ini_path = tmp_path / "alembic.ini"
+
+        assert await schema_at_head(engine=file_engine, ini_path=ini_path) is False
@@ -0,0 +1,80 @@
+# test_pool.py - Tests for connection pool instrumentation
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.repository.pool import (
+    InstrumentedQueuePool,
+    PoolMetrics,
+    get_pool_status,
+    pool_metrics,
+)
+
+
+@pytest.fixture
+def small_pool_engine():
+    """Async sqlite engine with a single pooled connection and no overflow"""
+    pool_metrics.reset()
+    return create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+
+
+class TestPoolMetrics:
+    """Test PoolMetrics counters"""
+
+    def test_snapshot_empty(self):
+        """Test snapshot of fresh metrics has zero waits"""
+        metrics = PoolMetrics()
+        assert metrics.snapshot() == {
+            "checkouts": 0,
+            "timeouts": 0,
+            "avg_wait_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+
+    def test_record_checkout_and_timeout(self):
+        """Test checkouts and timeouts are counted separately"""
+        metrics = PoolMetrics()
+        metrics.record_checkout(wait=0.002)
+        metrics.record_checkout(wait=0.004, timed_out=True)
+
+        snapshot = metrics.snapshot()
+        assert snapshot["checkouts"] == 1
+        assert snapshot["timeouts"] == 1
+        assert snapshot["avg_wait_ms"] == 3.0
+        assert snapshot["max_wait_ms"] == 4.0
+
+
+class TestInstrumentedQueuePool:
+    """Test pool status reporting against a real async engine"""
+
+    @pytest.mark.asyncio
+    async def test_status_reports_checked_out_connection(self, small_pool_engine):
+        """Test checked out and idle counts while a connection is held"""
+        async with small_pool_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            status = get_pool_status(engine=small_pool_engine)
+            assert status["checked_out"] == 1
+            assert status["idle"] == 0
+            assert status["size"] == 1
+
+        status = get_pool_status(engine=small_pool_engine)
+        assert status["checked_out"] == 0
+        assert status["idle"] == 1
+        assert status["checkouts"] >= 1
+        await small_pool_engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_recorded(self, small_pool_engine):
+        """Test a checkout that exceeds pool_timeout is counted"""
+        async with small_pool_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                async with small_pool_engine.connect():
+                    pass
+
+        assert get_pool_status(engine=small_pool_engine)["timeouts"] == 1
+        await small_pool_engine.dispose()
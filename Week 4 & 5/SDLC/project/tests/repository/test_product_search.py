@@ -0,0 +1,72 @@
+# test_product_search.py - Tests for product name search on the sqlite FTS5 path
+import pytest
+from src.models.product import Product
+from src.repository.product_search import (
+    escape_like,
+    get_search_tokens,
+    search_products,
+)
+
+
+@pytest.fixture
+def searchable_products(test_db, sample_category):
+    """Products with overlapping names"""
+    products = [
+        Product(id=1, name="Laptop Stand", price=30, quantity=5, category_id=1),
+        Product(id=2, name="Gaming Laptop", price=1500, quantity=2, category_id=1),
+        Product(id=3, name="Mouse Pad", price=10, quantity=40, category_id=1),
+    ]
+    test_db.add_all(products)
+    test_db.commit()
+    return products
+
+
+class TestSearchHelpers:
+    """Test query sanitizing helpers"""
+
+    def test_tokens_drop_syntax_characters(self):
+        """Test FTS and tsquery operators never reach the query"""
+        assert get_search_tokens('lap* "top" & -x') == ["lap", "top", "x"]
+
+    def test_escape_like(self):
+        """Test LIKE wildcards are escaped"""
+        assert escape_like("50%_off") == "50\\%\\_off"
+
+
+class TestSearchProducts:
+    """Test ranked search"""
+
+    @pytest.mark.asyncio
+    async def test_prefix_match_ranks_first(self, db_session, searchable_products):
+        """Test names starting with the query outrank other full-text hits"""
+        hits = await search_products(query="lap", limit=10, offset=0, db=db_session)
+
+        assert [product.id for product, _ in hits] == [1, 2]
+        assert hits[0][1] > hits[1][1]
+
+    @pytest.mark.asyncio
+    async def test_pagination(self, db_session, searchable_products):
+        """Test limit and offset page through the ranked hits"""
+        page = await search_products(query="lap", limit=1, offset=1, db=db_session)
+
+        assert [product.id for product, _ in page] == [2]
+
+    @pytest.mark.asyncio
+    async def test_typo_uses_fuzzy_fallback(self, db_session, searchable_products):
+        """Test a misspelt name still finds the product"""
+        hits = await search_products(
+            query="mouse pda", limit=10, offset=0, db=db_session
+        )
+
+        assert [product.id for product, _ in hits] == [3]
+
+    @pytest.mark.asyncio
+    async def test_renamed_product_is_reindexed(
+        self, test_db, db_session, searchable_products
+    ):
+        """Test the update trigger keeps the FTS index in sync"""
+        searchable_products[2].name = "Keyboard"
+        test_db.commit()
+
+        hits = await search_products(query="keyb", limit=10, offset=0, db=db_session)
+        assert [product.id for product, _ in hits] == [3]
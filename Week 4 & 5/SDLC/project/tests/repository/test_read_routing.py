@@ -0,0 +1,95 @@
+# test_read_routing.py - Tests for read replica routing
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from src.models.category import Category
+from src.repository import database
+from src.repository.database import READ_ONLY, Base, RoutingSession
+
+
+@pytest_asyncio.fixture
+async def routed(tmp_path, monkeypatch):
+    """Route to one sqlite primary and two sqlite replicas, each named apart"""
+    engines = {}
+    for name in ("primary", "replica-1", "replica-2"):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as db:
+            db.add(Category(id=1, name=name))
+            await db.commit()
+        engines[name] = engine
+    replicas = [engines["replica-1"], engines["replica-2"]]
+    monkeypatch.setattr(database, "engine", engines["primary"])
+    monkeypatch.setattr(database, "replica_engines", replicas)
+    monkeypatch.setattr(database, "_replica_cycle", iter(replicas * 2))
+    yield engines
+    for engine in engines.values():
+        await engine.dispose()
+
+
+def open_session(read_only: bool) -> AsyncSession:
+    """Session as get_db / get_read_db open it"""
+    return AsyncSession(
+        sync_session_class=RoutingSession,
+        info={READ_ONLY: True} if read_only else {},
+        expire_on_commit=False,
+    )
+
+
+async def read_name(db: AsyncSession) -> str:
+    """Name of category 1, which tells which database answered"""
+    return await db.scalar(select(Category.name).where(Category.id == 1))
+
+
+async def in_request(coro):
+    """Run like a request does: in its own task and context"""
+    return await asyncio.create_task(coro)
+
+
+class TestRoutingSession:
+    """Test suite for replica routing"""
+
+    @pytest.mark.asyncio
+    async def test_read_sessions_round_robin(self, routed):
+        """Test read-only sessions alternate replicas, writes use the primary"""
+
+        async def request(read_only: bool) -> str:
+            async with open_session(read_only=read_only) as db:
+                return await read_name(db)
+
+        names = [await in_request(request(read_only=True)) for _ in range(2)]
+        names.append(await in_request(request(read_only=False)))
+
+        assert names == ["replica-1", "replica-2", "primary"]
+
+    @pytest.mark.asyncio
+    async def test_session_keeps_its_replica(self, routed):
+        """Test every read of one session hits the same replica"""
+
+        async def request() -> list[str]:
+            async with open_session(read_only=True) as db:
+                return [await read_name(db), await read_name(db)]
+
+        assert await in_request(request()) == ["replica-1", "replica-1"]
+
+    @pytest.mark.asyncio
+    async def test_reads_after_a_write_use_primary(self, routed):
+        """Test read-your-writes within a request, and no leak to the next"""
+
+        async def writing_request() -> str:
+            async with open_session(read_only=False) as db:
+                db.add(Category(id=2, name="new"))
+                await db.commit()
+            async with open_session(read_only=True) as db:
+                return await read_name(db)
+
+        async def next_request() -> str:
+            async with open_session(read_only=True) as db:
+                return await read_name(db)
+
+        assert await in_request(writing_request()) == "primary"
+        assert await in_request(next_request()) == "replica-1"
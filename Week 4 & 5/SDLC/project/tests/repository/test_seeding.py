@@ -0,0 +1,119 @@
+# test_seeding.py - Tests for COPY based bulk seeding helpers
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.models.category import Category
+from src.repository.database import Base
+from src.repository.seeding import (
+    chunked,
+    insert_categories,
+    is_database_empty,
+    iter_product_records,
+    read_category_names,
+)
+
+CSV_HEADER = (
+    "product_id,product_name,quantity,price,type,"
+    "days_to_expire,is_vegetarian,warranty_period_in_years\n"
+)
+
+
+@pytest.fixture
+def inventory_csv(tmp_path):
+    """Small inventory csv with one invalid row"""
+    path = tmp_path / "inventory.csv"
+    path.write_text(
+        CSV_HEADER
+        + "P001,Cereal Box,100,20.56,food,37.0,Yes,\n"
+        + "P002,Earbuds,34,invalid,electronic,,,1.0\n"
+        + "P003,Pillow,71,128.23,regular,,,\n"
+    )
+    return str(path)
+
+
+@pytest_asyncio.fixture
+async def connection():
+    """Connection to an in-memory sqlite database with the app's tables"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        yield connection
+    await engine.dispose()
+
+
+class TestReadCategoryNames:
+    """Test category discovery"""
+
+    def test_returns_sorted_known_types(self, inventory_csv):
+        """Test every type seen in the csv is returned in sorted order"""
+        assert read_category_names(csv_filepath=inventory_csv) == [
+            "electronic",
+            "food",
+            "regular",
+        ]
+
+
+class TestIterProductRecords:
+    """Test streaming product records"""
+
+    def test_invalid_rows_are_skipped(self, inventory_csv):
+        """Test valid rows become COPY tuples and invalid ones are dropped"""
+        category_ids = {"electronic": 1, "food": 2, "regular": 3}
+        records = list(
+            iter_product_records(csv_filepath=inventory_csv, category_ids=category_ids)
+        )
+
+        assert records == [
+            (1, "Cereal Box", 100, 20.56, 2),
+            (3, "Pillow", 71, 128.23, 3),
+        ]
+
+    def test_repeated_ids_are_skipped(self, tmp_path):
+        """Test only the first row of an id is copied, a repeat would abort COPY"""
+        path = tmp_path / "inventory.csv"
+        path.write_text(
+            CSV_HEADER
+            + "P001,Pillow,71,128.23,regular,,,\n"
+            + "P001,Lamp,7,12.0,regular,,,\n"
+        )
+        records = list(
+            iter_product_records(csv_filepath=str(path), category_ids={"regular": 4})
+        )
+
+        assert records == [(1, "Pillow", 71, 128.23, 4)]
+
+
+class TestSeedingGuards:
+    """Test seeding resolves ids and refuses a used database"""
+
+    @pytest.mark.asyncio
+    async def test_category_ids_come_from_the_database(self, connection):
+        """Test ids are read back, not assumed to be 1..n"""
+        await connection.execute(Category.__table__.insert().values(id=7, name="x"))
+
+        category_ids = await insert_categories(
+            names=["food", "regular"], connection=connection
+        )
+
+        assert category_ids == {"food": 8, "regular": 9}
+
+    @pytest.mark.asyncio
+    async def test_non_empty_database_is_detected(self, connection):
+        """Test a database with any category is not seeded"""
+        assert await is_database_empty(connection=connection)
+
+        await insert_categories(names=["food"], connection=connection)
+
+        assert not await is_database_empty(connection=connection)
+
+
+class TestChunked:
+    """Test chunking helper"""
+
+    def test_last_chunk_is_partial(self):
+        """Test records split into fixed size chunks with a short tail"""
+        assert list(chunked(records=range(5), size=2)) == [[0, 1], [2, 3], [4]]
+
+    def test_empty_input_yields_nothing(self):
+        """Test no chunks for no records"""
+        assert list(chunked(records=[], size=3)) == []
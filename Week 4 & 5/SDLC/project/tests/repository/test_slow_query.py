@@ -0,0 +1,116 @@
+# test_slow_query.py - Tests for the slow-query log
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from src.core.config import settings
+from src.repository import slow_query
+from src.repository.slow_query import (
+    format_parameters,
+    install_slow_query_log,
+    should_explain,
+)
+
+
+class RecordingLogger:
+    """Stand-in logger keeping the warnings it receives"""
+
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, event, **fields):
+        self.warnings.append((event, fields))
+
+
+@pytest.fixture
+def recorded(monkeypatch) -> list:
+    """Warnings written by the slow-query log"""
+    recording_logger = RecordingLogger()
+    monkeypatch.setattr(slow_query, "logger", recording_logger)
+    return recording_logger.warnings
+
+
+@pytest_asyncio.fixture
+async def timed_engine():
+    """In-memory sqlite engine with the slow-query listeners"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    install_slow_query_log(engine=engine)
+    yield engine
+    await engine.dispose()
+
+
+class TestFormatParameters:
+    """Test parameters are logged readably and bounded"""
+
+    def test_truncates_long_parameters(self, monkeypatch):
+        """Test a bulk statement's parameters are cut"""
+        monkeypatch.setattr(settings, "SLOW_QUERY_LOG_PARAMETERS", True)
+        rendered = format_parameters(
+            statement="INSERT INTO product (id) VALUES (?)",
+            parameters=[(i,) for i in range(1000)],
+        )
+
+        assert len(rendered) == slow_query.MAX_PARAMETERS_LENGTH + 3
+        assert rendered.endswith("...")
+
+    def test_disabled_by_default(self):
+        """Test parameters are left out unless enabled"""
+        assert format_parameters(statement="SELECT ?", parameters=("x",)) is None
+
+    def test_user_table_is_redacted(self, monkeypatch):
+        """Test password hashes and emails never reach the log"""
+        monkeypatch.setattr(settings, "SLOW_QUERY_LOG_PARAMETERS", True)
+
+        for statement in (
+            'SELECT "user".email FROM "user" WHERE "user".email = $1',
+            "INSERT INTO user (name, email, password) VALUES (?, ?, ?)",
+            'UPDATE "user" SET password=$1',
+        ):
+            assert format_parameters(statement, ("secret",)) == "[redacted]"
+        assert format_parameters("SELECT user_id FROM orders", (1,)) == "(1,)"
+
+
+class TestShouldExplain:
+    """Test only sampled postgres SELECTs are explained"""
+
+    def test_sampled_select(self, monkeypatch):
+        """Test a SELECT on postgres is explained at rate 1"""
+        monkeypatch.setattr(settings, "SLOW_QUERY_EXPLAIN_SAMPLE_RATE", 1.0)
+
+        assert should_explain(" select 1", dialect_name="postgresql")
+        assert not should_explain("UPDATE product SET x = 1", "postgresql")
+        assert not should_explain("SELECT 1", dialect_name="sqlite")
+
+    def test_disabled_by_default(self):
+        """Test no plan is captured unless a rate is set"""
+        assert not should_explain("SELECT 1", dialect_name="postgresql")
+
+
+class TestSlowQueryLog:
+    """Test statements over the threshold are logged"""
+
+    @pytest.mark.asyncio
+    async def test_logs_slow_statement(self, timed_engine, recorded, monkeypatch):
+        """Test the statement, parameters and time are logged"""
+        monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 1e-9)
+        monkeypatch.setattr(settings, "SLOW_QUERY_LOG_PARAMETERS", True)
+        async with timed_engine.connect() as conn:
+            await conn.execute(text("SELECT :value"), {"value": 7})
+
+        event, fields = recorded[-1]
+        assert event == "Slow query"
+        assert "SELECT" in fields["statement"]
+        assert fields["parameters"] == "(7,)"
+        assert fields["elapsed_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_fast_statement_not_logged(
+        self, timed_engine, recorded, monkeypatch
+    ):
+        """Test statements under the threshold, or with 0, are not logged"""
+        for threshold in (60_000.0, 0.0):
+            monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", threshold)
+            async with timed_engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        assert recorded == []
@@ -0,0 +1,257 @@
+# test_stock.py - Tests for atomic stock reservation
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from src.core.config import settings
+from src.core.exceptions import ConflictException
+from src.models.category import Category
+from src.models.category_summary import CategorySummary
+from src.models.product import Product
+from src.repository.category_summary import (
+    compact_summary_deltas,
+    get_category_summary_rows,
+    refresh_category_summary,
+)
+from src.repository.change_tracking import get_table_version
+from src.repository.database import Base
+from src.repository.stock import adjust_stock, merge_lines
+from src.schema.product import StockLine, StockReservation
+from src.services import product_service
+from src.services.low_stock_service import low_stock_monitor
+from src.services.product_service import change_stock
+
+
+def read_stock(test_db) -> dict[int, tuple]:
+    """Read quantity and version of every product"""
+    test_db.expire_all()
+    return {
+        product.id: (product.quantity, product.version)
+        for product in test_db.query(Product).order_by(Product.id)
+    }
+
+
+def make_reservation(*lines: tuple[int, int]) -> StockReservation:
+    """Build a validated reservation from (product_id, quantity) pairs"""
+    return StockReservation(
+        lines=[StockLine(product_id=pid, quantity=qty) for pid, qty in lines]
+    )
+
+
+class TestMergeLines:
+    """Test reservation lines are normalized before locking"""
+
+    def test_sums_repeats_and_sorts(self):
+        """Test repeated products merge and lines come out in id order"""
+        assert merge_lines(lines=[(3, 1), (1, 2), (3, 4)]) == [(1, 2), (3, 5)]
+
+
+class TestAdjustStock:
+    """Test the conditional UPDATE ... RETURNING"""
+
+    @pytest.mark.asyncio
+    async def test_reserve_decrements_and_bumps_versions(
+        self, db_session, test_db, products_with_different_categories
+    ):
+        """Test every line is taken, row and table versions move"""
+        before = read_stock(test_db)
+        counter = await get_table_version(table_name="product", db=db_session)
+
+        remaining, failed_id = await adjust_stock(
+            lines=[(2, 10), (1, 5)], reserve=True, db=db_session
+        )
+        await db_session.commit()
+
+        after = read_stock(test_db)
+        assert failed_id is None
+        assert remaining == {1: 0, 2: 40}
+        assert after[1] == (0, before[1][1] + 1)
+        assert after[2] == (40, before[2][1] + 1)
+        assert after[3] == before[3]
+        assert await get_table_version(table_name="product", db=db_session) != counter
+
+    @pytest.mark.asyncio
+    async def test_reserve_stops_at_short_line(
+        self, db_session, products_with_different_categories
+    ):
+        """Test a line asking for more than is in stock matches no row"""
+        _, failed_id = await adjust_stock(
+            lines=[(1, 6)], reserve=True, db=db_session
+        )
+
+        assert failed_id == 1
+
+    @pytest.mark.asyncio
+    async def test_summary_follows_stock(
+        self, db_session, test_db, products_with_different_categories, monkeypatch
+    ):
+        """Test the materialized summary gets the quantity and value deltas"""
+        monkeypatch.setattr(settings, "CATEGORY_SUMMARY_MATERIALIZED", True)
+        await refresh_category_summary(db=db_session)
+        await db_session.commit()
+
+        await adjust_stock(lines=[(2, 10)], reserve=True, db=db_session)
+        await db_session.commit()
+
+        rows = await get_category_summary_rows(db=db_session)
+        assert rows[1]["product_count"] == 1
+        assert rows[1]["total_quantity"] == 40
+        assert rows[1]["stock_value"] == pytest.approx(40 * 25)
+
+        assert await compact_summary_deltas(db=db_session) == 1
+        test_db.expire_all()
+        summary = test_db.get(CategorySummary, 2)
+        assert summary.total_quantity == 40
+        assert summary.stock_value == pytest.approx(40 * 25)
+
+    @pytest.mark.asyncio
+    async def test_updates_no_shared_row(
+        self, db_session, test_db, products_with_different_categories, monkeypatch
+    ):
+        """Test only the reserved product rows are updated, summary and
+        version state is appended, so checkouts of other products never wait"""
+        monkeypatch.setattr(settings, "CATEGORY_SUMMARY_MATERIALIZED", True)
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement.split())
+
+        event.listen(test_db.get_bind(), "before_cursor_execute", capture)
+        try:
+            await adjust_stock(lines=[(2, 10), (1, 5)], reserve=True, db=db_session)
+        finally:
+            event.remove(test_db.get_bind(), "before_cursor_execute", capture)
+
+        updated = [words[1] for words in statements if words[0] == "UPDATE"]
+        inserted = {words[2] for words in statements if words[0] == "INSERT"}
+        assert updated == ["product", "product"]
+        assert inserted == {"change_log", "category_summary_delta"}
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TEST_POSTGRES_URL"), reason="TEST_POSTGRES_URL not set"
+)
+class TestConcurrentReservations:
+    """Test reservations against postgres, where row locks are real"""
+
+    @pytest.mark.asyncio
+    async def test_different_products_do_not_block(self, monkeypatch):
+        """Test a reservation commits while another one holds its locks"""
+        monkeypatch.setattr(settings, "CATEGORY_SUMMARY_MATERIALIZED", True)
+        engine = create_async_engine(os.environ["TEST_POSTGRES_URL"])
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        try:
+            async with sessions() as db:
+                db.add(Category(id=1, name="Lighting"))
+                db.add_all(
+                    [
+                        Product(id=1, name="Lamp", quantity=10, price=5, category_id=1),
+                        Product(id=2, name="Bulb", quantity=10, price=2, category_id=1),
+                    ]
+                )
+                await db.commit()
+
+            async with sessions() as first, sessions() as second:
+                await adjust_stock(lines=[(1, 1)], reserve=True, db=first)
+                # first is still open: a shared row would make these wait
+                _, failed_id = await asyncio.wait_for(
+                    adjust_stock(lines=[(2, 1)], reserve=True, db=second), timeout=5
+                )
+                await asyncio.wait_for(second.commit(), timeout=5)
+                async with sessions() as reader:
+                    await asyncio.wait_for(
+                        get_table_version(table_name="product", db=reader), timeout=5
+                    )
+                await first.commit()
+
+            assert failed_id is None
+            async with sessions() as db:
+                await compact_summary_deltas(db=db)
+                rows = await get_category_summary_rows(db=db)
+            assert rows[0]["total_quantity"] == 18
+        finally:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+            await engine.dispose()
+
+
+class TestChangeStock:
+    """Test the all-or-nothing service"""
+
+    @pytest.mark.asyncio
+    async def test_queues_one_low_stock_check(
+        self, db_session, products_with_different_categories, monkeypatch
+    ):
+        """Test stock writes queue a low-stock check, one while it is pending"""
+        queued = []
+
+        def submit(name, func, **kwargs):
+            queued.append(name)
+            return True
+
+        monkeypatch.setattr(product_service.work_queue, "submit", submit)
+        monkeypatch.setattr(low_stock_monitor, "recheck_pending", False)
+        for _ in range(2):
+            await change_stock(
+                user_email="test@test.com",
+                reservation=make_reservation((1, 1)),
+                reserve=True,
+                db=db_session,
+            )
+
+        assert queued.count("low-stock-check") == 1
+        assert queued.count("product-audit") == 2
+
+    @pytest.mark.asyncio
+    async def test_insufficient_stock_rolls_back_every_line(
+        self, db_session, test_db, products_with_different_categories
+    ):
+        """Test a short line raises and earlier lines are not taken"""
+        before = read_stock(test_db)
+
+        with pytest.raises(ConflictException) as exc_info:
+            await change_stock(
+                user_email="test@test.com",
+                reservation=make_reservation((1, 2), (3, 21)),
+                reserve=True,
+                db=db_session,
+            )
+
+        assert "product 3" in exc_info.value.message
+        assert read_stock(test_db) == before
+
+    @pytest.mark.asyncio
+    async def test_release_puts_stock_back(
+        self, db_session, test_db, products_with_different_categories
+    ):
+        """Test releasing adds the quantity back"""
+        response = await change_stock(
+            user_email="test@test.com",
+            reservation=make_reservation((4, 2)),
+            reserve=False,
+            db=db_session,
+        )
+
+        assert response["message"]["released stock"] == [
+            {"product_id": 4, "quantity": 10}
+        ]
+        assert read_stock(test_db)[4][0] == 10
+
+    @pytest.mark.asyncio
+    async def test_missing_product(
+        self, db_session, products_with_different_categories
+    ):
+        """Test an unknown product id is reported as not found"""
+        response = await change_stock(
+            user_email="test@test.com",
+            reservation=make_reservation((99, 1)),
+            reserve=True,
+            db=db_session,
+        )
+
+        assert response["status"] == "error"
@@ -0,0 +1,137 @@
+# test_user_cache.py - Tests for the email -> user cache and paged user reads
+import pytest
+from src.repository import user_cache as user_cache_module
+from src.repository.user_cache import CachedUser, UserCache, user_cache
+from src.repository.user_repo import UserRepository
+from src.schema.user import UserEdit
+
+
+def make_user(email: str = "a@test.com") -> CachedUser:
+    """Build a snapshot without a database"""
+    return CachedUser(id=1, name="A", email=email, role="staff", password="hash")
+
+
+class TestUserCache:
+    """Test TTL, LRU eviction and invalidation of the cache"""
+
+    def test_get_after_put(self):
+        """Test a stored user is served and counted as a hit"""
+        cache = UserCache(maxsize=2, ttl=60)
+        cache.put(user=make_user(), generation=cache.generation)
+
+        assert cache.get(email="a@test.com") == make_user()
+        assert cache.get(email="b@test.com") is None
+        assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+    def test_expired_entry(self, monkeypatch):
+        """Test entries are not served past their TTL"""
+        cache = UserCache(maxsize=2, ttl=60)
+        monkeypatch.setattr(user_cache_module, "monotonic", lambda: 1000.0)
+        cache.put(user=make_user(), generation=cache.generation)
+
+        monkeypatch.setattr(user_cache_module, "monotonic", lambda: 1061.0)
+        assert cache.get(email="a@test.com") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest lookup is evicted when full"""
+        cache = UserCache(maxsize=2, ttl=60)
+        for email in ("a@test.com", "b@test.com"):
+            cache.put(user=make_user(email=email), generation=cache.generation)
+        cache.get(email="a@test.com")
+        cache.put(user=make_user(email="c@test.com"), generation=cache.generation)
+
+        assert cache.get(email="b@test.com") is None
+        assert cache.get(email="a@test.com") is not None
+
+    def test_stale_read_not_stored(self):
+        """Test a read that raced an invalidation is dropped"""
+        cache = UserCache(maxsize=2, ttl=60)
+        generation = cache.generation
+        cache.discard(email="a@test.com")
+        cache.put(user=make_user(), generation=generation)
+
+        assert cache.get(email="a@test.com") is None
+
+    def test_discard_everything(self):
+        """Test None clears every user"""
+        cache = UserCache(maxsize=2, ttl=60)
+        cache.put(user=make_user(), generation=cache.generation)
+        cache.discard(email=None)
+
+        assert len(cache) == 0
+
+    def test_disabled(self):
+        """Test a zero size cache stores nothing"""
+        cache = UserCache(maxsize=0, ttl=60)
+        cache.put(user=make_user(), generation=cache.generation)
+
+        assert len(cache) == 0
+
+
+class TestUserRepositoryCache:
+    """Test the repository serves lookups from the cache until a write"""
+
+    @pytest.fixture(autouse=True)
+    def clear_user_cache(self):
+        """Start from an empty cache and zeroed counters"""
+        user_cache.clear()
+
+    @pytest.mark.asyncio
+    async def test_repeated_lookup_is_cached(self, db_session, staff_user):
+        """Test the second lookup is a hit"""
+        repo = UserRepository(session=db_session)
+        first = await repo.fetch_cached_user_by_email(email_id=staff_user.email)
+        second = await repo.fetch_cached_user_by_email(email_id=staff_user.email)
+
+        assert first == second
+        assert first.role == staff_user.role
+        assert user_cache.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_missing_user_not_cached(self, db_session):
+        """Test unknown emails are read again, a registration may follow"""
+        repo = UserRepository(session=db_session)
+
+        assert await repo.fetch_cached_user_by_email(email_id="no@test.com") is None
+        assert len(user_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates(self, db_session, staff_user):
+        """Test updating a user drops the cached snapshot"""
+        repo = UserRepository(session=db_session)
+        await repo.fetch_cached_user_by_email(email_id=staff_user.email)
+        current_user = await repo.fetch_user_by_email(email_id=staff_user.email)
+        await repo.get_update_user_message(
+            current_user=current_user, update_details=UserEdit(new_name="Renamed")
+        )
+
+        assert user_cache.get(email=staff_user.email) is None
+        cached = await repo.fetch_cached_user_by_email(email_id=staff_user.email)
+        assert cached.name == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates(self, db_session, staff_user):
+        """Test deleting a user drops the cached snapshot"""
+        repo = UserRepository(session=db_session)
+        await repo.fetch_cached_user_by_email(email_id=staff_user.email)
+        await repo.delete_user(user_id=staff_user.id)
+
+        assert await repo.fetch_cached_user_by_email(email_id=staff_user.email) is None
+
+
+class TestFetchUsersPage:
+    """Test paged user reads"""
+
+    @pytest.mark.asyncio
+    async def test_pages_ordered_by_id(
+        self, db_session, staff_user, manager_user, admin_user
+    ):
+        """Test consecutive pages cover the users once, in id order"""
+        repo = UserRepository(session=db_session)
+        first = await repo.fetch_users_page(limit=2, offset=0)
+        second = await repo.fetch_users_page(limit=2, offset=2)
+
+        ids = [user.id for user in first + second]
+        assert ids == sorted(ids)
+        assert len(ids) == 3
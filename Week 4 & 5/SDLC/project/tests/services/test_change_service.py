@@ -0,0 +1,106 @@
+# test_change_service.py - Tests for the change feed pages
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from src.models.change_log import ChangeLog
+from src.models.product import Product
+from src.services.change_service import ChangeLogPruner, get_change_feed
+
+
+async def read_feed(db_session, since: int = 0, limit: int = 100) -> dict:
+    """Read one feed page and return its message"""
+    response = await get_change_feed(
+        user_email="test@test.com", since=since, limit=limit, db=db_session
+    )
+    return response["message"]
+
+
+class TestChangeFeed:
+    """Test paging, compaction and current state"""
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_the_cursor(
+        self, db_session, products_with_different_categories
+    ):
+        """Test next cursor and has more walk the whole log once"""
+        seen = []
+        since = 0
+        while True:
+            page = await read_feed(db_session, since=since, limit=4)
+            seen.extend((change.table, change.id) for change in page["changes"])
+            since = page["next cursor"]
+            if not page["has more"]:
+                break
+
+        assert len(seen) == 9
+        assert since == page["latest cursor"]
+        assert (await read_feed(db_session, since=since))["changes"] == []
+
+    @pytest.mark.asyncio
+    async def test_repeated_writes_are_compacted(
+        self, db_session, test_db, sample_product
+    ):
+        """Test a row written twice in a page appears once, with its state"""
+        since = (await read_feed(db_session))["next cursor"]
+        sample_product.price = 5
+        test_db.commit()
+        sample_product.price = 6
+        test_db.commit()
+
+        page = await read_feed(db_session, since=since)
+
+        assert len(page["changes"]) == 1
+        change = page["changes"][0]
+        assert change.operation == "upsert"
+        assert change.data["price"] == 6
+        assert change.cursor == page["next cursor"]
+
+    @pytest.mark.asyncio
+    async def test_row_deleted_later_is_a_delete(
+        self, db_session, test_db, sample_category
+    ):
+        """Test an upsert of a row gone by read time is reported as a delete"""
+        product = Product(name="Brief", price=1, quantity=1, category_id=1)
+        test_db.add(product)
+        test_db.commit()
+        since = (await read_feed(db_session))["next cursor"] - 1
+        test_db.delete(product)
+        test_db.commit()
+
+        page = await read_feed(db_session, since=since, limit=1)
+
+        assert page["changes"][0].operation == "delete"
+        assert page["changes"][0].data is None
+        assert page["has more"] is True
+
+
+class TestChangeLogPruner:
+    """Test the periodic retention job"""
+
+    @pytest.mark.asyncio
+    async def test_prunes_at_start(self, db_session, test_db, sample_product):
+        """Test the first run deletes expired changes in the background"""
+        sample_product.price = 5
+        test_db.commit()
+        test_db.execute(ChangeLog.__table__.update().values(changed_at=0))
+        test_db.commit()
+
+        @asynccontextmanager
+        async def session_factory():
+            yield db_session
+
+        pruner = ChangeLogPruner(retention=60, interval=60)
+        pruner.start(session_factory=session_factory)
+        await asyncio.sleep(0.01)
+        await pruner.stop()
+
+        assert not pruner.running
+        assert test_db.query(ChangeLog).count() == 2
+
+    def test_zero_retention_keeps_everything(self):
+        """Test a retention of 0 never starts the job"""
+        pruner = ChangeLogPruner(retention=0, interval=60)
+        pruner.start(session_factory=None)
+
+        assert not pruner.running
@@ -0,0 +1,199 @@
+# test_change_stream_service.py - Tests for the change stream broker
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+from src.repository.change_log import commit_hooks
+from src.schema.change import ChangeRead
+from src.services.change_stream_service import ChangeStreamBroker, StreamFilter
+
+
+def make_change(cursor: int, table: str = "product", **data) -> ChangeRead:
+    """Build an upsert, or a delete when no data is given"""
+    return ChangeRead(
+        cursor=cursor,
+        table=table,
+        id=data.pop("id", cursor),
+        operation="upsert" if data else "delete",
+        data=data or None,
+    )
+
+
+@pytest_asyncio.fixture
+async def broker(db_session):
+    """Broker reading through the test session, stopped after the test"""
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    broker = ChangeStreamBroker(buffer_size=2, poll_interval=5.0)
+    await broker.start(session_factory=session_factory)
+    yield broker
+    await broker.stop()
+
+
+class TestStreamFilter:
+    """Test which changes a subscriber receives"""
+
+    def test_no_criteria_matches_everything(self):
+        """Test an unfiltered stream gets every change"""
+        assert StreamFilter().matches(make_change(1, table="product_category"))
+
+    def test_category_filter(self):
+        """Test category subscribers get the category and its products"""
+        stream_filter = StreamFilter(category_id=2)
+
+        assert stream_filter.matches(make_change(1, id=7, category_id=2))
+        assert not stream_filter.matches(make_change(2, id=8, category_id=3))
+        assert stream_filter.matches(make_change(3, table="product_category", id=2))
+        assert stream_filter.matches(make_change(4))  # delete, category unknown
+
+    def test_product_filter(self):
+        """Test product subscribers only get their products"""
+        stream_filter = StreamFilter(product_ids=frozenset({7}))
+
+        assert stream_filter.matches(make_change(1, id=7, category_id=2))
+        assert not stream_filter.matches(make_change(2, id=8, category_id=2))
+        assert not stream_filter.matches(make_change(3, table="product_category"))
+
+
+class TestPublish:
+    """Test the in-process fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_is_dropped(self):
+        """Test a full buffer drops that subscriber and not the others"""
+        broker = ChangeStreamBroker(buffer_size=2, poll_interval=5.0)
+        slow = broker.subscribe(stream_filter=StreamFilter())
+        picky = broker.subscribe(stream_filter=StreamFilter(product_ids=frozenset({1})))
+
+        broker.publish(changes=[make_change(1, price=1, category_id=1)])
+        broker.publish(changes=[make_change(2, price=1, category_id=1)])
+        broker.publish(changes=[make_change(3, price=1, category_id=1)])
+
+        assert slow.dropped is True
+        assert slow.queue.get_nowait() is None
+        assert broker.subscribers == {picky}
+        assert picky.queue.qsize() == 1
+        assert broker.stats()["dropped"] == 1
+
+
+class TestDelivery:
+    """Test committed changes reach subscribers"""
+
+    @pytest.mark.asyncio
+    async def test_commit_wakes_delivery(self, broker, test_db, sample_product):
+        """Test a commit in this process is pushed without waiting to poll"""
+        subscriber = broker.subscribe(
+            stream_filter=StreamFilter(product_ids=frozenset({sample_product.id}))
+        )
+        sample_product.quantity = 4
+        test_db.commit()
+
+        change = await asyncio.wait_for(subscriber.queue.get(), timeout=1)
+
+        assert change.id == sample_product.id
+        assert change.data["quantity"] == 4
+        assert broker.cursor == change.cursor
+
+    @pytest.mark.asyncio
+    async def test_stop_ends_streams(self, broker):
+        """Test stopping unhooks the broker and closes every subscriber"""
+        subscriber = broker.subscribe(stream_filter=StreamFilter())
+
+        await broker.stop()
+
+        assert broker.notify not in commit_hooks
+        assert subscriber.queue.get_nowait() is None
+
+
+class TestDeferredStart:
+    """Test fast boot leaves starting to the first subscriber"""
+
+    @pytest.mark.asyncio
+    async def test_starts_on_first_use(self, db_session):
+        """Test a deferred broker is idle until ensure_started"""
+
+        @asynccontextmanager
+        async def session_factory():
+            yield db_session
+
+        broker = ChangeStreamBroker(buffer_size=2, poll_interval=5.0)
+        broker.defer_start(session_factory=session_factory)
+        assert not broker.running
+
+        await broker.ensure_started()
+        await broker.ensure_started()
+
+        assert broker.running
+        assert commit_hooks.count(broker.notify) == 1
+        await broker.stop()
+        assert broker.notify not in commit_hooks
+
+    @pytest.mark.asyncio
+    async def test_not_deferred_is_noop(self):
+        """Test ensure_started does nothing for a broker never configured"""
+        broker = ChangeStreamBroker(buffer_size=2, poll_interval=5.0)
+
+        await broker.ensure_started()
+
+        assert not broker.running
+
+
+class FakeDriverConnection:
+    """asyncpg connection stand-in recording its listeners"""
+
+    def __init__(self):
+        self.listeners = {}
+        self.termination_listeners = []
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def remove_listener(self, channel, callback):
+        if self.listeners.get(channel) == callback:
+            del self.listeners[channel]
+
+    def add_termination_listener(self, callback):
+        self.termination_listeners.append(callback)
+
+    def remove_termination_listener(self, callback):
+        self.termination_listeners.remove(callback)
+
+
+class FakeListenEngine:
+    """Engine stand-in handing out one pooled connection"""
+
+    def __init__(self):
+        self.driver_connection = FakeDriverConnection()
+        self.closed = False
+
+    async def connect(self):
+        return self
+
+    async def get_raw_connection(self):
+        return self
+
+    async def close(self):
+        self.closed = True
+
+
+class TestListen:
+    """Test the LISTEN connection goes back to the pool clean"""
+
+    @pytest.mark.asyncio
+    async def test_unlisten_removes_listeners(self):
+        """Test the pooled connection keeps no callback into the broker"""
+        engine = FakeListenEngine()
+        broker = ChangeStreamBroker(buffer_size=2, poll_interval=5.0)
+        broker._listen_engine = engine
+        await broker._listen()
+        assert engine.driver_connection.listeners
+
+        await broker._unlisten()
+
+        assert engine.closed
+        assert engine.driver_connection.listeners == {}
+        assert engine.driver_connection.termination_listeners == []
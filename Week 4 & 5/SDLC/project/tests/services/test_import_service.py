@@ -0,0 +1,184 @@
+# test_import_service.py - Tests for the streaming csv product import
+from contextlib import asynccontextmanager
+from pathlib import Path
+from time import time
+
+import pytest
+from src.core.config import settings
+from src.models.category import Category
+from src.models.import_job import ImportJob
+from src.models.product import Product
+from src.repository.product_import import create_import_job, fail_stale_import_jobs
+from src.services.import_service import run_import, save_upload
+
+HEADER = (
+    "product_id,product_name,quantity,price,type,days_to_expire,"
+    "is_vegetarian,warranty_period_in_years\n"
+)
+
+
+def write_csv(tmp_path: Path, *rows: str, header: str = HEADER) -> str:
+    """Write an inventory csv and return its path"""
+    path = tmp_path / "inventory.csv"
+    path.write_text(header + "".join(f"{row}\n" for row in rows))
+    return str(path)
+
+
+async def import_csv(db_session, test_db, csv_path: str) -> ImportJob:
+    """Run an import through the test session and return the finished job"""
+
+    @asynccontextmanager
+    async def session_factory():
+        yield db_session
+
+    job = await create_import_job(user_email="test@test.com", db=db_session)
+    await run_import(job_id=job.id, csv_path=csv_path, session_factory=session_factory)
+    test_db.expire_all()
+    return test_db.get(ImportJob, job.id)
+
+
+async def iterate(*chunks: bytes):
+    """Async iterator over request body chunks"""
+    for chunk in chunks:
+        yield chunk
+
+
+class TestSaveUpload:
+    """Test the body is spooled to disk with a size cap"""
+
+    @pytest.mark.asyncio
+    async def test_writes_chunks(self):
+        """Test every chunk lands in the file"""
+        path = await save_upload(chunks=iterate(b"a,b\n", b"1,2\n"), max_bytes=100)
+
+        assert Path(path).read_bytes() == b"a,b\n1,2\n"
+        Path(path).unlink()
+
+    @pytest.mark.asyncio
+    async def test_rejects_oversized(self):
+        """Test a body over the cap is refused"""
+        assert await save_upload(chunks=iterate(b"x" * 10), max_bytes=5) is None
+
+
+class TestRunImport:
+    """Test batches are validated, upserted and reported"""
+
+    @pytest.mark.asyncio
+    async def test_imports_valid_rows_and_reports_errors(
+        self, db_session, test_db, tmp_path, multiple_products, monkeypatch
+    ):
+        """Test new and existing ids are upserted, invalid rows listed"""
+        monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+        version = multiple_products[0].version
+        csv_path = write_csv(
+            tmp_path,
+            "P001,Cereal Box,100,20.56,food,37.0,Yes,",
+            "P002,Earbuds,34,invalid,electronic,,,1.0",
+            "P010,Pillow,71,128.23,regular,,,",
+        )
+
+        job = await import_csv(db_session, test_db, csv_path)
+
+        assert (job.status, job.rows_read, job.rows_imported) == ("succeeded", 3, 2)
+        assert job.rows_failed == 1
+        assert job.errors[0]["row"] == 3
+        assert job.errors[0]["product_id"] == "P002"
+        assert job.errors[0]["message"].startswith("price")
+        updated = test_db.get(Product, 1)
+        assert (updated.name, updated.quantity) == ("Cereal Box", 100)
+        assert updated.version == version + 1
+        assert test_db.get(Product, 10).category.name == "regular"
+        assert test_db.query(Category).filter_by(name="food").count() == 1
+        assert not Path(csv_path).exists()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_capped(
+        self, db_session, test_db, tmp_path, sample_category, monkeypatch
+    ):
+        """Test only the first IMPORT_MAX_ERRORS rejected rows are kept"""
+        monkeypatch.setattr(settings, "IMPORT_MAX_ERRORS", 2)
+        csv_path = write_csv(
+            tmp_path, *(f"P00{i},Thing,-1,1.0,regular,,," for i in range(1, 5))
+        )
+
+        job = await import_csv(db_session, test_db, csv_path)
+
+        assert job.rows_failed == 4
+        assert [error["row"] for error in job.errors] == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_unknown_type_is_row_error(
+        self, db_session, test_db, tmp_path, sample_category
+    ):
+        """Test a type without a product model rejects the row, not the job"""
+        csv_path = write_csv(
+            tmp_path,
+            "P001,Chair,3,45.0,furniture,,,",
+            "P002,Pillow,71,128.23,regular,,,",
+        )
+
+        job = await import_csv(db_session, test_db, csv_path)
+
+        assert (job.status, job.rows_imported, job.rows_failed) == ("succeeded", 1, 1)
+        assert job.errors == [
+            {"row": 2, "product_id": "P001", "message": "type: unknown product type"}
+        ]
+        assert test_db.get(Product, 1) is None
+        assert test_db.get(Product, 2) is not None
+
+    @pytest.mark.asyncio
+    async def test_values_over_column_limits_are_row_errors(
+        self, db_session, test_db, tmp_path, sample_category
+    ):
+        """Test a too long name or too large quantity rejects only its row"""
+        csv_path = write_csv(
+            tmp_path,
+            f"P001,{'x' * 101},3,45.0,regular,,,",
+            "P002,Pillow,3000000000,128.23,regular,,,",
+            "P003,Lamp,7,12.0,regular,,,",
+        )
+
+        job = await import_csv(db_session, test_db, csv_path)
+
+        assert (job.status, job.rows_imported, job.rows_failed) == ("succeeded", 1, 2)
+        assert [error["message"] for error in job.errors] == [
+            "product_name: at most 100 characters",
+            "quantity: out of range",
+        ]
+        assert test_db.get(Product, 3) is not None
+
+    @pytest.mark.asyncio
+    async def test_missing_column_fails_job(
+        self, db_session, test_db, tmp_path, sample_category
+    ):
+        """Test a file in another format fails without importing anything"""
+        csv_path = write_csv(tmp_path, "P001,Cereal", header="product_id,name\n")
+
+        job = await import_csv(db_session, test_db, csv_path)
+
+        assert job.status == "failed"
+        assert "product_name" in job.message
+        assert test_db.get(Product, 1) is None
+        assert not Path(csv_path).exists()
+
+
+class TestFailStaleImportJobs:
+    """Test jobs left running by a stopped worker are failed"""
+
+    @pytest.mark.asyncio
+    async def test_only_stale_running_jobs_fail(self, db_session, test_db):
+        """Test a running job still updating and a pending one are kept"""
+        jobs = [
+            await create_import_job(user_email="test@test.com", db=db_session)
+            for _ in range(3)
+        ]
+        jobs[0].status = jobs[1].status = "running"
+        jobs[0].updated_at = time() - 3600
+        await db_session.commit()
+
+        failed = await fail_stale_import_jobs(stale_before=time() - 600, db=db_session)
+
+        test_db.expire_all()
+        statuses = [test_db.get(ImportJob, job.id).status for job in jobs]
+        assert failed == 1
+        assert statuses == ["failed", "running", "pending"]
@@ -0,0 +1,114 @@
+# test_low_stock_service.py - Tests for the low-stock monitor job
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest
+from src.models.product import LOW_STOCK_THRESHOLD, Product
+from src.repository.low_stock import get_low_stock_stmt
+from src.schema.product import StockState
+from src.services.low_stock_service import LowStockMonitor
+
+
+def set_quantity(test_db, product_id: int, quantity: int) -> None:
+    """Write a product quantity outside the session under test"""
+    product = test_db.get(Product, product_id)
+    product.quantity = quantity
+    test_db.commit()
+
+
+@pytest.fixture
+def monitor() -> LowStockMonitor:
+    """Fresh monitor with the default threshold of 10"""
+    return LowStockMonitor(threshold=10, interval=60.0, history_size=2)
+
+
+class TestLowStockQuery:
+    """Test the query repeats the partial index predicate"""
+
+    def test_filters_on_threshold(self):
+        """Test the literal threshold is part of the statement"""
+        sql = str(get_low_stock_stmt().compile())
+
+        assert "product.quantity < 10" in sql
+
+    def test_migration_repeats_threshold(self):
+        """Test the migrated index predicate is the one queries use"""
+        migration = next(
+            (Path(__file__).parents[2] / "alembic/versions").glob("5b8c0d4e7f21_*.py")
+        )
+
+        assert f"'quantity < {LOW_STOCK_THRESHOLD}'" in migration.read_text()
+
+
+class TestLowStockMonitor:
+    """Test only low-stock transitions are emitted"""
+
+    @pytest.mark.asyncio
+    async def test_first_check_is_baseline(
+        self, monitor, db_session, products_with_different_categories
+    ):
+        """Test the first check fills the set without emitting"""
+        transitions = await monitor.check(db=db_session)
+
+        assert transitions == []
+        assert sorted(monitor.low_stock) == [1, 4]
+        assert monitor.checked_at is not None
+
+    @pytest.mark.asyncio
+    async def test_emits_low_recovered_and_deleted(
+        self, monitor, db_session, test_db, products_with_different_categories
+    ):
+        """Test each kind of transition is reported once"""
+        await monitor.check(db=db_session)
+        set_quantity(test_db, product_id=2, quantity=3)
+        set_quantity(test_db, product_id=1, quantity=40)
+        test_db.delete(test_db.get(Product, 4))
+        test_db.commit()
+
+        transitions = await monitor.check(db=db_session)
+
+        assert [(t.product_id, t.state, t.quantity) for t in transitions] == [
+            (2, StockState.LOW, 3),
+            (1, StockState.RECOVERED, 40),
+            (4, StockState.DELETED, None),
+        ]
+        assert sorted(monitor.low_stock) == [2]
+        assert await monitor.check(db=db_session) == []
+
+    @pytest.mark.asyncio
+    async def test_history_is_bounded(
+        self, monitor, db_session, test_db, products_with_different_categories
+    ):
+        """Test only the newest transitions are kept"""
+        await monitor.check(db=db_session)
+        for product_id in (2, 3, 5):
+            set_quantity(test_db, product_id=product_id, quantity=1)
+            await monitor.check(db=db_session)
+
+        assert [t.product_id for t in monitor.transitions] == [3, 5]
+
+    @pytest.mark.asyncio
+    async def test_recheck_reads_new_writes(
+        self, monitor, db_session, test_db, products_with_different_categories
+    ):
+        """Test a queued recheck emits transitions and clears the flag"""
+
+        @asynccontextmanager
+        async def session_factory():
+            yield db_session
+
+        await monitor.recheck()
+        assert monitor.checked_at is None
+
+        monitor.start(session_factory=session_factory)
+        try:
+            await monitor.recheck()
+            set_quantity(test_db, product_id=2, quantity=3)
+            monitor.recheck_pending = True
+            await monitor.recheck()
+        finally:
+            await monitor.stop()
+
+        assert not monitor.recheck_pending
+        assert [t.product_id for t in monitor.transitions] == [2]
+
@@ -0,0 +1,119 @@
+# test_password_service.py - Tests for off-loop bcrypt hashing
+import asyncio
+import threading
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from src.models.user import User
+from src.repository.user_repo import UserRepository
+from src.schema.user import UserEdit
+from src.services.password_service import PasswordService
+
+
+@pytest.fixture
+def service():
+    """PasswordService with more threads than permits, so only the semaphore
+    can keep calls under max_concurrency; shut down after the test"""
+    password_service = PasswordService(max_workers=4, max_concurrency=2)
+    yield password_service
+    password_service.shutdown()
+
+
+class TestPasswordService:
+    """Test hashing and verification through the executor"""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_round_trip(self, service):
+        """Test a hash produced by the service verifies with the service"""
+        hashed = await service.hash(password="TestPass123!")
+
+        assert await service.verify(
+            plain_password="TestPass123!", hashed_password=hashed
+        )
+        assert not await service.verify(
+            plain_password="WrongPass123!", hashed_password=hashed
+        )
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop_thread(self, service):
+        """Test the blocking call does not run on the loop's thread"""
+        loop_thread = threading.get_ident()
+        seen_threads = []
+
+        def fake_hash(password: str) -> str:
+            seen_threads.append(threading.get_ident())
+            return password
+
+        with patch("src.services.password_service.hash_password", fake_hash):
+            await service.hash(password="x")
+
+        assert seen_threads and seen_threads[0] != loop_thread
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, service):
+        """Test no more than max_concurrency calls are in flight at once"""
+        in_flight = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_verify(plain_password: str, hashed_password: str) -> bool:
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+            threading.Event().wait(0.02)
+            with lock:
+                in_flight -= 1
+            return True
+
+        with patch("src.services.password_service.verify_password", slow_verify):
+            await asyncio.gather(
+                *(
+                    service.verify(plain_password="p", hashed_password="h")
+                    for _ in range(8)
+                )
+            )
+
+        assert peak <= service.max_concurrency
+
+
+class TestUpdateUserPassword:
+    """Test the repository password update path"""
+
+    @pytest.mark.asyncio
+    async def test_same_password_is_not_rehashed(self):
+        """Test submitting the current password leaves the hash untouched"""
+        user = User(
+            id=1, name="Test User", email="t@t.com", password="stored", role="staff"
+        )
+        repo = UserRepository(session=AsyncMock())
+
+        with patch("src.repository.user_repo.password_service") as mock_service:
+            mock_service.verify = AsyncMock(return_value=True)
+            mock_service.hash = AsyncMock()
+            message = await repo.update_user_password(
+                current_user=user, update_details=UserEdit(new_password="TestPass123!")
+            )
+
+        assert message == "same password"
+        assert user.password == "stored"
+        mock_service.hash.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_new_password_is_hashed_once(self):
+        """Test a different password is hashed exactly once"""
+        user = User(
+            id=1, name="Test User", email="t@t.com", password="stored", role="staff"
+        )
+        repo = UserRepository(session=AsyncMock())
+
+        with patch("src.repository.user_repo.password_service") as mock_service:
+            mock_service.verify = AsyncMock(return_value=False)
+            mock_service.hash = AsyncMock(return_value="new-hash")
+            message = await repo.update_user_password(
+                current_user=user, update_details=UserEdit(new_password="TestPass123!")
+            )
+
+        assert message == "password updated"
+        assert user.password == "new-hash"
+        mock_service.hash.assert_awaited_once_with(password="TestPass123!")
@@ -0,0 +1,161 @@
+# test_pricing_service.py - Tests for the bulk pricing rule engine
+import pytest
+from sqlalchemy import select
+from src.core.config import settings
+from src.models.category_summary import CategorySummary
+from src.models.product import Product
+from src.repository.change_tracking import get_table_version
+from src.repository.pricing import PricingRule, compile_rules
+from src.schema.pricing import PricingRuleCreate, PricingRuleSet
+from src.services.pricing_service import apply_pricing, get_rules, preview_pricing
+
+
+def make_rule_set(*rules: dict) -> PricingRuleSet:
+    """Build a validated rule set from plain dicts"""
+    return PricingRuleSet(rules=[PricingRuleCreate(**rule) for rule in rules])
+
+
+def read_prices(test_db) -> dict[int, tuple]:
+    """Read price, price_type and version of every product"""
+    test_db.expire_all()
+    rows = test_db.execute(select(Product).order_by(Product.id)).scalars().all()
+    return {row.id: (row.price, row.price_type, row.version) for row in rows}
+
+
+class TestCompileRules:
+    """Test rule compilation and its cache"""
+
+    def test_same_rule_set_is_cached(self):
+        """Test equal rule sets reuse the compiled expressions"""
+        rules = (
+            PricingRule(kind="tax", rate=0.2),
+            PricingRule(kind="discount", rate=0.1),
+        )
+        first = compile_rules(rules=rules)
+        again = compile_rules(rules=tuple(PricingRule(**vars(r)) for r in rules))
+
+        assert again is first
+
+    def test_rule_factor(self):
+        """Test tax adds and discount removes the rate"""
+        assert PricingRule(kind="tax", rate=0.2).factor == pytest.approx(1.2)
+        assert PricingRule(kind="discount", rate=0.2).factor == pytest.approx(0.8)
+
+    def test_get_rules_keeps_order(self):
+        """Test request rules convert to hashable rules in order"""
+        rule_set = make_rule_set(
+            {"kind": "discount", "rate": 0.1, "category_id": 2},
+            {"kind": "tax", "rate": 0.2},
+        )
+
+        assert get_rules(rule_set=rule_set) == (
+            PricingRule(kind="discount", rate=0.1, category_id=2),
+            PricingRule(kind="tax", rate=0.2),
+        )
+
+
+class TestPreviewPricing:
+    """Test the dry run diff"""
+
+    @pytest.mark.asyncio
+    async def test_preview_does_not_write(
+        self, db_session, test_db, products_with_different_categories
+    ):
+        """Test the diff lists matched products and leaves prices unchanged"""
+        before = read_prices(test_db)
+        rule_set = make_rule_set({"kind": "discount", "rate": 0.2, "category_id": 1})
+
+        response = await preview_pricing(
+            user_email="test@test.com", rule_set=rule_set, db=db_session
+        )
+
+        changes = response["message"]["changes"]
+        assert [change.id for change in changes] == [1, 5]
+        assert changes[0].old_price == 1500
+        assert changes[0].new_price == pytest.approx(1200.0)
+        assert changes[0].price_type == "discounted"
+        assert read_prices(test_db) == before
+
+    @pytest.mark.asyncio
+    async def test_range_and_stacked_rules(
+        self, db_session, products_with_different_categories
+    ):
+        """Test ranges use the original price and matching factors multiply"""
+        rule_set = make_rule_set(
+            {"kind": "tax", "rate": 0.1},
+            {"kind": "discount", "rate": 0.5, "min_price": 40, "max_price": 100},
+        )
+
+        response = await preview_pricing(
+            user_email="test@test.com", rule_set=rule_set, db=db_session
+        )
+
+        by_id = {change.id: change for change in response["message"]["changes"]}
+        assert len(by_id) == 5
+        assert by_id[1].new_price == pytest.approx(1650.0)
+        assert by_id[1].price_type == "taxed"
+        assert by_id[3].new_price == pytest.approx(24.75)
+        assert by_id[3].price_type == "discounted"
+
+
+class TestApplyPricing:
+    """Test the single statement bulk update"""
+
+    @pytest.mark.asyncio
+    async def test_apply_matches_preview(
+        self, db_session, test_db, products_with_different_categories
+    ):
+        """Test applied prices equal the dry run and versions are bumped"""
+        rule_set = make_rule_set(
+            {"kind": "tax", "rate": 0.2, "category_id": 2},
+            {"kind": "discount", "rate": 0.1, "max_price": 50},
+        )
+        preview = await preview_pricing(
+            user_email="test@test.com", rule_set=rule_set, db=db_session
+        )
+        before = read_prices(test_db)
+        counter = await get_table_version(table_name="product", db=db_session)
+
+        response = await apply_pricing(
+            user_email="test@test.com", rule_set=rule_set, db=db_session
+        )
+
+        after = read_prices(test_db)
+        changes = preview["message"]["changes"]
+        assert response["message"]["updated products"] == len(changes)
+        for change in changes:
+            assert after[change.id][0] == pytest.approx(change.new_price)
+            assert after[change.id][1] == change.price_type
+            assert after[change.id][2] == before[change.id][2] + 1
+        assert after[1] == before[1]
+        assert await get_table_version(table_name="product", db=db_session) != counter
+
+    @pytest.mark.asyncio
+    async def test_no_match_writes_nothing(
+        self, db_session, products_with_different_categories
+    ):
+        """Test a rule set matching nothing leaves the table version alone"""
+        counter = await get_table_version(table_name="product", db=db_session)
+        rule_set = make_rule_set({"kind": "tax", "rate": 0.2, "category_id": 99})
+
+        response = await apply_pricing(
+            user_email="test@test.com", rule_set=rule_set, db=db_session
+        )
+
+        assert response["message"]["updated products"] == 0
+        assert await get_table_version(table_name="product", db=db_session) == counter
+
+    @pytest.mark.asyncio
+    async def test_apply_refreshes_materialized_summary(
+        self, db_session, test_db, products_with_different_categories, monkeypatch
+    ):
+        """Test the materialized stock value follows the bulk update"""
+        monkeypatch.setattr(settings, "CATEGORY_SUMMARY_MATERIALIZED", True)
+        rule_set = make_rule_set({"kind": "discount", "rate": 0.5, "category_id": 2})
+
+        await apply_pricing(
+            user_email="test@test.com", rule_set=rule_set, db=db_session
+        )
+
+        summary = test_db.get(CategorySummary, 2)
+        assert summary.stock_value == pytest.approx(50 * 12.5)
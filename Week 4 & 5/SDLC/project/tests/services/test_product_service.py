@@ -4,7 +4,12 @@ from sqlalchemy.orm import Session
 from src.core.exceptions import DatabaseException
 from src.models.category import Category
 from src.models.product import Product
-from src.schema.product import ProductCreate, ProductUpdate
+from src.schema.product import (
+    ProductCreate,
+    ProductDetailRead,
+    ProductRead,
+    ProductUpdate,
+)
 from src.services.product_service import (
     check_existing_product_using_id,
     check_existing_product_using_name,
@@ -152,18 +157,14 @@ class TestPostProduct:
             id=1,  # This triggers discount logic
         )
 
-        # Discount logic uses decorator pattern get_amount() which returns None
-        # This causes TypeError when trying to multiply None * float
-        with pytest.raises(TypeError) as exc_info:
-            await post_product(
-                user_email="test@test.com", product=product_data, db=db_session
-            )
-
-        # Verify it's the decorator pattern error
-        assert "unsupported operand type(s) for *: 'NoneType' and 'float'" in str(
-            exc_info.value
+        response = await post_product(
+            user_email="test@test.com", product=product_data, db=db_session
         )
 
+        created_product = response["message"]["inserted product"]
+        assert created_product.price == pytest.approx(80.0)
+        assert created_product.price_type == "discounted"
+
     @pytest.mark.asyncio
     async def test_create_product_missing_category(self, db_session: Session):
         """Test product creation with non-existent category"""
@@ -212,6 +213,17 @@ class TestGetAllProducts:
         assert isinstance(products, list)
         assert len(products) > 0
 
+    @pytest.mark.asyncio
+    async def test_get_all_products_returns_typed_models(
+        self, db_session: Session, multiple_products
+    ):
+        """Test products are returned as ProductRead, not ORM instances"""
+        response = await get_all_products(user_email="test@test.com", db=db_session)
+
+        products = response["message"]["products"]
+        assert all(isinstance(product, ProductRead) for product in products)
+        assert products[0].version == 1
+
 
 class TestGetSpecificProduct:
     """Test suite for get_specific_product function"""
@@ -227,6 +239,8 @@ class TestGetSpecificProduct:
         product = response["message"]["product"]
         assert product.id == sample_product.id
         assert product.name == sample_product.name
+        assert isinstance(product, ProductDetailRead)
+        assert product.category.name == "electronics"
 
     @pytest.mark.asyncio
     async def test_get_nonexistent_product(self, db_session: Session):
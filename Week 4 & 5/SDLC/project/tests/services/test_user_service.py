@@ -209,15 +209,40 @@ class TestUserServiceGetUsers:
                 role="admin",
             ),
         ]
-        mock_repo.fetch_all_users.return_value = mock_users
+        mock_repo.fetch_users_page.return_value = mock_users
 
         # Execute
-        result = await user_service.get_users("admin@example.com")
+        result, next_offset = await user_service.get_users(
+            "admin@example.com", limit=10
+        )
 
         # Verify
         assert len(result) == 2
         assert result == mock_users
-        mock_repo.fetch_all_users.assert_called_once()
+        assert next_offset is None
+        mock_repo.fetch_users_page.assert_called_once_with(limit=11, offset=0)
+
+    @pytest.mark.asyncio
+    async def test_get_users_next_page(self, user_service, mock_repo):
+        """Test that the extra row read marks a following page"""
+        mock_users = [
+            User(
+                id=i,
+                name=f"User {i}",
+                email=f"user{i}@example.com",
+                password="hash",
+                role="staff",
+            )
+            for i in range(3, 6)
+        ]
+        mock_repo.fetch_users_page.return_value = mock_users
+
+        result, next_offset = await user_service.get_users(
+            "admin@example.com", limit=2, offset=2
+        )
+
+        assert result == mock_users[:2]
+        assert next_offset == 4
 
 
 class TestUserServiceDelete: